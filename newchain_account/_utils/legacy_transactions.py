@@ -35,20 +35,25 @@ from .validation import (
 )
 
 
-def serializable_unsigned_transaction_from_dict(transaction_dict):
+def serializable_unsigned_transaction_from_dict(transaction_dict, validate=True):
     transaction_dict = set_transaction_type_if_needed(transaction_dict)
     if 'type' in transaction_dict:
         # We delegate to TypedTransaction, which will carry out validation & formatting.
-        return TypedTransaction.from_dict(transaction_dict)
+        return TypedTransaction.from_dict(transaction_dict, validate)
 
-    assert_valid_fields(transaction_dict)
+    if validate:
+        assert_valid_fields(transaction_dict)
     filled_transaction = pipe(
         transaction_dict,
         dict,
         partial(merge, TRANSACTION_DEFAULTS),
         chain_id_to_v,
-        apply_formatters_to_dict(LEGACY_TRANSACTION_FORMATTERS),
     )
+    if validate:
+        filled_transaction = apply_formatters_to_dict(
+            LEGACY_TRANSACTION_FORMATTERS,
+            filled_transaction,
+        )
     if 'v' in filled_transaction:
         serializer = Transaction
     else:
@@ -64,7 +69,11 @@ def encode_transaction(unsigned_transaction, vrs):
         chain_naive_transaction['v'] = v
         chain_naive_transaction['r'] = r
         chain_naive_transaction['s'] = s
-        signed_typed_transaction = TypedTransaction.from_dict(chain_naive_transaction)
+        # The fields were validated and formatted when building the unsigned transaction.
+        signed_typed_transaction = TypedTransaction.from_dict(
+            chain_naive_transaction,
+            validate=False,
+        )
         return signed_typed_transaction.encode()
     signed_transaction = Transaction(v=v, r=r, s=s, **chain_naive_transaction)
     return rlp.encode(signed_transaction)
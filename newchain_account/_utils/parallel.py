@@ -0,0 +1,68 @@
+from concurrent.futures import (
+    ProcessPoolExecutor,
+)
+from itertools import (
+    islice,
+)
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+TItem = TypeVar('TItem')
+TResult = TypeVar('TResult')
+
+DEFAULT_CHUNK_SIZE = 256
+
+
+def chunked(items: Iterable[TItem], chunk_size: int) -> Iterator[List[TItem]]:
+    """
+    Split ``items`` into lists of at most ``chunk_size`` elements, preserving order.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer, got %r" % chunk_size)
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def map_chunks(
+        function: Callable[..., Sequence[TResult]],
+        items: Iterable[TItem],
+        *args: Any,
+        max_workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[TResult]:
+    """
+    Yield ``function(chunk, *args)`` results for consecutive chunks of ``items``, flattened.
+
+    Work runs in the calling process unless ``max_workers`` is greater than one, in which
+    case chunks are spread over a :class:`~concurrent.futures.ProcessPoolExecutor`.
+    Results are always yielded in the order of ``items``. When running in a pool,
+    ``function`` and ``args`` must be picklable, and ``args`` are shipped with every chunk,
+    so they should be small.
+    """
+    chunks = chunked(items, chunk_size)
+    if max_workers is None or max_workers <= 1:
+        for chunk in chunks:
+            yield from function(chunk, *args)
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        # keep a bounded number of chunks in flight, so that huge or lazy inputs
+        # are not materialized all at once
+        pending = []
+        for chunk in chunks:
+            pending.append(executor.submit(function, chunk, *args))
+            if len(pending) >= 2 * max_workers:
+                yield from pending.pop(0).result()
+        for future in pending:
+            yield from future.result()
@@ -2,11 +2,26 @@ from cytoolz import (
     pipe,
 )
 from eth_utils import (
+    big_endian_to_int,
+    keccak,
     to_bytes,
     to_int,
 )
+from newchain_keys.exceptions import (
+    BadSignature,
+    ValidationError,
+)
+import rlp
+from rlp.codec import (
+    consume_length_prefix,
+    length_prefix,
+)
+from rlp.sedes import (
+    big_endian_int,
+)
 
 from newchain_account._utils.legacy_transactions import (
+    UNSIGNED_TRANSACTION_FIELDS,
     ChainAwareUnsignedTransaction,
     Transaction,
     UnsignedTransaction,
@@ -27,9 +42,9 @@ INTENDED_VALIDATOR_SIGN_VERSION = b'\x00'  # Hex value 0x00
 STRUCTURED_DATA_SIGN_VERSION = b'\x01'  # Hex value 0x01
 
 
-def sign_transaction_dict(eth_key, transaction_dict):
+def sign_transaction_dict(eth_key, transaction_dict, validate=True):
     # generate RLP-serializable transaction, with defaults filled
-    unsigned_transaction = serializable_unsigned_transaction_from_dict(transaction_dict)
+    unsigned_transaction = serializable_unsigned_transaction_from_dict(transaction_dict, validate)
 
     transaction_hash = unsigned_transaction.hash()
 
@@ -79,6 +94,58 @@ def hash_of_signed_transaction(txn_obj):
     return signable_transaction.hash()
 
 
+RLP_LIST_OFFSET = 0xc0
+
+# positions of the integer fields in rlp([nonce, gasPrice, gas, to, value, data, v, r, s])
+_LEGACY_INTEGER_FIELDS = (0, 1, 2, 4, 6, 7, 8)
+_LEGACY_TO_FIELD = 3
+
+
+def hash_and_vrs_of_signed_legacy_transaction(txn_bytes):
+    """
+    Regenerate the hash to be signed, and the signature, of a serialized legacy transaction.
+
+    This is equivalent to :func:`hash_of_signed_transaction` and
+    :func:`~newchain_account._utils.legacy_transactions.vrs_from` on a decoded
+    :class:`~newchain_account._utils.legacy_transactions.Transaction`, but it works on the
+    raw bytes directly: the encoded unsigned fields are sliced out of the transaction as
+    they are, the EIP-155 chain ID fields are appended, and no serializer objects are built.
+
+    :return: ``(hash, (v, r, s))``, or ``None`` if the bytes are not a canonically encoded
+        legacy transaction, so that callers can fall back to full decoding for a precise error
+    """
+    try:
+        # strict decoding validates the encoding, so the item boundaries below are sound
+        fields = rlp.decode(txn_bytes)
+    except rlp.DecodingError:
+        return None
+    if not isinstance(fields, list) or len(fields) != 9:
+        return None
+    if not all(isinstance(field, bytes) for field in fields):
+        return None
+    if any(fields[index][:1] == b'\x00' for index in _LEGACY_INTEGER_FIELDS):
+        # non-canonical integer, which the sedes would refuse to deserialize
+        return None
+    if len(fields[_LEGACY_TO_FIELD]) not in {0, 20}:
+        return None
+
+    v, r, s = (big_endian_to_int(field) for field in fields[6:])
+    (chain_id, _v) = extract_chain_id(v)
+
+    # find where the encoding of the 6th field (data) ends
+    _, _, _, unsigned_start = consume_length_prefix(txn_bytes, 0)
+    unsigned_end = unsigned_start
+    for _ in range(len(UNSIGNED_TRANSACTION_FIELDS)):
+        _, _, length, payload_start = consume_length_prefix(txn_bytes, unsigned_end)
+        unsigned_end = payload_start + length
+
+    unsigned_payload = txn_bytes[unsigned_start:unsigned_end]
+    if chain_id is not None:
+        unsigned_payload += rlp.encode(chain_id, big_endian_int) + b'\x80\x80'
+    signing_payload = length_prefix(len(unsigned_payload), RLP_LIST_OFFSET) + unsigned_payload
+    return keccak(signing_payload), (v, r, s)
+
+
 def extract_chain_id(raw_v):
     """
     Extracts chain ID, according to EIP-155.
@@ -143,5 +210,104 @@ def sign_message_hash(key, msg_hash):
     signature = key.sign_msg_hash(msg_hash)
     (v_raw, r, s) = signature.vrs
     v = to_eth_v(v_raw)
-    eth_signature_bytes = to_bytes32(r) + to_bytes32(s) + to_bytes(v)
+    eth_signature_bytes = r.to_bytes(32, 'big') + s.to_bytes(32, 'big') + bytes((v,))
     return (v, r, s, eth_signature_bytes)
+
+
+def sign_message_hashes(message_hashes, key):
+    """
+    Sign many 32-byte message hashes with the same key.
+
+    :param message_hashes: the hashes to sign, as bytes
+    :param key: the :class:`newchain_keys.datatypes.PrivateKey` to sign with
+    :returns: a ``(message_hash, v, r, s, signature_bytes)`` tuple per hash, in order
+    """
+    return [(msg_hash,) + sign_message_hash(key, msg_hash) for msg_hash in message_hashes]
+
+
+def sign_message_hash_with_keys(private_keys, keys_api, msg_hash):
+    """
+    Sign the same 32-byte message hash with many keys.
+
+    :param private_keys: the 32-byte private keys to sign with, as bytes
+    :param keys_api: the :class:`newchain_keys.KeyAPI` to sign with
+    :param bytes msg_hash: the hash to sign
+    :returns: a ``(signer_address, v, r, s, signature_bytes)`` tuple per key, in order
+    """
+    signed = []
+    for private_key in private_keys:
+        key = keys_api.PrivateKey(private_key)
+        signer = key.public_key.to_checksum_address()
+        signed.append((signer,) + sign_message_hash(key, msg_hash))
+    return signed
+
+
+def recover_message_hash_signers(signatures, keys_api, msg_hash):
+    """
+    Recover the signer of each signature over the same 32-byte message hash.
+
+    :param signatures: 65-byte r+s+v signatures, as bytes
+    :param keys_api: the :class:`newchain_keys.KeyAPI` to recover with
+    :param bytes msg_hash: the hash that every signature signed
+    :returns: the checksummed signer addresses, in order
+    """
+    return [
+        keys_api.Signature(
+            signature_bytes=to_standard_signature_bytes(signature),
+        ).recover_public_key_from_msg_hash(msg_hash).to_checksum_address()
+        for signature in signatures
+    ]
+
+
+def sign_typed_data_messages(messages, key, schema, primary_type, domain_hash):
+    """
+    Sign EIP-712 messages that share one schema and domain.
+
+    :param messages: the ``message`` part of each structured data to sign
+    :param key: the :class:`newchain_keys.datatypes.PrivateKey` to sign with
+    :param schema: the :class:`CompiledTypedDataSchema` of the messages
+    :param str primary_type: the type of every message
+    :param bytes domain_hash: the domain separator, already hashed
+    :returns: a ``(message_hash, v, r, s, signature_bytes)`` tuple per message, in order
+    """
+    prefix = b'\x19' + STRUCTURED_DATA_SIGN_VERSION + domain_hash
+    signed = []
+    for message in messages:
+        msg_hash = keccak(prefix + schema.hash_message(primary_type, message))
+        signed.append((msg_hash,) + sign_message_hash(key, msg_hash))
+    return signed
+
+
+def recover_typed_data_signers(
+        signed_messages, keys_api, schema, primary_type, domain_hash, strict=True):
+    """
+    Recover the signers of EIP-712 messages that share one schema and domain.
+
+    :param signed_messages: ``(message, signature)`` pairs, with 65-byte r+s+v signatures
+    :param keys_api: the :class:`newchain_keys.KeyAPI` to recover with
+    :param schema: the :class:`CompiledTypedDataSchema` of the messages
+    :param str primary_type: the type of every message
+    :param bytes domain_hash: the domain separator, already hashed
+    :param bool strict: raise on invalid signatures, instead of returning None for them
+    :returns: the checksummed signer address of each message, in order
+    """
+    prefix = b'\x19' + STRUCTURED_DATA_SIGN_VERSION + domain_hash
+    signers = []
+    for message, signature in signed_messages:
+        msg_hash = keccak(prefix + schema.hash_message(primary_type, message))
+        try:
+            v = to_int(signature[-1:])
+            if v not in {0, 1, V_OFFSET, V_OFFSET + 1} and v < CHAIN_ID_OFFSET:
+                # checked here, rather than by the assertion in to_standard_v
+                raise ValidationError(
+                    f"Signature v {v!r} is invalid, must be one of: 0, 1, 27, 28, 35+"
+                )
+            signer = keys_api.Signature(
+                signature_bytes=to_standard_signature_bytes(signature),
+            ).recover_public_key_from_msg_hash(msg_hash).to_checksum_address()
+        except (BadSignature, ValidationError, ValueError):
+            if strict:
+                raise
+            signer = None
+        signers.append(signer)
+    return signers
@@ -1,3 +1,11 @@
+from collections import (
+    OrderedDict,
+)
+import copy
+from functools import (
+    lru_cache,
+    partial,
+)
 from itertools import (
     groupby,
 )
@@ -5,24 +13,54 @@ import json
 from operator import (
     itemgetter,
 )
+import re
+import threading
 
 from eth_abi import (
-    encode_abi,
-    is_encodable,
     is_encodable_type,
 )
+from eth_abi.exceptions import (
+    EncodingError,
+)
 from eth_abi.grammar import (
     parse,
 )
+from eth_abi.registry import (
+    registry as default_registry,
+)
 from eth_utils import (
     keccak,
     to_tuple,
 )
 
+from newchain_account._utils.validation import (
+    _inspect_hex_address,
+)
+
 from .validation import (
     validate_structured_data,
+    validate_types,
 )
 
+# Number of distinct domains whose separators are kept by :func:`hash_domain`
+DOMAIN_SEPARATOR_CACHE_SIZE = 256
+
+# Version of the files written by :func:`save_compiled_schemas`
+SCHEMA_CACHE_FORMAT = "newchain-account/compiled-eip712-schemas"
+SCHEMA_CACHE_VERSION = 1
+
+# Domain values of these types can be saved along with a compiled schema
+_CACHEABLE_DOMAIN_VALUE_TYPES = (str, int, bool, bytes)
+_CACHEABLE_DOMAIN_VALUE_TYPES_BY_NAME = {
+    value_type.__name__: value_type for value_type in _CACHEABLE_DOMAIN_VALUE_TYPES
+}
+
+# Number of distinct ABI types whose encoders are kept by :func:`get_abi_encoder`
+ABI_ENCODER_CACHE_SIZE = 256
+
+# Atomic types that always encode to a single 32-byte word
+STATIC_WORD_TYPE_REGEX = re.compile(r"^(?:(uint|int|bytes)([1-9]\d*)|address|bool)$")
+
 
 def get_dependencies(primary_type, types):
     """
@@ -149,10 +187,147 @@ def get_array_dimensions(data):
     return dimensions
 
 
+def _pack_uints(items, size):
+    if set(map(type, items)) != {int} or min(items) < 0 or max(items) >> size:
+        return None
+    return b''.join([item.to_bytes(32, 'big') for item in items])
+
+
+def _pack_ints(items, size):
+    bound = 1 << (size - 1)
+    if set(map(type, items)) != {int} or min(items) < -bound or max(items) >= bound:
+        return None
+    return b''.join([item.to_bytes(32, 'big', signed=True) for item in items])
+
+
+def _pack_fixed_bytes(items, size):
+    words = []
+    for item in items:
+        if not isinstance(item, bytes) or len(item) > size:
+            return None
+        words.append(item.ljust(32, b'\x00'))
+    return b''.join(words)
+
+
+def _pack_addresses(items):
+    words = []
+    for item in items:
+        if isinstance(item, str):
+            item = _inspect_hex_address(item)[2]
+            if item is None:
+                return None
+        elif not isinstance(item, bytes) or len(item) != 20:
+            return None
+        words.append(b'\x00' * 12 + item)
+    return b''.join(words)
+
+
+def _pack_bools(items):
+    if set(map(type, items)) != {bool}:
+        return None
+    return b''.join([b'\x00' * 31 + (b'\x01' if item else b'\x00') for item in items])
+
+
+@lru_cache(maxsize=256)
+def get_static_array_packer(field_type):
+    """
+    Get a fast encoder for one-dimensional arrays of ``field_type``, or None.
+
+    Arrays of static atomic types (``uint<M>``, ``int<M>``, ``bytes<M>``, ``address``
+    and ``bool``) encode to one 32-byte word per item, so they are packed directly into
+    a contiguous buffer, checking all the items in one pass, instead of going through
+    :func:`encode_field` for every item. The returned function gives the same bytes as
+    ``encode_abi`` over the items, or None if the value does not fit the fast path (a
+    wrong length, or any item of an unexpected type or out of range), in which case
+    the caller should fall back to :func:`encode_field` to get the usual errors.
+    """
+    if not is_array_type(field_type):
+        return None
+    item_type = field_type[:field_type.rindex("[")]
+    declared_length = field_type[field_type.rindex("[") + 1:-1]
+    match = STATIC_WORD_TYPE_REGEX.match(item_type)
+    if match is None or not is_encodable_type(item_type):
+        return None
+
+    base, size = match.group(1), match.group(2)
+    if base is None:
+        pack = {"address": _pack_addresses, "bool": _pack_bools}[item_type]
+    else:
+        pack = partial(
+            {"uint": _pack_uints, "int": _pack_ints, "bytes": _pack_fixed_bytes}[base],
+            size=int(size),
+        )
+
+    def pack_static_array(value):
+        if not isinstance(value, (list, tuple)):
+            return None
+        if declared_length and len(value) != int(declared_length):
+            return None
+        if not value:
+            return b''
+        return pack(value)
+    return pack_static_array
+
+
+@lru_cache(maxsize=ABI_ENCODER_CACHE_SIZE)
+def get_abi_encoder(abi_type):
+    """
+    Get the ``eth_abi`` encoder of ``abi_type``, or None if it is not a valid ABI type.
+
+    The type string is parsed and looked up in the registry only once per type.
+    """
+    if not is_encodable_type(abi_type):
+        return None
+    return default_registry.get_encoder(abi_type)
+
+
+def encode_atomic_field(name, field_type, value):
+    """
+    Validate and ABI encode ``value`` as the atomic ``field_type``, in one step.
+
+    :returns: the encoded 32-byte word
+    """
+    encoder = get_abi_encoder(field_type)
+    if encoder is None:
+        raise TypeError(f"Received Invalid type `{field_type}` in field `{name}`")
+    try:
+        return encoder(value)
+    except EncodingError:
+        raise TypeError(
+            f"Value of `{name}` ({value}) is not encodable as type `{field_type}`. "
+            f"If the base type is correct, verify that the value does not "
+            f"exceed the specified size for the type."
+        )
+
+
+def is_atomic_type(types, field_type):
+    return not (
+        field_type in types or field_type in {"bytes", "string"} or is_array_type(field_type)
+    )
+
+
+def encode_field_word(types, name, field_type, value):
+    """
+    Same as :func:`encode_field`, but gives the ABI encoding of the field, a 32-byte word.
+
+    Every EIP-712 field encodes to exactly one word, so the encoding of a struct is the
+    concatenation of the words of its fields.
+    """
+    if value is not None and is_atomic_type(types, field_type):
+        return encode_atomic_field(name, field_type, value)
+    return encode_field(types, name, field_type, value)[1]
+
+
 def encode_field(types, name, field_type, value):
     if value is None:
         raise ValueError(f"Missing value for field {name} of type {field_type}")
 
+    pack_static_array = get_static_array_packer(field_type)
+    if pack_static_array is not None:
+        packed_array = pack_static_array(value)
+        if packed_array is not None:
+            return ('bytes32', keccak(packed_array))
+
     if field_type in types:
         return ('bytes32', keccak(encode_data(field_type, types, value)))
 
@@ -193,49 +368,30 @@ def encode_field(types, name, field_type, value):
                 )
 
         field_type_of_inside_array = field_type[:field_type.rindex("[")]
-        field_type_value_pairs = [
-            encode_field(types, name, field_type_of_inside_array, item)
+        # the items of an array are encoded like the fields of a struct, one word each
+        encoded_items = b''.join([
+            encode_field_word(types, name, field_type_of_inside_array, item)
             for item in value
-        ]
+        ])
 
-        # handle empty array
-        if value:
-            data_types, data_hashes = zip(*field_type_value_pairs)
-        else:
-            data_types, data_hashes = [], []
+        return('bytes32', keccak(encoded_items))
 
-        return('bytes32', keccak(encode_abi(data_types, data_hashes)))
-
-    # First checking to see if field_type is valid as per abi
-    if not is_encodable_type(field_type):
-        raise TypeError(f"Received Invalid type `{field_type}` in field `{name}`")
-
-    # Next, see if the value is encodable as the specified field_type
-    if is_encodable(field_type, value):
-        # field_type is a valid type and the provided value is encodable as that type
-        return (field_type, value)
-    else:
-        raise TypeError(
-            f"Value of `{name}` ({value}) is not encodable as type `{field_type}`. "
-            f"If the base type is correct, verify that the value does not "
-            f"exceed the specified size for the type."
-        )
+    # Check that field_type is valid as per abi, and that the value is encodable as it
+    encode_atomic_field(name, field_type, value)
+    return (field_type, value)
 
 
 def encode_data(primary_type, types, data):
-    encoded_types = ['bytes32']
     encoded_values = [hash_struct_type(primary_type, types)]
 
     for field in types[primary_type]:
-        type, value = encode_field(
+        encoded_values.append(encode_field_word(
             types,
             field["name"],
             field["type"],
-            data[field["name"]])
-        encoded_types.append(type)
-        encoded_values.append(value)
+            data[field["name"]]))
 
-    return encode_abi(encoded_types, encoded_values)
+    return b''.join(encoded_values)
 
 
 def load_and_validate_structured_message(structured_json_string_data):
@@ -245,14 +401,49 @@ def load_and_validate_structured_message(structured_json_string_data):
     return structured_data
 
 
+def _domain_separator_key(types, domain):
+    """
+    Get a hashable key for the domain separator of ``domain``, or None if it cannot be cached.
+
+    Only domains made of atomic, ``bytes`` and ``string`` fields are cached, which covers
+    every field defined by EIP-712. The type of each value is part of the key, so that
+    values which compare equal but encode differently (eg~ ``1`` and ``True``) do not mix.
+    """
+    fields = tuple((field["name"], field["type"]) for field in types["EIP712Domain"])
+    if any(field_type in types or is_array_type(field_type) for _, field_type in fields):
+        return None
+    try:
+        values = tuple((type(domain[name]), domain[name]) for name, _ in fields)
+        hash(values)
+    except (KeyError, TypeError):
+        # let the uncached path raise the usual errors
+        return None
+    return fields, values
+
+
+@lru_cache(maxsize=DOMAIN_SEPARATOR_CACHE_SIZE)
+def _hash_domain_fields(fields, values):
+    types = {
+        "EIP712Domain": [{"name": name, "type": field_type} for name, field_type in fields],
+    }
+    domain = {name: value for (name, _), (_, value) in zip(fields, values)}
+    return keccak(encode_data("EIP712Domain", types, domain))
+
+
 def hash_domain(structured_data):
-    return keccak(
-        encode_data(
-            "EIP712Domain",
-            structured_data["types"],
-            structured_data["domain"]
-        )
-    )
+    """
+    Get the EIP-712 domain separator of ``structured_data``.
+
+    Separators are cached by the content of the ``EIP712Domain`` type and the domain
+    values, keeping the last :data:`DOMAIN_SEPARATOR_CACHE_SIZE` distinct domains, so
+    hashing many messages of the same domain only encodes the domain once.
+    """
+    types = structured_data["types"]
+    domain = structured_data["domain"]
+    key = _domain_separator_key(types, domain)
+    if key is None:
+        return keccak(encode_data("EIP712Domain", types, domain))
+    return _hash_domain_fields(*key)
 
 
 def hash_message(structured_data):
@@ -263,3 +454,320 @@ def hash_message(structured_data):
             structured_data["message"]
         )
     )
+
+
+class CompiledTypedDataSchema:
+    """
+    The ``types`` of EIP-712 structured data, with everything that does not depend on
+    the data precomputed.
+
+    Compiling a schema validates it, and computes once, for every struct: its sorted
+    dependencies, its encoded type string, its type hash, and a plan to encode each of
+    its fields. Hashing a struct then only walks the data. Results are identical to
+    :func:`encode_data`, :func:`hash_domain` and :func:`hash_message`.
+
+    The ``types`` are copied, so later changes to the original dict are not picked up.
+
+    With ``struct_hash_cache_size`` set, the hashes of nested structs are also memoised,
+    keyed by their type and the canonical form of their values (a tuple of the field
+    values, in schema order, each with its Python type). Messages that embed the same
+    large sub-structs, like asset descriptors or fee schedules, then only encode and hash
+    the sub-trees that changed. The canonical key still walks the sub-tree, which is much
+    cheaper than encoding it. Structs holding unhashable values are not memoised.
+
+    The separators of domains hashed with :meth:`hash_domain` are kept with the schema.
+    Schemas, with these separators, can be saved to a file with
+    :func:`save_compiled_schemas` and loaded back by :func:`load_compiled_schemas`.
+    """
+
+    def __init__(self, types, struct_hash_cache_size=0):
+        """
+        :param dict types: the ``types`` of the structured data, including ``EIP712Domain``
+        :param int struct_hash_cache_size: how many nested struct hashes to keep, in least
+            recently used order. Zero disables memoisation.
+        """
+        validate_types({"types": types})
+        self.types = copy.deepcopy(types)
+        self.dependencies = {
+            struct_name: tuple(sorted(get_dependencies(struct_name, self.types)))
+            for struct_name in self.types
+        }
+        self.encoded_types = {
+            struct_name: ''.join(
+                encode_struct(dependency, self.types[dependency])
+                for dependency in (struct_name,) + dependencies
+            )
+            for struct_name, dependencies in self.dependencies.items()
+        }
+        self.type_hashes = {
+            struct_name: keccak(text=encoded_type)
+            for struct_name, encoded_type in self.encoded_types.items()
+        }
+        self.domain_separators = {}
+        self.struct_hash_cache_size = struct_hash_cache_size
+        self._prepare()
+
+    def _prepare(self):
+        # field names and types of each struct
+        self._struct_plans = {
+            struct_name: tuple((field["name"], field["type"]) for field in fields)
+            for struct_name, fields in self.types.items()
+        }
+        self._field_encoders = {}
+        self._struct_hashes = OrderedDict()
+        # a schema is shared between threads, and an LRU is mutated by lookups too
+        self._struct_hashes_lock = threading.Lock()
+
+    def _to_cache_entry(self):
+        domain_separators = []
+        for (fields, values), separator in self.domain_separators.items():
+            if any(value_type not in _CACHEABLE_DOMAIN_VALUE_TYPES for value_type, _ in values):
+                continue
+            domain_separators.append({
+                "fields": fields,
+                "values": [
+                    (value_type.__name__, value.hex() if value_type is bytes else value)
+                    for value_type, value in values
+                ],
+                "separator": separator.hex(),
+            })
+        return {
+            "types": self.types,
+            "dependencies": self.dependencies,
+            "encodedTypes": self.encoded_types,
+            "typeHashes": {name: type_hash.hex() for name, type_hash in self.type_hashes.items()},
+            "domainSeparators": domain_separators,
+            "structHashCacheSize": self.struct_hash_cache_size,
+        }
+
+    @classmethod
+    def _from_cache_entry(cls, entry):
+        schema = cls.__new__(cls)
+        schema.types = entry["types"]
+        schema.dependencies = {
+            name: tuple(dependencies) for name, dependencies in entry["dependencies"].items()
+        }
+        schema.encoded_types = entry["encodedTypes"]
+        schema.type_hashes = {
+            name: bytes.fromhex(type_hash) for name, type_hash in entry["typeHashes"].items()
+        }
+        schema.domain_separators = {}
+        for domain in entry["domainSeparators"]:
+            values = []
+            for type_name, value in domain["values"]:
+                value_type = _CACHEABLE_DOMAIN_VALUE_TYPES_BY_NAME[type_name]
+                values.append((value_type, bytes.fromhex(value) if value_type is bytes else value))
+            key = (tuple(tuple(field) for field in domain["fields"]), tuple(values))
+            schema.domain_separators[key] = bytes.fromhex(domain["separator"])
+        schema.struct_hash_cache_size = entry["structHashCacheSize"]
+        schema._prepare()
+        return schema
+
+    def __eq__(self, other):
+        return isinstance(other, CompiledTypedDataSchema) and self.types == other.types
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.types!r})"
+
+    def __getstate__(self):
+        # compiled field encoders are closures, rebuild them lazily after unpickling
+        state = self.__dict__.copy()
+        state["_field_encoders"] = {}
+        state["_struct_hashes"] = OrderedDict()
+        del state["_struct_hashes_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._struct_hashes_lock = threading.Lock()
+
+    def _canonical_value(self, field_type, value):
+        """
+        Get a hashable form of ``value`` which only equals the canonical form of values that
+        encode the same way as ``field_type``.
+
+        :raises KeyError: if a struct field is missing
+        :raises TypeError: if a value is unhashable, or not shaped like ``field_type``
+        """
+        if field_type in self.types:
+            return tuple(
+                self._canonical_value(item_type, value[name])
+                for name, item_type in self._struct_plans[field_type]
+            )
+        if is_array_type(field_type):
+            if not isinstance(value, (list, tuple)):
+                raise TypeError(f"Expected an array of type {field_type}, got {value!r}")
+            item_type = field_type[:field_type.rindex("[")]
+            return tuple(self._canonical_value(item_type, item) for item in value)
+        hash(value)
+        return (type(value), value)
+
+    def _hash_nested_struct(self, struct_type, data):
+        if not self.struct_hash_cache_size:
+            return self.hash_struct(struct_type, data)
+        try:
+            key = (struct_type, self._canonical_value(struct_type, data))
+        except (KeyError, TypeError):
+            # let the uncached path raise the usual errors, or hash unhashable values
+            return self.hash_struct(struct_type, data)
+
+        struct_hashes = self._struct_hashes
+        with self._struct_hashes_lock:
+            struct_hash = struct_hashes.get(key)
+            if struct_hash is not None:
+                struct_hashes.move_to_end(key)
+                return struct_hash
+
+        # hash outside the lock: hashing nested structs takes it again
+        struct_hash = self.hash_struct(struct_type, data)
+        with self._struct_hashes_lock:
+            struct_hashes[key] = struct_hash
+            if len(struct_hashes) > self.struct_hash_cache_size:
+                struct_hashes.popitem(last=False)
+        return struct_hash
+
+    def _get_field_encoder(self, field_type):
+        try:
+            return self._field_encoders[field_type]
+        except KeyError:
+            encoder = self._compile_field_encoder(field_type)
+            self._field_encoders[field_type] = encoder
+            return encoder
+
+    def _compile_field_encoder(self, field_type):
+        """
+        Build a function of (name, value) with the same result as :func:`encode_field_word`.
+        """
+        if field_type in self.types:
+            def encode_struct_field(name, value):
+                if value is None:
+                    raise ValueError(f"Missing value for field {name} of type {field_type}")
+                return self._hash_nested_struct(field_type, value)
+            return encode_struct_field
+
+        if is_array_type(field_type):
+            declared_dimensions = tuple(
+                dimension[0] if dimension else None
+                for dimension in parse(field_type).arrlist
+            )
+            item_type = field_type[:field_type.rindex("[")]
+            pack_static_array = get_static_array_packer(field_type)
+
+            def encode_array_field(name, value):
+                if value is None:
+                    raise ValueError(f"Missing value for field {name} of type {field_type}")
+                if pack_static_array is not None:
+                    packed_array = pack_static_array(value)
+                    if packed_array is not None:
+                        return keccak(packed_array)
+                array_dimensions = get_array_dimensions(value)
+                for i in range(len(array_dimensions)):
+                    declared = declared_dimensions[i]
+                    if declared is not None and array_dimensions[i] != declared:
+                        # Dimensions should match with declared schema
+                        raise TypeError(
+                            f"Array data `{value}` has dimensions `{array_dimensions}`"
+                            f" whereas the schema has dimensions "
+                            f"`{tuple(d or 'dynamic' for d in declared_dimensions)}`"
+                        )
+                encode_item = self._get_field_encoder(item_type)
+                return keccak(b''.join([encode_item(name, item) for item in value]))
+            return encode_array_field
+
+        if is_atomic_type(self.types, field_type):
+            def encode_atomic(name, value):
+                if value is None:
+                    raise ValueError(f"Missing value for field {name} of type {field_type}")
+                return encode_atomic_field(name, field_type, value)
+            return encode_atomic
+
+        # bytes and string are cheap enough to delegate
+        types = self.types
+
+        def encode_other_field(name, value):
+            return encode_field(types, name, field_type, value)[1]
+        return encode_other_field
+
+    def encode_data(self, primary_type, data):
+        """Same as :func:`encode_data`, with the precomputed plan for ``primary_type``."""
+        encoded_values = [self.type_hashes[primary_type]]
+        for name, field_type in self._struct_plans[primary_type]:
+            encode = self._get_field_encoder(field_type)
+            encoded_values.append(encode(name, data[name]))
+        return b''.join(encoded_values)
+
+    def hash_struct(self, primary_type, data):
+        """Hash the struct ``data`` of type ``primary_type``, as ``keccak(encode_data(...))``."""
+        return keccak(self.encode_data(primary_type, data))
+
+    def hash_domain(self, domain):
+        """Same as :func:`hash_domain`, for the ``domain`` of structured data with this schema."""
+        key = _domain_separator_key(self.types, domain)
+        try:
+            return self.domain_separators[key]
+        except KeyError:
+            pass
+        separator = hash_domain({"types": self.types, "domain": domain})
+        if key is not None and len(self.domain_separators) < DOMAIN_SEPARATOR_CACHE_SIZE:
+            self.domain_separators[key] = separator
+        return separator
+
+    def hash_message(self, primary_type, message):
+        """Same as :func:`hash_message`, for a ``message`` of type ``primary_type``."""
+        return self.hash_struct(primary_type, message)
+
+
+def compile_typed_data(types, domain, primary_type):
+    """
+    Validate and compile what many structured data messages have in common.
+
+    :param dict types: the ``types`` of the structured data, including ``EIP712Domain``
+    :param dict domain: the ``domain`` of the structured data
+    :param str primary_type: the ``primaryType`` of every message
+    :returns: the :class:`CompiledTypedDataSchema` of ``types``, and the domain separator
+    """
+    validate_structured_data({
+        "types": types,
+        "primaryType": primary_type,
+        "domain": domain,
+        "message": None,
+    })
+    schema = CompiledTypedDataSchema(types)
+    return schema, schema.hash_domain(domain)
+
+
+def save_compiled_schemas(path, schemas):
+    """
+    Write compiled schemas, and the domain separators they hashed, to a cache file.
+
+    Only domains whose values are str, int, bool or bytes are saved.
+
+    :param path: the cache file to (over)write
+    :param schemas: the :class:`CompiledTypedDataSchema` objects to save
+    """
+    cache = {
+        "format": SCHEMA_CACHE_FORMAT,
+        "version": SCHEMA_CACHE_VERSION,
+        "schemas": [schema._to_cache_entry() for schema in schemas],
+    }
+    with open(path, 'w') as cache_file:
+        json.dump(cache, cache_file, separators=(',', ':'))
+
+
+def load_compiled_schemas(path):
+    """
+    Read compiled schemas back from a file written by :func:`save_compiled_schemas`.
+
+    The saved artefacts are trusted: the schemas are neither validated nor compiled
+    again, which is the point of the cache. Only load files written by this package.
+
+    :param path: the cache file
+    :returns: the saved schemas, or an empty list if the file was written by another
+        version of the cache format
+    :rtype: list of CompiledTypedDataSchema
+    """
+    with open(path, 'r') as cache_file:
+        cache = json.load(cache_file)
+    if cache.get("format") != SCHEMA_CACHE_FORMAT or cache.get("version") != SCHEMA_CACHE_VERSION:
+        return []
+    return [CompiledTypedDataSchema._from_cache_entry(entry) for entry in cache["schemas"]]
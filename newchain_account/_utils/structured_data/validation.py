@@ -1,3 +1,9 @@
+from collections import (
+    Counter,
+)
+from functools import (
+    lru_cache,
+)
 import re
 
 from eth_utils import (
@@ -8,6 +14,12 @@ from eth_utils import (
 IDENTIFIER_REGEX = r"^[a-zA-Z_$][a-zA-Z_$0-9]*$"
 TYPE_REGEX = r"^[a-zA-Z_$][a-zA-Z_$0-9]*(\[([1-9]\d*\b)*\])*$"
 
+IDENTIFIER_PATTERN = re.compile(IDENTIFIER_REGEX)
+TYPE_PATTERN = re.compile(TYPE_REGEX)
+
+# Number of distinct `types` attributes remembered as valid by `validate_structured_data`
+VALIDATED_TYPES_CACHE_SIZE = 256
+
 
 def validate_has_attribute(attr_name, dict_data):
     if attr_name not in dict_data:
@@ -44,12 +56,12 @@ def validate_types_attribute(structured_data):
                     format(field["type"], struct_name, type(field["type"]))
                 )
             # Check that field["name"] matches with IDENTIFIER_REGEX
-            if not re.match(IDENTIFIER_REGEX, field["name"]):
+            if not IDENTIFIER_PATTERN.match(field["name"]):
                 raise ValidationError(
                     "Invalid Identifier `{0}` in `{1}`".format(field["name"], struct_name)
                 )
             # Check that field["type"] matches with TYPE_REGEX
-            if not re.match(TYPE_REGEX, field["type"]):
+            if not TYPE_PATTERN.match(field["type"]):
                 raise ValidationError(
                     "Invalid Type `{0}` in `{1}`".format(field["type"], struct_name)
                 )
@@ -85,8 +97,14 @@ def validate_EIP712Domain_schema(structured_data):
     header_fields = used_header_fields(EIP712Domain_data)
     if len(header_fields) == 0:
         raise ValidationError(f"One of {EIP712_DOMAIN_FIELDS} must be defined in {structured_data}")
+    # count the names in a single pass, instead of scanning the struct once per header field
+    field_counts = Counter(field["name"] for field in EIP712Domain_data)
     for field in header_fields:
-        validate_field_declared_only_once_in_struct(field, EIP712Domain_data, "EIP712Domain")
+        if field_counts[field] != 1:
+            raise ValidationError(
+                "Attribute `{0}` not declared or declared more than once in {1}".
+                format(field, "EIP712Domain")
+            )
 
 
 def validate_primaryType_attribute(structured_data):
@@ -107,11 +125,57 @@ def validate_primaryType_attribute(structured_data):
         )
 
 
-def validate_structured_data(structured_data):
+def types_fingerprint(types):
+    """
+    Get a hashable snapshot of the content of a `types` attribute, or None if there is none.
+    """
+    try:
+        fingerprint = tuple(
+            (struct_name, tuple(tuple(field.items()) for field in fields))
+            for struct_name, fields in types.items()
+        )
+        hash(fingerprint)
+    except (AttributeError, TypeError):
+        return None
+    return fingerprint
+
+
+@lru_cache(maxsize=VALIDATED_TYPES_CACHE_SIZE)
+def _validate_types_fingerprint(fingerprint):
+    types = {
+        struct_name: [dict(field) for field in fields]
+        for struct_name, fields in fingerprint
+    }
+    validate_types_attribute({"types": types})
+    validate_EIP712Domain_schema({"types": types})
+
+
+def validate_types(structured_data):
+    """
+    Validate the `types` attribute, including its `EIP712Domain` struct.
+
+    `types` that were already found valid are recognized by their fingerprint, and not
+    validated again.
+    """
+    validate_has_attribute("types", structured_data)
+    fingerprint = types_fingerprint(structured_data["types"])
+    if fingerprint is not None:
+        try:
+            _validate_types_fingerprint(fingerprint)
+        except Exception:
+            # validate the original data again below, for the exact same error
+            pass
+        else:
+            return
     # validate the `types` attribute
     validate_types_attribute(structured_data)
     # validate the `EIP712Domain` struct of `types` attribute
     validate_EIP712Domain_schema(structured_data)
+
+
+def validate_structured_data(structured_data):
+    # validate the `types` attribute, and its `EIP712Domain` struct
+    validate_types(structured_data)
     # validate the `primaryType` attribute
     validate_primaryType_attribute(structured_data)
     # Check that there is a `domain` attribute in the structured data
@@ -30,7 +30,6 @@ from eth_utils.curried import (
     hexstr_if_str,
     is_bytes,
     is_string,
-    to_bytes,
     to_int,
 )
 from hexbytes import (
@@ -54,6 +53,7 @@ from .transaction_utils import (
 from .validation import (
     LEGACY_TRANSACTION_FORMATTERS,
     LEGACY_TRANSACTION_VALID_VALUES,
+    hex_address_to_bytes,
     is_int_or_prefixed_hexstr,
     is_rpc_structured_access_list,
 )
@@ -66,7 +66,7 @@ TYPED_TRANSACTION_FORMATTERS = merge(
             apply_formatters_to_dict(
                 {
                     "address": apply_one_of_formatters((
-                        (is_string, hexstr_if_str(to_bytes)),
+                        (is_string, hex_address_to_bytes),
                         (is_bytes, identity),
                     )),
                     "storageKeys": apply_formatter_to_array(hexstr_if_str(to_int))
@@ -127,8 +127,14 @@ class TypedTransaction:
         self.transaction = transaction
 
     @classmethod
-    def from_dict(cls, dictionary: Dict[str, Any]) -> "TypedTransaction":
-        """Builds a TypedTransaction from a dictionary. Verifies the dictionary is well formed."""
+    def from_dict(cls, dictionary: Dict[str, Any], validate: bool = True) -> "TypedTransaction":
+        """
+        Builds a TypedTransaction from a dictionary. Verifies the dictionary is well formed.
+
+        With ``validate=False``, the fields are trusted to be valid and already formatted
+        (integers for quantities, bytes for addresses and data), so both field validation
+        and formatting are skipped.
+        """
         dictionary = set_transaction_type_if_needed(dictionary)
         if not ('type' in dictionary and is_int_or_prefixed_hexstr(dictionary['type'])):
             raise ValueError("missing or incorrect transaction type")
@@ -143,7 +149,7 @@ class TypedTransaction:
             raise TypeError("Unknown Transaction type: %s" % transaction_type)
         return cls(
             transaction_type=transaction_type,
-            transaction=transaction.from_dict(dictionary),
+            transaction=transaction.from_dict(dictionary, validate),
         )
 
     @classmethod
@@ -267,19 +273,27 @@ class AccessListTransaction(_TypedTransactionImplementation):
             raise TypeError("Transaction had invalid fields: %r" % invalid)
 
     @classmethod
-    def from_dict(cls, dictionary: Dict[str, Any]) -> "AccessListTransaction":
+    def from_dict(
+            cls,
+            dictionary: Dict[str, Any],
+            validate: bool = True) -> "AccessListTransaction":
         """
         Builds an AccessListTransaction from a dictionary.
-        Verifies that the dictionary is well formed.
+        Verifies that the dictionary is well formed, unless ``validate`` is False.
         """
-        # Validate fields.
-        cls.assert_valid_fields(dictionary)
-        sanitized_dictionary = pipe(
-            dictionary,
-            dict,
-            partial(merge, cls.transaction_field_defaults),
-            apply_formatters_to_dict(TYPED_TRANSACTION_FORMATTERS),
-        )
+        if validate:
+            # Validate fields.
+            cls.assert_valid_fields(dictionary)
+            sanitized_dictionary = pipe(
+                dictionary,
+                dict,
+                partial(merge, cls.transaction_field_defaults),
+                apply_formatters_to_dict(TYPED_TRANSACTION_FORMATTERS),
+            )
+        else:
+            # Trusted input: fields are already formatted, except maybe the type.
+            sanitized_dictionary = merge(cls.transaction_field_defaults, dictionary)
+            sanitized_dictionary['type'] = hexstr_if_str(to_int, sanitized_dictionary['type'])
 
         # We have verified the type, we can safely remove it from the dictionary,
         # given that it is not to be included within the RLP payload.
@@ -430,19 +444,27 @@ class DynamicFeeTransaction(_TypedTransactionImplementation):
             raise TypeError("Transaction had invalid fields: %r" % invalid)
 
     @classmethod
-    def from_dict(cls, dictionary: Dict[str, Any]) -> "DynamicFeeTransaction":
+    def from_dict(
+            cls,
+            dictionary: Dict[str, Any],
+            validate: bool = True) -> "DynamicFeeTransaction":
         """
         Builds a DynamicFeeTransaction from a dictionary.
-        Verifies that the dictionary is well formed.
+        Verifies that the dictionary is well formed, unless ``validate`` is False.
         """
-        # Validate fields.
-        cls.assert_valid_fields(dictionary)
-        sanitized_dictionary = pipe(
-            dictionary,
-            dict,
-            partial(merge, cls.transaction_field_defaults),
-            apply_formatters_to_dict(TYPED_TRANSACTION_FORMATTERS),
-        )
+        if validate:
+            # Validate fields.
+            cls.assert_valid_fields(dictionary)
+            sanitized_dictionary = pipe(
+                dictionary,
+                dict,
+                partial(merge, cls.transaction_field_defaults),
+                apply_formatters_to_dict(TYPED_TRANSACTION_FORMATTERS),
+            )
+        else:
+            # Trusted input: fields are already formatted, except maybe the type.
+            sanitized_dictionary = merge(cls.transaction_field_defaults, dictionary)
+            sanitized_dictionary['type'] = hexstr_if_str(to_int, sanitized_dictionary['type'])
 
         # We have verified the type, we can safely remove it from the dictionary,
         # given that it is not to be included within the RLP payload.
@@ -1,3 +1,7 @@
+from functools import (
+    lru_cache,
+)
+
 from cytoolz import (
     identity,
 )
@@ -21,13 +25,54 @@ from eth_utils.curried import (
 
 VALID_EMPTY_ADDRESSES = {None, b'', ''}
 
+# Number of distinct hex-encoded addresses whose validation results are kept around.
+# Transactions tend to go to a small set of contracts, so repeat destinations skip the
+# keccak of the checksum test and the hex decoding.
+ADDRESS_CACHE_SIZE = 4096
+
 
 def is_none(val):
     return val is None
 
 
+@lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def _inspect_hex_address(value):
+    """
+    Returns (is_address, is_checksum_address, canonical_address) for a str 'value'.
+
+    The canonical address is the 20-byte form, or None if 'value' is not an address.
+    """
+    is_checksummed = is_checksum_address(value)
+    is_any_address = is_checksummed or is_address(value)
+    canonical_address = to_bytes(hexstr=value) if is_any_address else None
+    return is_any_address, is_checksummed, canonical_address
+
+
 def is_valid_address(value):
-    return is_binary_address(value) or is_checksum_address(value)
+    if isinstance(value, str):
+        return _inspect_hex_address(value)[1]
+    return is_binary_address(value)
+
+
+def is_any_address(value):
+    """Same as :func:`eth_utils.is_address`, with hex-encoded results cached."""
+    if isinstance(value, str):
+        return _inspect_hex_address(value)[0]
+    return is_address(value)
+
+
+def hex_address_to_bytes(value):
+    """
+    Convert a hex-encoded address to its 20-byte form, with results cached.
+
+    Any other value is converted like ``hexstr_if_str(to_bytes)`` would.
+    """
+    if not isinstance(value, str):
+        return hexstr_if_str(to_bytes, value)
+    canonical_address = _inspect_hex_address(value)[2]
+    if canonical_address is None:
+        return hexstr_if_str(to_bytes, value)
+    return canonical_address
 
 
 def is_int_or_prefixed_hexstr(val):
@@ -59,7 +104,7 @@ def is_rpc_structured_access_list(val):
         storage_keys = d.get('storageKeys')
         if any(_ is None for _ in (address, storage_keys)):
             return False
-        if not is_address(address):
+        if not is_any_address(address):
             return False
         if not is_list_like(storage_keys):
             return False
@@ -79,7 +124,7 @@ def is_rlp_structured_access_list(val):
         if len(item) != 2:
             return False
         address, storage_keys = item
-        if not is_address(address):
+        if not is_any_address(address):
             return False
         for storage_key in storage_keys:
             if not is_int_or_prefixed_hexstr(storage_key):
@@ -92,7 +137,7 @@ LEGACY_TRANSACTION_FORMATTERS = {
     'gasPrice': hexstr_if_str(to_int),
     'gas': hexstr_if_str(to_int),
     'to': apply_one_of_formatters((
-        (is_string, hexstr_if_str(to_bytes)),
+        (is_string, hex_address_to_bytes),
         (is_bytes, identity),
         (is_none, lambda val: b''),
     )),
@@ -1,9 +1,17 @@
 from collections.abc import (
     Mapping,
 )
+from itertools import (
+    zip_longest,
+)
 import json
 import os
 from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
     Optional,
     Tuple,
     TypeVar,
@@ -38,6 +46,7 @@ from eth_utils.curried import (
     keccak,
     text_if_str,
     to_bytes,
+    to_canonical_address,
     to_int,
 )
 from hexbytes import (
@@ -48,13 +57,26 @@ from newchain_account._utils.legacy_transactions import (
     Transaction,
     vrs_from,
 )
+from newchain_account._utils.parallel import (
+    DEFAULT_CHUNK_SIZE,
+    map_chunks,
+)
 from newchain_account._utils.signing import (
+    hash_and_vrs_of_signed_legacy_transaction,
     hash_of_signed_transaction,
+    recover_message_hash_signers,
+    recover_typed_data_signers,
     sign_message_hash,
+    sign_message_hash_with_keys,
+    sign_message_hashes,
     sign_transaction_dict,
+    sign_typed_data_messages,
     to_standard_signature_bytes,
     to_standard_v,
 )
+from newchain_account._utils.structured_data.hashing import (
+    compile_typed_data,
+)
 from newchain_account._utils.typed_transactions import (
     TypedTransaction,
 )
@@ -64,13 +86,21 @@ from newchain_account.datastructures import (
 )
 from newchain_account.hdaccount import (
     ETHEREUM_DEFAULT_PATH,
+    derive_children,
+    extended_key_from_seed,
     generate_mnemonic,
     key_from_seed,
     seed_from_mnemonic,
 )
+from newchain_account.hdaccount.deterministic import (
+    HardNode,
+)
 from newchain_account.messages import (
+    STREAM_CHUNK_SIZE,
+    MessageSource,
     SignableMessage,
     _hash_eip191_message,
+    hash_defunct_stream,
 )
 from newchain_account.signers.local import (
     LocalAccount,
@@ -272,7 +302,8 @@ class Account:
     def from_mnemonic(self,
                       mnemonic: str,
                       passphrase: str = "",
-                      account_path: str = ETHEREUM_DEFAULT_PATH) -> LocalAccount:
+                      account_path: str = ETHEREUM_DEFAULT_PATH,
+                      chain_id: int = MAINNET_CHAIN_ID) -> LocalAccount:
         """
         Generate an account from a mnemonic.
 
@@ -282,6 +313,7 @@ class Account:
         :param str passphrase: Optional passphrase used to encrypt the mnemonic
         :param str account_path: Specify an alternate HD path for deriving the seed using
             BIP32 HD wallet key derivation.
+        :param int chain_id: the chain of the account's NewChain address
         :return: object with methods for signing and encrypting
         :rtype: LocalAccount
 
@@ -335,7 +367,86 @@ class Account:
         seed = seed_from_mnemonic(mnemonic, passphrase)
         private_key = key_from_seed(seed, account_path)
         key = self._parsePrivateKey(private_key)
-        return LocalAccount(key, self)
+        return LocalAccount(key, self, chain_id)
+
+    @combomethod
+    def from_mnemonic_range(
+            self,
+            mnemonic: str,
+            base_path: str,
+            start: int,
+            count: int,
+            *,
+            passphrase: str = "",
+            chain_id: int = MAINNET_CHAIN_ID,
+            addresses_only: bool = False,
+            max_workers: Optional[int] = None,
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[Union[LocalAccount, ChecksumAddress]]:
+        """
+        Generate the accounts at ``base_path/start`` to ``base_path/(start + count - 1)``.
+
+        .. CAUTION:: This feature is experimental, unaudited, and likely to change soon
+
+        This gives the same accounts as calling :meth:`from_mnemonic` for each index, but
+        the mnemonic is stretched into a seed and the parent node is derived only once.
+        The children are derived in chunks, in a process pool if ``max_workers`` is given.
+
+        :param str mnemonic: space-separated list of BIP39 mnemonic seed words
+        :param str base_path: the BIP32 path of the parent node, like ``m/44'/60'/0'/0``
+        :param int start: the index of the first account
+        :param int count: the number of accounts
+        :param str passphrase: Optional passphrase used to encrypt the mnemonic
+        :param int chain_id: the chain of the accounts' NewChain addresses
+        :param bool addresses_only: generate only the checksummed addresses, which is
+            faster, and keeps the private keys in the workers
+        :param int max_workers: derive in a process pool of this size, instead of in the
+            current process
+        :param int chunk_size: number of accounts derived by a worker at a time
+        :returns: a generator of the accounts, or of their addresses, in index order
+        :rtype: iterator of LocalAccount or str
+
+        .. doctest:: python
+
+            >>> from newchain_account import Account
+            >>> Account.enable_unaudited_hdwallet_features()
+            >>> mnemonic = (
+            ...     "health embark april buyer eternal leopard "
+            ...     "want before nominee head thing tackle")
+            >>> accounts = Account.from_mnemonic_range(mnemonic, "m/44'/60'/0'/0", 1, 3)
+            >>> [acct.address for acct in accounts] == [
+            ...     Account.from_mnemonic(mnemonic, account_path=f"m/44'/60'/0'/0/{i}").address
+            ...     for i in range(1, 4)
+            ... ]
+            True
+        """
+        if not self._use_unaudited_hdwallet_features:
+            raise AttributeError(
+                "The use of the Mnemonic features of Account is disabled by default until "
+                "its API stabilizes. To use these features, please enable them by running "
+                "`Account.enable_unaudited_hdwallet_features()` and try again."
+            )
+        if start < 0 or count < 0 or start + count > HardNode.OFFSET:
+            raise ValidationError(
+                f"Cannot derive {count} accounts from index {start}: soft indices must be "
+                f"between 0 and {HardNode.OFFSET - 1}"
+            )
+        seed = seed_from_mnemonic(mnemonic, passphrase)
+        parent_key, parent_chain_code, parent_point = extended_key_from_seed(seed, base_path)
+        children = map_chunks(
+            derive_children,
+            range(start, start + count),
+            self._keys,
+            parent_key,
+            parent_chain_code,
+            parent_point,
+            addresses_only,
+            max_workers=max_workers,
+            chunk_size=chunk_size,
+        )
+        if addresses_only:
+            return children
+        return (LocalAccount(key, self, chain_id) for key in children)
 
     @combomethod
     def create_with_mnemonic(self,
@@ -454,6 +565,180 @@ class Account:
         message_hash = _hash_eip191_message(signable_message)
         return cast(ChecksumAddress, self._recover_hash(message_hash, vrs, signature))
 
+    @combomethod
+    def recover_message_signers(
+            self,
+            signable_message: SignableMessage,
+            signatures: Iterable[Union[bytes, HexStr, int]],
+            *,
+            as_mapping: bool = False,
+            max_workers: Optional[int] = None,
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Union[List[ChecksumAddress], Dict[ChecksumAddress, HexBytes]]:
+        r"""
+        Get the addresses of the accounts that signed the same message.
+
+        This is equivalent to calling :meth:`recover_message` once per signature, but the
+        message is only hashed once, which matters when verifying many signatures over a
+        single message, like votes or claims.
+
+        :param signable_message: the message that was signed by everyone
+        :param signatures: signature bytes concatenated as r+s+v, one per signer
+        :type signatures: iterable of hex str, bytes or int
+        :param bool as_mapping: return a dict of signer address to signature, instead of
+            a list of addresses. If several signatures recover to the same address, the
+            last one is kept.
+        :param int max_workers: recover in a process pool of this size, instead of in the
+            current process
+        :param int chunk_size: number of signatures sent to a worker at a time
+        :returns: the signer of each signature, hex-encoded & checksummed, in order
+        :rtype: list or dict
+
+        .. doctest:: python
+
+            >>> from newchain_account.messages import encode_defunct
+            >>> from newchain_account import Account
+            >>> message = encode_defunct(text="I♥SF")
+            >>> signatures = [
+            ...     Account.sign_message(message, key).signature
+            ...     for key in (b'\x01' * 32, b'\x02' * 32)
+            ... ]
+            >>> signers = Account.recover_message_signers(message, signatures)
+            >>> signers == [Account.recover_message(message, signature=sig) for sig in signatures]
+            True
+        """
+        message_hash = _hash_eip191_message(signable_message)
+        signature_bytes = [HexBytes(signature) for signature in signatures]
+        signers = list(map_chunks(
+            recover_message_hash_signers,
+            signature_bytes,
+            self._keys,
+            message_hash,
+            max_workers=max_workers,
+            chunk_size=chunk_size,
+        ))
+        if as_mapping:
+            return dict(zip(signers, signature_bytes))
+        return signers
+
+    @combomethod
+    def recover_typed_data_signers(
+            self,
+            types: Dict[str, List[Dict[str, str]]],
+            domain: Dict[str, Any],
+            primary_type: str,
+            signed_messages: Iterable[Tuple[Dict[str, Any], Union[bytes, HexStr]]],
+            *,
+            max_workers: Optional[int] = None,
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> List[ChecksumAddress]:
+        r"""
+        Get the addresses of the accounts that signed many EIP-712 messages, which share
+        the same types and domain.
+
+        This gives the same addresses as calling :meth:`recover_message` on the
+        :meth:`~newchain_account.messages.encode_structured_data` of each message, but the
+        types are validated and compiled once, and the domain separator is hashed once.
+
+        :param dict types: the ``types`` of the structured data, including ``EIP712Domain``
+        :param dict domain: the ``domain`` of the structured data
+        :param str primary_type: the ``primaryType`` of every message
+        :param signed_messages: ``(message, signature)`` pairs, where each message is the
+            ``message`` part of a structured data, and each signature is the r+s+v bytes
+        :param int max_workers: recover in a process pool of this size, instead of in the
+            current process
+        :param int chunk_size: number of messages sent to a worker at a time
+        :returns: the signer of each message, hex-encoded & checksummed, in order
+        """
+        schema, domain_hash = compile_typed_data(types, domain, primary_type)
+        return list(map_chunks(
+            recover_typed_data_signers,
+            ((message, HexBytes(signature)) for message, signature in signed_messages),
+            self._keys,
+            schema,
+            primary_type,
+            domain_hash,
+            max_workers=max_workers,
+            chunk_size=chunk_size,
+        ))
+
+    @combomethod
+    def verify_typed_data_signers(
+            self,
+            types: Dict[str, List[Dict[str, str]]],
+            domain: Dict[str, Any],
+            primary_type: str,
+            signed_messages: Iterable[Tuple[Dict[str, Any], Union[bytes, HexStr]]],
+            signers: Iterable[Union[bytes, str]],
+            *,
+            max_workers: Optional[int] = None,
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> List[bool]:
+        r"""
+        Check that many EIP-712 messages, which share the same types and domain, were
+        signed by the claimed accounts.
+
+        Works like :meth:`recover_typed_data_signers`, except that a signature which
+        cannot be recovered is reported as not matching, instead of raising.
+
+        :param dict types: the ``types`` of the structured data, including ``EIP712Domain``
+        :param dict domain: the ``domain`` of the structured data
+        :param str primary_type: the ``primaryType`` of every message
+        :param signed_messages: ``(message, signature)`` pairs, where each message is the
+            ``message`` part of a structured data, and each signature is the r+s+v bytes
+        :param signers: the claimed signer address of each message, in the same order
+        :param int max_workers: recover in a process pool of this size, instead of in the
+            current process
+        :param int chunk_size: number of messages sent to a worker at a time
+        :returns: whether each message was signed by its claimed signer, in order
+
+        .. doctest:: python
+
+            >>> types = {
+            ...     "EIP712Domain": [{"name": "name", "type": "string"}],
+            ...     "Order": [{"name": "amount", "type": "uint256"}],
+            ... }
+            >>> domain = {"name": "Exchange"}
+            >>> messages = [{"amount": 1}, {"amount": 2}]
+            >>> key = b'\x01' * 32
+            >>> signed = Account.sign_typed_data_batch(types, domain, "Order", messages, key)
+            >>> signer = Account.from_key(key).address
+            >>> Account.verify_typed_data_signers(
+            ...     types,
+            ...     domain,
+            ...     "Order",
+            ...     [(messages[0], signed[0].signature), (messages[1], signed[0].signature)],
+            ...     [signer, signer],
+            ... )
+            [True, False]
+        """
+        schema, domain_hash = compile_typed_data(types, domain, primary_type)
+        recovered = map_chunks(
+            recover_typed_data_signers,
+            ((message, HexBytes(signature)) for message, signature in signed_messages),
+            self._keys,
+            schema,
+            primary_type,
+            domain_hash,
+            False,
+            max_workers=max_workers,
+            chunk_size=chunk_size,
+        )
+        claimed_signers = [to_canonical_address(signer) for signer in signers]
+        missing = object()
+        verified = []
+        for recovered_signer, claimed_signer in zip_longest(
+                recovered, claimed_signers, fillvalue=missing):
+            if recovered_signer is missing or claimed_signer is missing:
+                raise ValueError(
+                    "Got %d claimed signers for a different number of signed messages"
+                    % len(claimed_signers)
+                )
+            verified.append(recovered_signer is not None and (
+                to_canonical_address(recovered_signer) == claimed_signer
+            ))
+        return verified
+
     @combomethod
     def recoverHash(self, message_hash, vrs=None, signature=None):
         """
@@ -535,6 +820,12 @@ class Account:
             vrs = typed_transaction.vrs()
             return self._recover_hash(msg_hash, vrs=vrs)
 
+        hash_and_vrs = hash_and_vrs_of_signed_legacy_transaction(txn_bytes)
+        if hash_and_vrs is not None:
+            msg_hash, vrs = hash_and_vrs
+            return self._recover_hash(msg_hash, vrs=vrs)
+
+        # Not a canonical legacy transaction: decode it fully, for a descriptive error
         txn = Transaction.from_bytes(txn_bytes)
         msg_hash = hash_of_signed_transaction(txn)
         return self._recover_hash(msg_hash, vrs=vrs_from(txn))
@@ -611,6 +902,233 @@ class Account:
         message_hash = _hash_eip191_message(signable_message)
         return cast(SignedMessage, self._sign_hash(message_hash, private_key))
 
+    @combomethod
+    def sign_messages(
+            self,
+            signable_messages: Iterable[SignableMessage],
+            private_key: Union[bytes, HexStr, int, keys.PrivateKey],
+            *,
+            stream: bool = False,
+            max_workers: Optional[int] = None,
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Union[List[SignedMessage], Iterator[SignedMessage]]:
+        r"""
+        Sign many messages with the same key.
+
+        This gives the same signatures as calling :meth:`sign_message` once per message,
+        but the private key is parsed once, and only the signing itself is done per message.
+
+        :param signable_messages: the encoded messages for signing
+        :param private_key: the key to sign the messages with
+        :type private_key: hex str, bytes, int or :class:`newchain_keys.datatypes.PrivateKey`
+        :param bool stream: return an iterator which signs messages as it is consumed,
+            instead of a list, so that large or lazy inputs are never held in memory at once
+        :param int max_workers: sign in a process pool of this size, instead of in the
+            current process
+        :param int chunk_size: number of messages sent to a worker at a time
+        :returns: the signature of each message, in order
+        :rtype: list or iterator of ~newchain_account.datastructures.SignedMessage
+
+        .. doctest:: python
+
+            >>> from newchain_account.messages import encode_defunct
+            >>> messages = [encode_defunct(text=text) for text in ("I♥SF", "I♥NY")]
+            >>> key = "0xb25c7db31feed9122727bf0939dc769a96564b2de4c4726d035b36ecf1e5b364"
+            >>> signed = Account.sign_messages(messages, key)
+            >>> signed == [Account.sign_message(message, key) for message in messages]
+            True
+        """
+        key = self._parsePrivateKey(private_key)
+        signed_messages = (
+            SignedMessage(
+                messageHash=HexBytes(message_hash),
+                r=r,
+                s=s,
+                v=v,
+                signature=HexBytes(eth_signature_bytes),
+            )
+            for (message_hash, v, r, s, eth_signature_bytes) in map_chunks(
+                sign_message_hashes,
+                (_hash_eip191_message(message) for message in signable_messages),
+                key,
+                max_workers=max_workers,
+                chunk_size=chunk_size,
+            )
+        )
+        if stream:
+            return signed_messages
+        return list(signed_messages)
+
+    @combomethod
+    def sign_message_with_keys(
+            self,
+            signable_message: SignableMessage,
+            private_keys: Iterable[Union[bytes, HexStr, int, keys.PrivateKey, LocalAccount]],
+            *,
+            max_workers: Optional[int] = None,
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Dict[ChecksumAddress, SignedMessage]:
+        r"""
+        Sign the same message with many keys, like the co-signers of a multisig.
+
+        This gives the same signatures as calling :meth:`sign_message` once per key, but the
+        message is only hashed once. Deriving each signer address and signing are done in
+        a process pool, if ``max_workers`` is given.
+
+        :param signable_message: the encoded message for signing
+        :param private_keys: the keys to sign the message with
+        :type private_keys: iterable of hex str, bytes, int,
+            :class:`newchain_keys.datatypes.PrivateKey` or
+            :class:`~newchain_account.signers.local.LocalAccount`
+        :param int max_workers: sign in a process pool of this size, instead of in the
+            current process
+        :param int chunk_size: number of keys sent to a worker at a time
+        :returns: the signature of each signer, keyed by its address, hex-encoded &
+            checksummed, in the order of ``private_keys``. Duplicate keys are signed with once.
+        :rtype: dict
+
+        .. doctest:: python
+
+            >>> from newchain_account.messages import encode_defunct
+            >>> message = encode_defunct(text="I♥SF")
+            >>> private_keys = [b'\x01' * 32, b'\x02' * 32]
+            >>> signed = Account.sign_message_with_keys(message, private_keys)
+            >>> signer = Account.from_key(private_keys[1]).address
+            >>> signed[signer] == Account.sign_message(message, private_keys[1])
+            True
+        """
+        message_hash = HexBytes(_hash_eip191_message(signable_message))
+        unique_keys = dict.fromkeys(
+            self._private_key_bytes(private_key) for private_key in private_keys
+        )
+        return {
+            signer: SignedMessage(
+                messageHash=message_hash,
+                r=r,
+                s=s,
+                v=v,
+                signature=HexBytes(eth_signature_bytes),
+            )
+            for (signer, v, r, s, eth_signature_bytes) in map_chunks(
+                sign_message_hash_with_keys,
+                unique_keys,
+                self._keys,
+                message_hash,
+                max_workers=max_workers,
+                chunk_size=chunk_size,
+            )
+        }
+
+    @combomethod
+    def sign_defunct_stream(
+            self,
+            source: MessageSource,
+            private_key: Union[bytes, HexStr, int, keys.PrivateKey],
+            *,
+            length: Optional[int] = None,
+            chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> SignedMessage:
+        r"""
+        Sign a message too large to hold in memory, read from a file or a memory map.
+
+        The signature is the same as ``sign_message(encode_defunct(data), private_key)``
+        would give, but the message is hashed in chunks by
+        :meth:`~newchain_account.messages.hash_defunct_stream`.
+
+        :param source: a file path, a binary file object (read from its current position
+            to its end), an :class:`mmap.mmap` or any bytes-like buffer
+        :param private_key: the key to sign the message with
+        :type private_key: hex str, bytes, int or :class:`newchain_keys.datatypes.PrivateKey`
+        :param int length: the number of bytes to read from a file object, required if it
+            is not seekable, like a pipe
+        :param int chunk_size: number of bytes hashed at a time
+        :returns: Various details about the signature - most importantly the fields: v, r, and s
+        :rtype: ~newchain_account.datastructures.SignedMessage
+        """
+        message_hash = hash_defunct_stream(source, length=length, chunk_size=chunk_size)
+        return cast(SignedMessage, self._sign_hash(message_hash, private_key))
+
+    @combomethod
+    def sign_typed_data_batch(
+            self,
+            types: Dict[str, List[Dict[str, str]]],
+            domain: Dict[str, Any],
+            primary_type: str,
+            messages: Iterable[Dict[str, Any]],
+            private_key: Union[bytes, HexStr, int, keys.PrivateKey],
+            *,
+            stream: bool = False,
+            max_workers: Optional[int] = None,
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Union[List[SignedMessage], Iterator[SignedMessage]]:
+        r"""
+        Sign many EIP-712_ messages that share the same types and domain.
+
+        This gives the same signatures as calling :meth:`sign_message` on the
+        :meth:`~newchain_account.messages.encode_structured_data` of each message, but the
+        types are validated and compiled once, the domain separator is hashed once and the
+        private key is parsed once.
+
+        :param dict types: the ``types`` of the structured data, including ``EIP712Domain``
+        :param dict domain: the ``domain`` of the structured data
+        :param str primary_type: the ``primaryType`` of every message
+        :param messages: the ``message`` part of each structured data to sign
+        :param private_key: the key to sign the messages with
+        :type private_key: hex str, bytes, int or :class:`newchain_keys.datatypes.PrivateKey`
+        :param bool stream: return an iterator which signs messages as it is consumed,
+            instead of a list, so that large or lazy inputs are never held in memory at once
+        :param int max_workers: sign in a process pool of this size, instead of in the
+            current process
+        :param int chunk_size: number of messages sent to a worker at a time
+        :returns: the signature of each message, in order
+        :rtype: list or iterator of ~newchain_account.datastructures.SignedMessage
+
+        .. doctest:: python
+
+            >>> from newchain_account.messages import encode_structured_data
+            >>> types = {
+            ...     "EIP712Domain": [{"name": "name", "type": "string"}],
+            ...     "Order": [{"name": "amount", "type": "uint256"}],
+            ... }
+            >>> domain = {"name": "Exchange"}
+            >>> messages = [{"amount": amount} for amount in range(3)]
+            >>> key = b'\x01' * 32
+            >>> signed = Account.sign_typed_data_batch(types, domain, "Order", messages, key)
+            >>> signed[2] == Account.sign_message(encode_structured_data({
+            ...     "types": types,
+            ...     "primaryType": "Order",
+            ...     "domain": domain,
+            ...     "message": messages[2],
+            ... }), key)
+            True
+
+        .. _EIP-712: https://eips.ethereum.org/EIPS/eip-712
+        """
+        schema, domain_hash = compile_typed_data(types, domain, primary_type)
+        key = self._parsePrivateKey(private_key)
+        signed_messages = (
+            SignedMessage(
+                messageHash=HexBytes(message_hash),
+                r=r,
+                s=s,
+                v=v,
+                signature=HexBytes(eth_signature_bytes),
+            )
+            for (message_hash, v, r, s, eth_signature_bytes) in map_chunks(
+                sign_typed_data_messages,
+                messages,
+                key,
+                schema,
+                primary_type,
+                domain_hash,
+                max_workers=max_workers,
+                chunk_size=chunk_size,
+            )
+        )
+        if stream:
+            return signed_messages
+        return list(signed_messages)
+
     @combomethod
     def signHash(self, message_hash, private_key):
         """
@@ -671,7 +1189,7 @@ class Account:
         return self.sign_transaction(transaction_dict, private_key)
 
     @combomethod
-    def sign_transaction(self, transaction_dict, private_key):
+    def sign_transaction(self, transaction_dict, private_key, *, validate=True):
         """
         Sign a transaction using a local private key.
 
@@ -691,6 +1209,11 @@ class Account:
           maxFeePerGas, and maxPriorityFeePerGas
         :param private_key: the private key to sign the data with
         :type private_key: hex str, bytes, int or :class:`newchain_keys.datatypes.PrivateKey`
+        :param bool validate: set to False only for trusted transaction dicts, to skip field
+          validation and formatting. Fields must then already be in their formatted types:
+          ints for quantities, ``chainId`` and ``type``, bytes for ``to`` (``b''`` for
+          contract creation), ``data`` and access list addresses, and ints for access list
+          storage keys.
         :returns: Various details about the signature - most
           importantly the fields: v, r, and s
         :rtype: AttributeDict
@@ -799,7 +1322,7 @@ class Account:
             r,
             s,
             encoded_transaction,
-        ) = sign_transaction_dict(account._key_obj, sanitized_transaction)
+        ) = sign_transaction_dict(account._key_obj, sanitized_transaction, validate)
         transaction_hash = keccak(encoded_transaction)
 
         return SignedTransaction(
@@ -810,6 +1333,30 @@ class Account:
             v=v,
         )
 
+    @combomethod
+    def _private_key_bytes(self, key):
+        """
+        Get the 32 bytes of the provided key, without deriving its public key.
+
+        :param key: the private key
+        :type key: hex str, bytes, int, :class:`newchain_keys.datatypes.PrivateKey` or
+            :class:`~newchain_account.signers.local.LocalAccount`
+        :returns: the raw private key
+        :rtype: bytes
+        """
+        if isinstance(key, LocalAccount):
+            return bytes(key.key)
+        if isinstance(key, self._keys.PrivateKey):
+            return key.to_bytes()
+
+        key_bytes = bytes(HexBytes(key))
+        if len(key_bytes) != 32:
+            raise ValueError(
+                "The private key must be exactly 32 bytes long, instead of "
+                "%d bytes." % len(key_bytes)
+            )
+        return key_bytes
+
     @combomethod
     def _parsePrivateKey(self, key):
         """
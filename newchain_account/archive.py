@@ -0,0 +1,312 @@
+"""
+Random access into archives of signed, serialized transactions.
+
+An archive is a flat file of raw transactions written back to back, exactly as they
+are broadcast: legacy transactions are bare RLP lists, and typed transactions are a
+one byte type prefix followed by an RLP list. Transactions are framed by reading the
+RLP list header only, so an archive can be indexed without decoding any payload.
+"""
+from array import (
+    array,
+)
+import mmap
+import os
+import struct
+import sys
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    Optional,
+    Union,
+    cast,
+)
+
+from eth_utils import (
+    keccak,
+)
+from hexbytes import (
+    HexBytes,
+)
+
+from newchain_account._utils.legacy_transactions import (
+    Transaction,
+)
+from newchain_account._utils.typed_transactions import (
+    TypedTransaction,
+)
+
+INDEX_MAGIC = b'NEWTXIDX'
+INDEX_VERSION = 2
+
+# magic, version, has-hashes flag, archive size, archive mtime in ns, transaction count
+_INDEX_HEADER = struct.Struct('<8sBBQQQ')
+
+_RLP_SHORT_LIST_PREFIX = 0xc0
+_RLP_LONG_LIST_PREFIX = 0xf7
+_MAX_TRANSACTION_TYPE = 0x7f
+
+
+def transaction_length(data: Union[bytes, memoryview], offset: int = 0) -> int:
+    """
+    Get the length in bytes of the serialized transaction starting at ``offset``.
+
+    Only the type byte (if any) and the RLP list header are inspected.
+
+    :param data: any buffer holding serialized transactions
+    :param int offset: position of the first byte of the transaction in ``data``
+    :returns: the number of bytes the transaction occupies
+    :raises ValueError: if the bytes at ``offset`` do not start a transaction
+    """
+    start = offset
+    if data[offset] <= _MAX_TRANSACTION_TYPE:
+        # typed transaction: TransactionType || rlp([...])
+        offset += 1
+        if offset >= len(data):
+            raise ValueError("Truncated typed transaction at offset %d" % start)
+
+    prefix = data[offset]
+    if prefix < _RLP_SHORT_LIST_PREFIX:
+        raise ValueError("Expected an RLP list at offset %d, got prefix 0x%02x" % (offset, prefix))
+    elif prefix <= _RLP_LONG_LIST_PREFIX:
+        end = offset + 1 + prefix - _RLP_SHORT_LIST_PREFIX
+    else:
+        length_of_length = prefix - _RLP_LONG_LIST_PREFIX
+        length_bytes = data[offset + 1:offset + 1 + length_of_length]
+        if len(length_bytes) != length_of_length:
+            raise ValueError("Truncated RLP list header at offset %d" % offset)
+        end = offset + 1 + length_of_length + int.from_bytes(length_bytes, 'big')
+
+    if end > len(data):
+        raise ValueError("Transaction at offset %d runs past the end of the archive" % start)
+    return end - start
+
+
+def decode_transaction(
+        raw_transaction: Union[bytes, memoryview]) -> Union[Transaction, TypedTransaction]:
+    """
+    Decode one serialized transaction into its legacy or typed representation.
+
+    :param raw_transaction: the signed transaction bytes (a :class:`memoryview` is accepted)
+    :returns: a :class:`Transaction` for legacy transactions, or a :class:`TypedTransaction`
+    """
+    if raw_transaction[0] <= _MAX_TRANSACTION_TYPE:
+        return TypedTransaction.from_bytes(HexBytes(raw_transaction))
+    return cast(Transaction, Transaction.from_bytes(bytes(raw_transaction)))
+
+
+class TransactionArchive:
+    r"""
+    A read-only, memory-mapped archive of raw signed transactions.
+
+    The archive is framed once into an offset index, an :class:`array.array` of
+    ``len(archive) + 1`` unsigned 64-bit offsets, which can be saved next to the archive
+    and loaded on the next run. Transactions are only sliced out of the mapping and
+    decoded when requested.
+
+    Archives can be pickled, which makes them usable as arguments to
+    :mod:`multiprocessing` workers: the offset index travels with the pickle, and the
+    worker maps the same file again, so the page cache is shared between processes.
+
+    .. code-block:: python
+
+        >>> with TransactionArchive('transactions.bin') as archive:  # doctest: +SKIP
+        ...     archive.save_index()
+        ...     first = archive[0]
+        ...     position = archive.find(first_hash)
+        ...     Account.recover_transaction(bytes(archive.raw(position)))
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], index_path: Optional[str] = None) -> None:
+        """
+        Map the archive at ``path`` and load or build its offset index.
+
+        :param path: the archive file
+        :param index_path: where the offset index is stored, defaults to ``path + '.idx'``.
+            A stored index is only used if it was built for an archive of the same size
+            and modification time.
+        """
+        self.path = os.fspath(path)
+        self.index_path = index_path if index_path is not None else self.path + '.idx'
+        self._hashes: Optional[bytes] = None
+        self._positions_by_hash: Optional[Dict[bytes, int]] = None
+        self._open()
+        if not self._load_index():
+            self._offsets = self._build_offsets()
+
+    def _open(self) -> None:
+        self._file = open(self.path, 'rb')
+        archive_stat = os.fstat(self._file.fileno())
+        self._size = archive_stat.st_size
+        self._mtime_ns = archive_stat.st_mtime_ns
+        if self._size == 0:
+            # mmap cannot map an empty file
+            self._map = None
+            self._view = memoryview(b'')
+        else:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._map)
+
+    def _build_offsets(self) -> array:
+        offsets = array('Q', [0])
+        position = 0
+        view = self._view
+        while position < self._size:
+            position += transaction_length(view, position)
+            offsets.append(position)
+        return offsets
+
+    def _load_index(self) -> bool:
+        if not os.path.exists(self.index_path):
+            return False
+        with open(self.index_path, 'rb') as index_file:
+            header = index_file.read(_INDEX_HEADER.size)
+            if len(header) != _INDEX_HEADER.size:
+                return False
+            magic, version, has_hashes, archive_size, mtime_ns, count = _INDEX_HEADER.unpack(
+                header
+            )
+            if magic != INDEX_MAGIC or version != INDEX_VERSION:
+                return False
+            # an archive rewritten in place can keep its size, but not its mtime
+            if archive_size != self._size or mtime_ns != self._mtime_ns:
+                return False
+            offsets = array('Q')
+            try:
+                offsets.fromfile(index_file, count + 1)
+            except EOFError:
+                return False
+            hashes = index_file.read(32 * count) if has_hashes else b''
+        if sys.byteorder != 'little':
+            # index files are little-endian on disk
+            offsets.byteswap()
+        if offsets[-1] != self._size:
+            return False
+        self._offsets = offsets
+        self._hashes = hashes if has_hashes and len(hashes) == 32 * count else None
+        return True
+
+    def save_index(self, include_hashes: bool = False) -> None:
+        """
+        Write the offset index to :attr:`index_path`.
+
+        :param bool include_hashes: also store every transaction hash, so that
+            :meth:`find` does not need to hash the archive after the next load
+        """
+        if include_hashes:
+            self._ensure_hashes()
+        offsets = array('Q', self._offsets)
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+        with open(self.index_path, 'wb') as index_file:
+            index_file.write(_INDEX_HEADER.pack(
+                INDEX_MAGIC,
+                INDEX_VERSION,
+                self._hashes is not None,
+                self._size,
+                self._mtime_ns,
+                len(self),
+            ))
+            offsets.tofile(index_file)
+            if self._hashes is not None:
+                index_file.write(self._hashes)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def raw(self, position: int) -> memoryview:
+        """
+        Get the serialized transaction at ``position``, without copying it.
+
+        The returned :class:`memoryview` is only valid while the archive is open.
+        """
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("transaction position %d out of range" % position)
+        return self._view[self._offsets[position]:self._offsets[position + 1]]
+
+    def __getitem__(self, position: int) -> Union[Transaction, TypedTransaction]:
+        """Decode the transaction at ``position``."""
+        return decode_transaction(self.raw(position))
+
+    def __iter__(self) -> Iterator[Union[Transaction, TypedTransaction]]:
+        for position in range(len(self)):
+            yield self[position]
+
+    def _ensure_hashes(self) -> bytes:
+        if self._hashes is None:
+            self._hashes = b''.join(
+                keccak(bytes(self.raw(position))) for position in range(len(self))
+            )
+        return self._hashes
+
+    def find(self, transaction_hash: Union[bytes, str]) -> int:
+        """
+        Get the position of the transaction with the given hash.
+
+        The hash of every transaction is computed on first use, unless it was stored in
+        the index file. Afterwards, lookups are a single dictionary access.
+
+        :param transaction_hash: the 32-byte transaction hash, as bytes or hex str
+        :raises KeyError: if no transaction in the archive has this hash
+        """
+        if self._positions_by_hash is None:
+            hashes = self._ensure_hashes()
+            self._positions_by_hash = {
+                hashes[32 * position:32 * (position + 1)]: position
+                for position in range(len(self))
+            }
+        return self._positions_by_hash[bytes(HexBytes(transaction_hash))]
+
+    def get_by_hash(
+            self,
+            transaction_hash: Union[bytes, str]) -> Union[Transaction, TypedTransaction]:
+        """Decode the transaction with the given hash. See :meth:`find`."""
+        return self[self.find(transaction_hash)]
+
+    def close(self) -> None:
+        """
+        Release the mapping and the underlying file.
+
+        If views returned by :meth:`raw` are still alive, the mapping itself is
+        released when the last of them is garbage collected.
+        """
+        self._view.release()
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass
+            self._map = None
+        self._file.close()
+
+    def __enter__(self) -> "TransactionArchive":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {
+            'path': self.path,
+            'index_path': self.index_path,
+            'offsets': self._offsets,
+            'hashes': self._hashes,
+            'mtime_ns': self._mtime_ns,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.path = state['path']
+        self.index_path = state['index_path']
+        self._offsets = state['offsets']
+        self._hashes = state['hashes']
+        self._positions_by_hash = None
+        self._open()
+        if self._size != self._offsets[-1]:
+            self.close()
+            raise ValueError("Archive %s changed size since it was indexed" % self.path)
+        # an archive rewritten in place can keep its size, but not its mtime
+        if self._mtime_ns != state['mtime_ns']:
+            self.close()
+            raise ValueError("Archive %s was modified since it was indexed" % self.path)
@@ -0,0 +1,884 @@
+"""
+A local signing daemon, serving JSON-RPC 2.0 over a UNIX socket or localhost HTTP.
+
+The daemon holds a set of :class:`~newchain_account.signers.local.LocalAccount` and
+answers the usual signing methods of NewChain and Ethereum nodes:
+
+    - ``eth_accounts``
+    - ``eth_sign``, with params ``[address, data]``
+    - ``personal_sign``, with params ``[data, address]``
+    - ``eth_signTypedData`` (and ``eth_signTypedData_v4``), with params
+      ``[address, typed_data]``
+    - ``eth_signTransaction``, with params ``[transaction]``, signed by its ``from`` account
+    - ``newchain_signMessage``, with params ``[address, {"version", "header", "body"}]``,
+      to sign any EIP-191 :class:`~newchain_account.messages.SignableMessage`, given as
+      hex strings
+
+Batch requests are supported, as well as notifications. Signing is CPU bound, so it can
+be spread over a pool of worker processes, each of which loads the keys once at startup.
+
+On a UNIX socket, every request or batch is one line of JSON, and every response is
+written back as one line. Requests on one connection may be pipelined: the next line is
+read before earlier responses are written, and responses are written as soon as they are
+ready, so they must be matched to requests by ``id``. Over HTTP, every request or batch
+is the body of one ``POST``, on a keep-alive connection.
+
+.. code-block:: python
+
+    >>> with SigningDaemon([account], max_workers=4) as daemon:  # doctest: +SKIP
+    ...     endpoint = daemon.listen_unix('/run/signer.sock')
+    ...     daemon.wait()
+
+The same can be run from a shell, along with a benchmark client::
+
+    python -m newchain_account.daemon serve --keyfile key.json --password-file pass \\
+        --unix /run/signer.sock --workers 4
+    python -m newchain_account.daemon bench /run/signer.sock --concurrency 16
+"""
+import argparse
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+import http.client
+from http.server import (
+    BaseHTTPRequestHandler,
+    ThreadingHTTPServer,
+)
+import ipaddress
+import json
+import os
+import re
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Union,
+    cast,
+)
+from urllib.parse import (
+    urlsplit,
+)
+
+from eth_utils import (
+    ValidationError,
+    is_hex,
+    to_canonical_address,
+)
+from hexbytes import (
+    HexBytes,
+)
+
+from newchain_account.account import (
+    MAINNET_CHAIN_ID,
+    Account,
+)
+from newchain_account.datastructures import (
+    SignedMessage,
+)
+from newchain_account.messages import (
+    SignableMessage,
+    encode_defunct,
+    encode_structured_data,
+)
+from newchain_account.signers.local import (
+    LocalAccount,
+)
+
+JSONRPC_VERSION = "2.0"
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+UNKNOWN_ACCOUNT = -32000
+SERVER_SHUTTING_DOWN = -32001
+
+# Number of requests from all connections that are processed at the same time
+DEFAULT_MAX_CONCURRENT_REQUESTS = 64
+
+# Longest accepted request line or body, in bytes
+MAX_REQUEST_SIZE = 16 * 1024 * 1024
+
+# names by which clients on this host may address the HTTP listener
+_LOOPBACK_HOSTS = ('localhost', '127.0.0.1', '[::1]')
+
+
+class JSONRPCError(Exception):
+    """
+    A failed call, reported to the client as a JSON-RPC error object.
+    """
+
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(code, message)
+        self.code = code
+        self.message = message
+
+    def __str__(self) -> str:
+        return self.message
+
+
+def _find_account(accounts: Dict[bytes, LocalAccount], address: Any) -> LocalAccount:
+    try:
+        canonical_address = to_canonical_address(address)
+    except (TypeError, ValueError):
+        raise JSONRPCError(INVALID_PARAMS, "Invalid address: %r" % (address,))
+    try:
+        return accounts[canonical_address]
+    except KeyError:
+        raise JSONRPCError(UNKNOWN_ACCOUNT, "Unknown account: %s" % address)
+
+
+def _sign_data(accounts: Dict[bytes, LocalAccount], address: Any, data: Any) -> str:
+    if not isinstance(data, str):
+        raise JSONRPCError(INVALID_PARAMS, "The data to sign must be a string")
+    if data.startswith(('0x', '0X')) and is_hex(data):
+        signable_message = encode_defunct(hexstr=data)
+    else:
+        signable_message = encode_defunct(text=data)
+    signed: SignedMessage = _find_account(accounts, address).sign_message(signable_message)
+    return signed.signature.hex()
+
+
+def _personal_sign(
+        accounts: Dict[bytes, LocalAccount], data: Any, address: Any, *password: Any) -> str:
+    # the password of geth's personal namespace is meaningless here, the keys are unlocked
+    return _sign_data(accounts, address, data)
+
+
+def _sign_typed_data(
+        accounts: Dict[bytes, LocalAccount], address: Any, typed_data: Any) -> str:
+    if isinstance(typed_data, str):
+        signable_message = encode_structured_data(text=typed_data)
+    else:
+        signable_message = encode_structured_data(typed_data)
+    signed: SignedMessage = _find_account(accounts, address).sign_message(signable_message)
+    return signed.signature.hex()
+
+
+def _sign_signable_message(
+        accounts: Dict[bytes, LocalAccount], address: Any, message: Any) -> str:
+    if not isinstance(message, dict) or not {'version', 'header', 'body'} <= message.keys():
+        raise JSONRPCError(
+            INVALID_PARAMS, "The message must be an object with a version, header and body"
+        )
+    signable_message = SignableMessage(
+        HexBytes(message['version']),
+        HexBytes(message['header']),
+        HexBytes(message['body']),
+    )
+    signed: SignedMessage = _find_account(accounts, address).sign_message(signable_message)
+    return signed.signature.hex()
+
+
+def _sign_transaction(
+        accounts: Dict[bytes, LocalAccount], transaction: Any) -> Dict[str, Any]:
+    if not isinstance(transaction, dict) or 'from' not in transaction:
+        raise JSONRPCError(INVALID_PARAMS, "The transaction must be an object with a 'from'")
+    account = _find_account(accounts, transaction['from'])
+    transaction = dict(transaction, **{'from': account.address})
+    signed = account.sign_transaction(transaction)
+    return {
+        'raw': signed.rawTransaction.hex(),
+        'tx': {
+            'hash': signed.hash.hex(),
+            'r': hex(signed.r),
+            's': hex(signed.s),
+            'v': hex(signed.v),
+        },
+    }
+
+
+SIGNING_METHODS: Dict[str, Callable[..., Any]] = {
+    'eth_sign': _sign_data,
+    'personal_sign': _personal_sign,
+    'eth_signTypedData': _sign_typed_data,
+    'eth_signTypedData_v4': _sign_typed_data,
+    'eth_signTransaction': _sign_transaction,
+    'newchain_signMessage': _sign_signable_message,
+}
+
+
+def execute_signing_method(
+        accounts: Dict[bytes, LocalAccount], method: str, params: Sequence[Any]) -> Any:
+    """
+    Run one signing method, as the daemon would.
+
+    :param dict accounts: the accounts to sign with, keyed by canonical address
+    :param str method: one of :data:`SIGNING_METHODS`
+    :param list params: the positional JSON-RPC params
+    :returns: the JSON-compatible result
+    :raises JSONRPCError: if the method or its params are invalid
+    """
+    try:
+        signing_method = SIGNING_METHODS[method]
+    except KeyError:
+        raise JSONRPCError(METHOD_NOT_FOUND, "Method not found: %s" % method)
+    try:
+        return signing_method(accounts, *params)
+    except TypeError as error:
+        raise JSONRPCError(INVALID_PARAMS, "Invalid params for %s: %s" % (method, error))
+    except (ValueError, ValidationError) as error:
+        raise JSONRPCError(INVALID_PARAMS, str(error))
+
+
+# The accounts of a worker process, loaded once by _load_worker_accounts
+_worker_accounts: Dict[bytes, LocalAccount] = {}
+
+
+def _load_worker_accounts(keys_and_chain_ids: List[Any]) -> None:
+    for private_key, chain_id in keys_and_chain_ids:
+        account = Account.from_key(private_key, chain_id=chain_id)
+        _worker_accounts[to_canonical_address(account.address)] = account
+
+
+def _execute_in_worker(method: str, params: Sequence[Any]) -> Any:
+    return execute_signing_method(_worker_accounts, method, params)
+
+
+def _is_notification(call: Any) -> bool:
+    if not isinstance(call, dict) or 'id' in call:
+        return False
+    return call.get('jsonrpc') == JSONRPC_VERSION and isinstance(call.get('method'), str)
+
+
+def _error_response(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+    return {
+        'jsonrpc': JSONRPC_VERSION,
+        'id': request_id,
+        'error': {'code': code, 'message': message},
+    }
+
+
+def _shutting_down_response(payload: bytes) -> Optional[bytes]:
+    """
+    Refuse every call of a request that arrived while the daemon was closing.
+    """
+    try:
+        request = json.loads(payload)
+    except ValueError:
+        request = None
+    calls = request if isinstance(request, list) and request else [request]
+    responses = [
+        _error_response(
+            call.get('id') if isinstance(call, dict) else None,
+            SERVER_SHUTTING_DOWN,
+            "Server shutting down",
+        )
+        for call in calls
+        if not _is_notification(call)
+    ]
+    if not responses:
+        return None
+    response = responses if isinstance(request, list) and request else responses[0]
+    return json.dumps(response, separators=(',', ':')).encode('utf-8')
+
+
+class SigningDaemon:
+    """
+    Serve signatures from local accounts over JSON-RPC.
+
+    Listeners are added with :meth:`listen_unix` and :meth:`listen_http`, and run in
+    background threads until :meth:`close`. The daemon can also be used as a context
+    manager, which closes it on exit.
+    """
+
+    def __init__(
+            self,
+            accounts: Iterable[LocalAccount],
+            *,
+            max_workers: Optional[int] = None,
+            max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS) -> None:
+        """
+        :param accounts: the accounts to sign with
+        :param int max_workers: sign in a process pool of this size, instead of in the
+            daemon process
+        :param int max_concurrent_requests: number of requests, from all connections, that
+            are processed at the same time. Further requests wait to be read.
+        """
+        self.accounts: Dict[bytes, LocalAccount] = {
+            to_canonical_address(account.address): account for account in accounts
+        }
+        self._executor: Optional[ProcessPoolExecutor] = None
+        if max_workers is not None and max_workers > 1:
+            self._executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_load_worker_accounts,
+                initargs=([
+                    (account.key, account._chain_id) for account in self.accounts.values()
+                ],),
+            )
+        self._dispatcher = ThreadPoolExecutor(
+            max_workers=max_concurrent_requests,
+            thread_name_prefix='signing-daemon',
+        )
+        self._request_slots = threading.BoundedSemaphore(max_concurrent_requests)
+        self._servers: List[socketserver.BaseServer] = []
+        # sockets of the open client connections, which outlive their listener
+        self._connections: Set[socket.socket] = set()
+        self._connections_lock = threading.Lock()
+        self._closing = False
+        self._closed = threading.Event()
+
+    def _submit(self, method: str, params: Sequence[Any]) -> "Future[Any]":
+        if self._executor is not None:
+            return self._executor.submit(_execute_in_worker, method, params)
+        future: "Future[Any]" = Future()
+        try:
+            future.set_result(execute_signing_method(self.accounts, method, params))
+        except Exception as error:
+            future.set_exception(error)
+        return future
+
+    def _start_call(self, call: Any) -> Union[Dict[str, Any], "Future[Any]", None]:
+        """
+        Validate one call, and start it if it is a signing method.
+
+        :returns: an error response, a finished result, or a future of the result
+        """
+        if not isinstance(call, dict):
+            return _error_response(None, INVALID_REQUEST, "Invalid request")
+        request_id = call.get('id')
+        method = call.get('method')
+        params = call.get('params', [])
+        if call.get('jsonrpc') != JSONRPC_VERSION or not isinstance(method, str):
+            return _error_response(request_id, INVALID_REQUEST, "Invalid request")
+        if not isinstance(params, list):
+            return _error_response(request_id, INVALID_PARAMS, "Params must be an array")
+        if method == 'eth_accounts':
+            return {
+                'jsonrpc': JSONRPC_VERSION,
+                'id': request_id,
+                'result': [account.address for account in self.accounts.values()],
+            }
+        return self._submit(method, params)
+
+    @staticmethod
+    def _finish_call(call: Any, started: Any) -> Optional[Dict[str, Any]]:
+        response: Dict[str, Any]
+        if not isinstance(started, Future):
+            response = started
+        else:
+            try:
+                response = {
+                    'jsonrpc': JSONRPC_VERSION,
+                    'id': call.get('id'),
+                    'result': started.result(),
+                }
+            except JSONRPCError as error:
+                response = _error_response(call.get('id'), error.code, error.message)
+            except Exception as error:
+                response = _error_response(call.get('id'), INTERNAL_ERROR, str(error))
+        if _is_notification(call):
+            # notifications are never answered, not even with an error
+            return None
+        return response
+
+    def handle_request(self, payload: bytes) -> Optional[bytes]:
+        """
+        Answer one JSON-RPC request or batch.
+
+        All the calls of a batch are started before waiting for any of them, so that a
+        batch is signed in parallel by the worker pool.
+
+        :param bytes payload: the JSON encoded request or batch
+        :returns: the JSON encoded response, or None if there is nothing to answer, like
+            for notifications
+        """
+        try:
+            request = json.loads(payload)
+        except ValueError:
+            response: Any = _error_response(None, PARSE_ERROR, "Parse error")
+        else:
+            if isinstance(request, list):
+                if not request:
+                    response = _error_response(None, INVALID_REQUEST, "Empty batch")
+                else:
+                    started = [self._start_call(call) for call in request]
+                    responses = [
+                        self._finish_call(call, result)
+                        for call, result in zip(request, started)
+                    ]
+                    response = [answer for answer in responses if answer is not None]
+                    if not response:
+                        return None
+            else:
+                response = self._finish_call(request, self._start_call(request))
+                if response is None:
+                    return None
+        return json.dumps(response, separators=(',', ':')).encode('utf-8')
+
+    def _dispatch(
+            self,
+            payload: bytes,
+            respond: Callable[[Optional[bytes]], None]) -> "Future[None]":
+        refused: "Future[None]" = Future()
+        refused.set_result(None)
+        if self._closing:
+            respond(_shutting_down_response(payload))
+            return refused
+        # bounds the requests in flight, and applies backpressure to the connections
+        self._request_slots.acquire()
+
+        def handle() -> None:
+            try:
+                respond(self.handle_request(payload))
+            finally:
+                self._request_slots.release()
+
+        try:
+            return self._dispatcher.submit(handle)
+        except RuntimeError:
+            # close() shut the dispatcher down while this request was read
+            self._request_slots.release()
+            respond(_shutting_down_response(payload))
+            return refused
+
+    def _add_connection(self, connection: socket.socket) -> bool:
+        """
+        Register a client connection, so that :meth:`close` can end it.
+
+        :returns: False if the daemon is closing, and the connection should not be served
+        """
+        with self._connections_lock:
+            if self._closing:
+                return False
+            self._connections.add(connection)
+            return True
+
+    def _remove_connection(self, connection: socket.socket) -> None:
+        with self._connections_lock:
+            self._connections.discard(connection)
+
+    def _serve_in_background(self, server: socketserver.BaseServer) -> None:
+        server.signing_daemon = self  # type: ignore
+        self._servers.append(server)
+        threading.Thread(
+            target=server.serve_forever,
+            name='signing-daemon-listener',
+            daemon=True,
+        ).start()
+
+    def listen_unix(self, path: Union[str, "os.PathLike[str]"]) -> str:
+        """
+        Serve newline delimited JSON-RPC on a UNIX socket, only accessible by this user.
+
+        :param path: where to create the socket. It must not exist yet.
+        :returns: the endpoint, for :func:`benchmark` or a remote signer
+        """
+        path = os.fspath(path)
+        # bind with a restrictive umask, so the socket is never reachable by other users
+        old_umask = os.umask(0o177)
+        try:
+            server = _UnixServer(path, _UnixRequestHandler)
+        finally:
+            os.umask(old_umask)
+        os.chmod(path, 0o600)
+        self._serve_in_background(server)
+        return path
+
+    def listen_http(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """
+        Serve JSON-RPC over HTTP, on a loopback address.
+
+        Requests must be ``application/json``, and their ``Host`` must be a loopback name
+        and the listener's port, so that web pages in a local browser cannot forge them.
+
+        :param str host: the loopback address to listen on
+        :param int port: the port to listen on, or 0 to pick a free one
+        :returns: the endpoint URL, like ``http://127.0.0.1:8545``
+        """
+        if host != 'localhost' and not ipaddress.ip_address(host).is_loopback:
+            raise ValueError("The signing daemon only listens on loopback addresses, not %s" % host)
+        server = _HTTPServer((host, port), _HTTPRequestHandler)
+        self._serve_in_background(server)
+        bound_host, bound_port = server.server_address[:2]
+        return 'http://%s:%d' % (bound_host, bound_port)
+
+    def wait(self) -> None:
+        """
+        Block until the daemon is closed, or the process is interrupted.
+        """
+        try:
+            while not self._closed.wait(1):
+                pass
+        except KeyboardInterrupt:
+            self.close()
+
+    def close(self) -> None:
+        """
+        Stop listening, end the client connections, and stop the worker processes.
+
+        Requests in flight are answered, and requests read after this are refused with a
+        :data:`SERVER_SHUTTING_DOWN` error.
+        """
+        with self._connections_lock:
+            self._closing = True
+            connections = list(self._connections)
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+            if isinstance(server, _UnixServer):
+                path = cast(str, server.server_address)
+                if os.path.exists(path):
+                    os.unlink(path)
+        self._servers = []
+        for connection in connections:
+            try:
+                # stop reading requests, but let the ones in flight be answered
+                connection.shutdown(socket.SHUT_RD)
+            except OSError:
+                pass
+        self._dispatcher.shutdown()
+        if self._executor is not None:
+            self._executor.shutdown()
+        self._closed.set()
+
+    def __enter__(self) -> "SigningDaemon":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class _TrackedConnections(socketserver.ThreadingMixIn):
+    """
+    Register the connections of a threaded server with its daemon, while they are served.
+    """
+
+    def process_request_thread(self, request: Any, client_address: Any) -> None:
+        daemon: SigningDaemon = self.signing_daemon  # type: ignore
+        if not daemon._add_connection(request):
+            self.shutdown_request(request)  # type: ignore
+            return
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            daemon._remove_connection(request)
+
+
+class _UnixServer(_TrackedConnections, socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class _UnixRequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self) -> None:
+        daemon: SigningDaemon = self.server.signing_daemon  # type: ignore
+        write_lock = threading.Lock()
+
+        def respond(response: Optional[bytes]) -> None:
+            if response is None:
+                return
+            with write_lock:
+                try:
+                    self.wfile.write(response + b'\n')
+                    self.wfile.flush()
+                except OSError:
+                    # the client went away, there is nobody left to answer
+                    pass
+
+        pending: List["Future[None]"] = []
+        while True:
+            line = self.rfile.readline(MAX_REQUEST_SIZE + 1)
+            if not line:
+                break
+            if len(line) > MAX_REQUEST_SIZE:
+                respond(json.dumps(
+                    _error_response(None, INVALID_REQUEST, "Request too large")
+                ).encode('utf-8'))
+                break
+            if line.strip():
+                pending = [future for future in pending if not future.done()]
+                pending.append(daemon._dispatch(line, respond))
+        for future in pending:
+            future.result()
+
+
+class _HTTPServer(_TrackedConnections, ThreadingHTTPServer):
+    daemon_threads = True
+
+    def server_bind(self) -> None:
+        super().server_bind()
+        port = self.server_address[1]
+        self.allowed_hosts = {'%s:%d' % (host, port) for host in _LOOPBACK_HOSTS}
+        if port == 80:
+            self.allowed_hosts.update(_LOOPBACK_HOSTS)
+
+
+class _HTTPRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # headers and body are written separately, which Nagle's algorithm would delay
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:
+        daemon: SigningDaemon = self.server.signing_daemon  # type: ignore
+        # Web pages can reach a loopback listener too: through DNS rebinding, which sends
+        # a foreign Host, or with a cross-origin "simple" POST, which cannot be JSON.
+        hosts: List[str] = self.headers.get_all('Host', [])
+        allowed_hosts = self.server.allowed_hosts  # type: ignore
+        if len(hosts) != 1 or hosts[0].lower() not in allowed_hosts:
+            self.send_error(403, "Host not allowed")
+            return
+        if self.headers.get_content_type() != 'application/json':
+            self.send_error(415, "Content-Type must be application/json")
+            return
+        content_length = self.headers.get('Content-Length')
+        if content_length is None:
+            self.send_error(411)
+            return
+        if not re.fullmatch(r'[0-9]+', content_length):
+            self.send_error(400, "Invalid Content-Length")
+            return
+        length = int(content_length)
+        if length > MAX_REQUEST_SIZE:
+            self.send_error(413)
+            return
+        payload = self.rfile.read(length)
+        responses: List[Optional[bytes]] = []
+        daemon._dispatch(payload, responses.append).result()
+        response = responses[0]
+        if response is None:
+            self.send_response(204)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # requests carry signatures and payloads, which should not end up in logs
+        pass
+
+
+class _Connection:
+    """
+    One persistent connection to a signing daemon, for request/response round trips.
+    """
+
+    def __init__(self, endpoint: str, timeout: Optional[float] = None) -> None:
+        self._http: Optional[http.client.HTTPConnection] = None
+        if endpoint.startswith('http://'):
+            url = urlsplit(endpoint)
+            self._http = http.client.HTTPConnection(
+                url.hostname or '127.0.0.1', url.port, timeout=timeout,
+            )
+            self._path = url.path or '/'
+        else:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.settimeout(timeout)
+            self._socket.connect(endpoint)
+            self._reader = self._socket.makefile('rb')
+
+    def call(self, payload: bytes) -> bytes:
+        if self._http is not None:
+            self._http.request(
+                'POST', self._path, payload, {'Content-Type': 'application/json'},
+            )
+            return self._http.getresponse().read()
+        self._socket.sendall(payload + b'\n')
+        return self._reader.readline()
+
+    def close(self) -> None:
+        if self._http is not None:
+            self._http.close()
+        else:
+            self._reader.close()
+            self._socket.close()
+
+
+class BenchmarkResult(NamedTuple):
+    """
+    The outcome of a :func:`benchmark` run. Latencies are in seconds, per round trip.
+    """
+    requests: int
+    seconds: float
+    requests_per_second: float
+    p50_latency: float
+    p99_latency: float
+    errors: int
+
+
+def _percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def benchmark(
+        endpoint: str,
+        method: str,
+        params: Sequence[Any],
+        *,
+        requests: int = 1000,
+        concurrency: int = 8,
+        batch_size: int = 1) -> BenchmarkResult:
+    """
+    Measure the throughput and latency of a signing daemon.
+
+    ``concurrency`` clients each open one connection, and send round trips of
+    ``batch_size`` calls back to back, until ``requests`` calls were answered in total.
+
+    :param str endpoint: a UNIX socket path, or an ``http://`` URL
+    :param str method: the JSON-RPC method to call
+    :param list params: the params of every call
+    :param int requests: the total number of calls
+    :param int concurrency: the number of concurrent connections
+    :param int batch_size: the number of calls sent in each JSON-RPC batch
+    :returns: the calls per second, and the latency percentiles of the round trips
+    """
+    round_trips = -(-requests // batch_size)
+    if batch_size == 1:
+        payload = json.dumps(
+            {'jsonrpc': JSONRPC_VERSION, 'id': 0, 'method': method, 'params': params}
+        ).encode('utf-8')
+    else:
+        payload = json.dumps([
+            {'jsonrpc': JSONRPC_VERSION, 'id': index, 'method': method, 'params': params}
+            for index in range(batch_size)
+        ]).encode('utf-8')
+
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    remaining = [round_trips]
+
+    def client() -> None:
+        connection = _Connection(endpoint)
+        try:
+            while True:
+                with lock:
+                    if not remaining[0]:
+                        return
+                    remaining[0] -= 1
+                started = time.perf_counter()
+                response = json.loads(connection.call(payload))
+                latency = time.perf_counter() - started
+                failed = sum(
+                    'error' in result
+                    for result in (response if isinstance(response, list) else [response])
+                )
+                with lock:
+                    latencies.append(latency)
+                    errors[0] += failed
+        finally:
+            connection.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - started
+
+    latencies.sort()
+    calls = round_trips * batch_size
+    return BenchmarkResult(
+        requests=calls,
+        seconds=seconds,
+        requests_per_second=calls / seconds if seconds else 0.0,
+        p50_latency=_percentile(latencies, 0.50),
+        p99_latency=_percentile(latencies, 0.99),
+        errors=errors[0],
+    )
+
+
+def _load_keyfile_accounts(
+        keyfiles: Sequence[str],
+        password: str,
+        chain_id: int) -> List[LocalAccount]:
+    accounts = []
+    for keyfile in keyfiles:
+        with open(keyfile) as keyfile_json:
+            private_key = Account.decrypt(keyfile_json.read(), password)
+        accounts.append(Account.from_key(private_key, chain_id=chain_id))
+    return accounts
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m newchain_account.daemon')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve = commands.add_parser('serve', help="run the signing daemon")
+    serve.add_argument('--keyfile', action='append', required=True,
+                       help="an encrypted key file to sign with, can be repeated")
+    serve.add_argument('--password-file', required=True,
+                       help="a file holding the password of the key files")
+    serve.add_argument('--chain-id', type=int, default=MAINNET_CHAIN_ID)
+    serve.add_argument('--unix', help="the UNIX socket path to listen on")
+    serve.add_argument('--http', help="the loopback host:port to listen on")
+    serve.add_argument('--workers', type=int, default=os.cpu_count(),
+                       help="the number of signing processes")
+
+    bench = commands.add_parser('bench', help="benchmark a running signing daemon")
+    bench.add_argument('endpoint', help="a UNIX socket path, or an http:// URL")
+    bench.add_argument('--address', help="the account to sign with, defaults to the first")
+    bench.add_argument('--requests', type=int, default=1000)
+    bench.add_argument('--concurrency', type=int, default=8)
+    bench.add_argument('--batch-size', type=int, default=1)
+
+    args = parser.parse_args(argv)
+    if args.command == 'serve':
+        if not args.unix and not args.http:
+            parser.error("serve needs --unix or --http")
+        with open(args.password_file) as password_file:
+            password = password_file.read().rstrip('\n')
+        accounts = _load_keyfile_accounts(args.keyfile, password, args.chain_id)
+        with SigningDaemon(accounts, max_workers=args.workers) as daemon:
+            signal.signal(signal.SIGTERM, lambda signum, frame: daemon.close())
+            if args.unix:
+                print("listening on %s" % daemon.listen_unix(args.unix), file=sys.stderr)
+            if args.http:
+                host, _, port = args.http.rpartition(':')
+                print("listening on %s" % daemon.listen_http(host or '127.0.0.1', int(port)),
+                      file=sys.stderr)
+            daemon.wait()
+    else:
+        address = args.address
+        if address is None:
+            connection = _Connection(args.endpoint)
+            try:
+                address = json.loads(connection.call(json.dumps(
+                    {'jsonrpc': JSONRPC_VERSION, 'id': 0, 'method': 'eth_accounts'}
+                ).encode('utf-8')))['result'][0]
+            finally:
+                connection.close()
+        result = benchmark(
+            args.endpoint,
+            'personal_sign',
+            [HexBytes(b'benchmark message').hex(), address],
+            requests=args.requests,
+            concurrency=args.concurrency,
+            batch_size=args.batch_size,
+        )
+        print("%d requests in %.2fs: %.1f requests/s, p50 %.2fms, p99 %.2fms, %d errors" % (
+            result.requests,
+            result.seconds,
+            result.requests_per_second,
+            result.p50_latency * 1000,
+            result.p99_latency * 1000,
+            result.errors,
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,21 @@
+from typing import (
+    Any,
+    List,
+    Sequence,
+    Tuple,
+)
+
 from eth_utils import (
     ValidationError,
 )
 
+from ._utils import (
+    ec_point,
+)
 from .deterministic import (
     HDPath,
+    SoftNode,
+    derive_child_key,
 )
 from .mnemonic import (
     Mnemonic,
@@ -28,3 +40,41 @@ def seed_from_mnemonic(words: str, passphrase: str) -> bytes:
 
 def key_from_seed(seed: bytes, account_path: str) -> bytes:
     return HDPath(account_path).derive(seed)
+
+
+def derive_children(
+    indices: Sequence[int],
+    keys_api: Any,
+    parent_key: bytes,
+    parent_chain_code: bytes,
+    parent_point: bytes,
+    addresses_only: bool,
+) -> List[Any]:
+    """
+    Derive the soft children of one parent node, at each of ``indices``.
+
+    Returns the children's private keys, parsed with ``keys_api`` so that their public keys
+    are already computed, or only their checksummed addresses if ``addresses_only``.
+    """
+    children = []
+    for index in indices:
+        child_key, _chain_code = derive_child_key(
+            parent_key,
+            parent_chain_code,
+            SoftNode(index),
+            parent_point,
+        )
+        private_key = keys_api.PrivateKey(child_key)
+        if addresses_only:
+            children.append(private_key.public_key.to_checksum_address())
+        else:
+            children.append(private_key)
+    return children
+
+
+def extended_key_from_seed(seed: bytes, account_path: str) -> Tuple[bytes, bytes, bytes]:
+    """
+    Derive the key, chain code and public point of a node, to derive its children from.
+    """
+    key, chain_code = HDPath(account_path).derive_extended(seed)
+    return key, chain_code, ec_point(key)
@@ -40,6 +40,7 @@ Definitions
 #   not intended to be ultimately used for Bitcoin key derivations. This presents a simplified
 #   API, and no expectation is given for `xpub/xpriv` key derivation.
 from typing import (
+    Optional,
     Tuple,
     Type,
     Union,
@@ -132,10 +133,14 @@ def derive_child_key(
     parent_key: bytes,
     parent_chain_code: bytes,
     node: Node,
+    parent_point: Optional[bytes] = None,
 ) -> Tuple[bytes, bytes]:
     """
     Compute a derivitive key from the parent key.
 
+    ``parent_point`` may be given as ``point(k_par)``, if already known, to save the EC point
+    multiplication when deriving soft children of the same parent.
+
     From BIP32:
 
     The function CKDpriv((k_par, c_par), i) → (k_i, c_i) computes a child extended
@@ -161,8 +166,10 @@ def derive_child_key(
         child = hmac_sha512(parent_chain_code, b"\x00" + parent_key + node.serialize())
 
     elif isinstance(node, SoftNode):
-        assert len(ec_point(parent_key)) == 33  # Should be guaranteed by Account class
-        child = hmac_sha512(parent_chain_code, ec_point(parent_key) + node.serialize())
+        if parent_point is None:
+            parent_point = ec_point(parent_key)
+        assert len(parent_point) == 33  # Should be guaranteed by Account class
+        child = hmac_sha512(parent_chain_code, parent_point + node.serialize())
 
     else:
         raise ValidationError(f"Cannot process: {node}")
@@ -171,12 +178,12 @@ def derive_child_key(
 
     if to_int(child[:32]) >= SECP256K1_N:
         # Invalid key, compute using next node (< 2**-127 probability)
-        return derive_child_key(parent_key, parent_chain_code, node + 1)
+        return derive_child_key(parent_key, parent_chain_code, node + 1, parent_point)
 
     child_key = (to_int(child[:32]) + to_int(parent_key)) % SECP256K1_N
     if child_key == 0:
         # Invalid key, compute using next node (< 2**-127 probability)
-        return derive_child_key(parent_key, parent_chain_code, node + 1)
+        return derive_child_key(parent_key, parent_chain_code, node + 1, parent_point)
 
     child_key_bytes = child_key.to_bytes(32, byteorder="big")
     child_chain_code = child[32:]
@@ -223,6 +230,13 @@ class HDPath:
     def __repr__(self) -> str:
         return f'{self.__class__.__name__}(path="{self.encode()}")'
 
+    @property
+    def nodes(self) -> Tuple[Node, ...]:
+        """
+        The decoded nodes of this path, below the root node.
+        """
+        return tuple(self._path)
+
     def encode(self) -> str:
         """
         Encodes this class to a string (reversing the decoding in the constructor).
@@ -238,9 +252,17 @@ class HDPath:
         the key that is returned is the child key at the end of derivation process (and
         the chain code is discarded)
         """
+        key, _chain_code = self.derive_extended(seed)
+        return key
+
+    def derive_extended(self, seed: bytes) -> Tuple[bytes, bytes]:
+        """
+        Same as :meth:`derive`, but also return the chain code of the last node, to derive
+        its children from.
+        """
         master_node = hmac_sha512(b"Bitcoin seed", seed)
         key = master_node[:32]
         chain_code = master_node[32:]
         for node in self._path:
             key, chain_code = derive_child_key(key, chain_code, node)
-        return key
+        return key, chain_code
@@ -1,11 +1,21 @@
 from collections.abc import (
     Mapping,
 )
+import io
+import json
+import mmap
+import os
 from typing import (
+    BinaryIO,
     NamedTuple,
+    Optional,
     Union,
+    cast,
 )
 
+from eth_hash.auto import (
+    keccak as keccak_256,
+)
 from eth_typing import (
     Address,
     Hash32,
@@ -22,12 +32,17 @@ from hexbytes import (
     HexBytes,
 )
 
-from newchain_account._utils.structured_data.hashing import (
+from newchain_account._utils.structured_data.hashing import (  # noqa: F401
+    CompiledTypedDataSchema,
     hash_domain,
     hash_message as hash_eip712_message,
     load_and_validate_structured_message,
+    load_compiled_schemas,
+    save_compiled_schemas,
 )
 from newchain_account._utils.structured_data.validation import (
+    validate_has_attribute,
+    validate_primaryType_attribute,
     validate_structured_data,
 )
 from newchain_account._utils.validation import (
@@ -36,6 +51,15 @@ from newchain_account._utils.validation import (
 
 text_to_bytes = text_if_str(to_bytes)
 
+# Number of bytes of a streamed message hashed at a time
+STREAM_CHUNK_SIZE = 1 << 20
+
+# Number of bytes absorbed by each keccak-256 permutation
+KECCAK_256_RATE = 136
+
+# Where a streamed message can be read from
+MessageSource = Union[str, "os.PathLike[str]", BinaryIO, mmap.mmap, bytes]
+
 
 # watch for updates to signature format
 class SignableMessage(NamedTuple):
@@ -119,7 +143,8 @@ def encode_structured_data(
         primitive: Union[bytes, int, Mapping] = None,
         *,
         hexstr: str = None,
-        text: str = None) -> SignableMessage:
+        text: str = None,
+        schema: CompiledTypedDataSchema = None) -> SignableMessage:
     """
     Encode an EIP-712_ message.
 
@@ -140,20 +165,63 @@ def encode_structured_data(
     :type primitive: bytes or int or Mapping (eg~ dict )
     :param hexstr: the message encoded as hex
     :param text: the message as a series of unicode characters (a normal Py3 str)
+    :param schema: the precompiled ``types`` of the message, to skip re-validating and
+        re-encoding them when many messages share the same types. Must be built from the
+        same ``types`` as the message.
+    :type schema: ~newchain_account.messages.CompiledTypedDataSchema
     :returns: The EIP-191 encoded message, ready for signing
 
+    .. doctest:: python
+
+        >>> from newchain_account.messages import CompiledTypedDataSchema
+        >>> types = {
+        ...     "EIP712Domain": [{"name": "name", "type": "string"}],
+        ...     "Order": [{"name": "amount", "type": "uint256"}],
+        ... }
+        >>> schema = CompiledTypedDataSchema(types)
+        >>> messages = [
+        ...     encode_structured_data(
+        ...         {
+        ...             "types": types,
+        ...             "primaryType": "Order",
+        ...             "domain": {"name": "Exchange"},
+        ...             "message": {"amount": amount},
+        ...         },
+        ...         schema=schema,
+        ...     )
+        ...     for amount in range(3)
+        ... ]
+
     .. _EIP-712: https://eips.ethereum.org/EIPS/eip-712
     """
+    if schema is None:
+        if isinstance(primitive, Mapping):
+            validate_structured_data(primitive)
+            structured_data = primitive
+        else:
+            message_string = to_text(primitive, hexstr=hexstr, text=text)
+            structured_data = load_and_validate_structured_message(message_string)
+        return SignableMessage(
+            HexBytes(b'\x01'),
+            hash_domain(structured_data),
+            hash_eip712_message(structured_data),
+        )
+
     if isinstance(primitive, Mapping):
-        validate_structured_data(primitive)
         structured_data = primitive
     else:
-        message_string = to_text(primitive, hexstr=hexstr, text=text)
-        structured_data = load_and_validate_structured_message(message_string)
+        structured_data = json.loads(to_text(primitive, hexstr=hexstr, text=text))
+    # The types were validated when compiling the schema, the rest is checked here
+    validate_has_attribute("types", structured_data)
+    if structured_data["types"] != schema.types:
+        raise ValidationError("The structured data types do not match the compiled schema")
+    validate_primaryType_attribute(structured_data)
+    validate_has_attribute("domain", structured_data)
+    validate_has_attribute("message", structured_data)
     return SignableMessage(
         HexBytes(b'\x01'),
-        hash_domain(structured_data),
-        hash_eip712_message(structured_data),
+        schema.hash_domain(structured_data["domain"]),
+        schema.hash_message(structured_data["primaryType"], structured_data["message"]),
     )
 
 
@@ -240,3 +308,181 @@ def defunct_hash_message(
     signable = encode_defunct(primitive, hexstr=hexstr, text=text)
     hashed = _hash_eip191_message(signable)
     return HexBytes(hashed)
+
+
+def _stream_length(source: MessageSource) -> int:
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        return memoryview(source).nbytes
+    if not source.seekable():
+        raise ValueError(
+            "Cannot hash a message from a stream of unknown length, "
+            "pass its length explicitly"
+        )
+    position = source.tell()
+    end = source.seek(0, os.SEEK_END)
+    source.seek(position)
+    return end - position
+
+
+def hash_defunct_stream(
+        source: MessageSource,
+        *,
+        length: Optional[int] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE) -> HexBytes:
+    r"""
+    Hash a message too large to hold in memory, as :meth:`encode_defunct` would encode it.
+
+    The length header is computed first, then the body is fed to keccak in chunks, so
+    the message is never loaded or copied as a whole. The result is the same as
+    ``_hash_eip191_message(encode_defunct(data))``, and can be signed like
+    :meth:`~newchain_account.account.Account.sign_message` would with
+    :meth:`~newchain_account.account.Account.sign_defunct_stream`.
+
+    :param source: a file path, a binary file object (read from its current position to
+        its end), an :class:`mmap.mmap` or any bytes-like buffer
+    :param int length: the number of bytes to read from a file object, required if it is
+        not seekable, like a pipe
+    :param int chunk_size: number of bytes hashed at a time
+    :returns: The hash of the message, after adding the prefix
+
+    .. doctest:: python
+
+        >>> import io
+        >>> hash_defunct_stream(io.BytesIO(b'I\xe2\x99\xa5SF')) == defunct_hash_message(text="I♥SF")
+        True
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as source_file:
+            return hash_defunct_stream(source_file, length=length, chunk_size=chunk_size)
+    if length is None:
+        length = _stream_length(source)
+
+    hasher = keccak_256.new(b'\x19E' + b'thereum Signed Message:\n' + str(length).encode('utf-8'))
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        with memoryview(source) as source_view, source_view.cast('B') as view:
+            if length > len(view):
+                raise ValueError(
+                    f"Message has {len(view)} bytes, fewer than its length of {length}"
+                )
+            # keccak reads the slices in place, without copying
+            for offset in range(0, length, chunk_size):
+                hasher.update(view[offset:min(offset + chunk_size, length)])
+        return HexBytes(hasher.digest())
+
+    buffer = bytearray(chunk_size)
+    with memoryview(buffer) as view:
+        remaining = length
+        while remaining:
+            read = cast(io.BufferedIOBase, source).readinto(view[:min(remaining, chunk_size)])
+            if not read:
+                raise ValueError(
+                    f"Message ended after {length - remaining} of its {length} bytes"
+                )
+            hasher.update(view[:read])
+            remaining -= read
+    return HexBytes(hasher.digest())
+
+
+class MessageHasher:
+    r"""
+    Hash many EIP-191_ messages that share the same version and header.
+
+    Messages to one validator contract all start with ``0x19 00 <validator address>``, and
+    :meth:`encode_defunct` messages of equal length all start with the same length header.
+    The hasher builds that prefix once and hashes each body after it, without creating a
+    :class:`SignableMessage` or validating the address again for every message.
+
+    When the prefix fills at least one keccak block, the keccak state after absorbing it
+    is kept, and every body is hashed from a copy of that state. Shorter prefixes, like
+    the two above, are absorbed together with the first bytes of the body in any case,
+    so they are only concatenated.
+
+    .. doctest:: python
+
+        >>> from newchain_account.messages import MessageHasher, encode_intended_validator
+        >>> validator = '0x5ce9454909639D2D17A3F753ce7d93fa0b9aB12E'
+        >>> hasher = MessageHasher.for_intended_validator(validator)
+        >>> hasher.hash(b'vote: yes') == HexBytes(
+        ...     _hash_eip191_message(encode_intended_validator(validator, b'vote: yes'))
+        ... )
+        True
+
+    .. _EIP-191: https://eips.ethereum.org/EIPS/eip-191
+    """
+
+    def __init__(self, version: bytes, header: bytes = b'') -> None:
+        """
+        :param bytes version: the one-byte EIP-191 version of the messages
+        :param bytes header: the version specific data, shared by all messages
+        """
+        if len(version) != 1:
+            raise ValidationError(
+                f"The supplied message version is {version!r}. "
+                "The EIP-191 signable message standard only supports one-byte versions."
+            )
+        self.version = bytes(version)
+        self.header = bytes(header)
+        self._body_length: Optional[int] = None
+        self._prefix = b'\x19' + self.version + self.header
+        self._prefix_state = (
+            keccak_256.new(self._prefix) if len(self._prefix) >= KECCAK_256_RATE else None
+        )
+
+    @classmethod
+    def for_intended_validator(cls, validator_address: Union[Address, str]) -> "MessageHasher":
+        """
+        Get a hasher of messages for one validator, as :meth:`encode_intended_validator`
+        would encode them.
+
+        :param validator_address: which on-chain contract is capable of validating the
+            messages, provided as a checksummed address or in native bytes.
+        """
+        if not is_valid_address(validator_address):
+            raise ValidationError(
+                f"Cannot encode message with 'Validator Address': {validator_address!r}. "
+                "It must be a checksum address, or an address converted to bytes."
+            )
+        return cls(b'\x00', to_canonical_address(validator_address))
+
+    @classmethod
+    def for_defunct(cls, length: int) -> "MessageHasher":
+        """
+        Get a hasher of messages of ``length`` bytes, as :meth:`encode_defunct` would
+        encode them.
+
+        :param int length: the number of bytes in every message
+        """
+        hasher = cls(b'E', b'thereum Signed Message:\n' + str(length).encode('utf-8'))
+        hasher._body_length = length
+        return hasher
+
+    def hash(self, body: bytes) -> HexBytes:
+        """
+        Hash one message body after the shared prefix.
+
+        :param bytes body: the data to sign
+        :returns: The hash of the message, after adding the prefix
+        """
+        if self._body_length is not None and len(body) != self._body_length:
+            raise ValueError(
+                f"This hasher is for messages of {self._body_length} bytes, "
+                f"got {len(body)} bytes"
+            )
+        if self._prefix_state is None:
+            return HexBytes(keccak(self._prefix + body))
+        state = self._prefix_state.copy()
+        state.update(body)
+        return HexBytes(state.digest())
+
+    def hash_message(self, signable_message: SignableMessage) -> HexBytes:
+        """
+        Hash an encoded message, which must have the version and header of this hasher.
+
+        :param signable_message: the encoded message
+        :returns: The hash of the message, after adding the prefix
+        """
+        if signable_message.version != self.version or signable_message.header != self.header:
+            raise ValueError("The message version and header do not match this hasher")
+        return self.hash(signable_message.body)
@@ -0,0 +1,177 @@
+from collections import (
+    OrderedDict,
+)
+import threading
+from typing import (
+    Optional,
+    Tuple,
+)
+
+from newchain_account.account import (
+    MAINNET_CHAIN_ID,
+    Account,
+)
+from newchain_account.hdaccount import (
+    ETHEREUM_DEFAULT_PATH,
+    seed_from_mnemonic,
+)
+from newchain_account.hdaccount._utils import (
+    ec_point,
+    hmac_sha512,
+)
+from newchain_account.hdaccount.deterministic import (
+    HardNode,
+    HDPath,
+    derive_child_key,
+)
+from newchain_account.signers.local import (
+    LocalAccount,
+)
+
+# Number of extended keys that a wallet caches, at most
+DEFAULT_CACHE_SIZE = 1024
+
+
+class _ExtendedKey:
+    """
+    A private key and its chain code, with the public point computed on first use.
+    """
+    __slots__ = ('key', 'chain_code', '_point')
+
+    def __init__(self, key: bytes, chain_code: bytes) -> None:
+        self.key = key
+        self.chain_code = chain_code
+        self._point: Optional[bytes] = None
+
+    @property
+    def point(self) -> bytes:
+        if self._point is None:
+            self._point = ec_point(self.key)
+        return self._point
+
+
+class HDWallet:
+    """
+    Derive accounts from one BIP32 seed, caching the extended keys of the nodes visited.
+
+    .. CAUTION:: This feature is experimental, unaudited, and likely to change soon
+
+    Deriving ``m/44'/60'/0'/0/i`` for many ``i`` walks the four upper levels only once:
+    each further account costs one child key derivation, from the cached parent key,
+    chain code and public point. The least recently used nodes are evicted once
+    ``cache_size`` nodes are cached.
+
+    .. code-block:: python
+
+        >>> wallet = HDWallet.from_mnemonic(mnemonic)  # doctest: +SKIP
+        >>> wallet.derive_account("m/44'/60'/0'/0/0")  # doctest: +SKIP
+        >>> wallet.derive_account("m/44'/60'/0'/0/1")  # doctest: +SKIP
+    """
+
+    def __init__(
+            self,
+            seed: bytes,
+            *,
+            chain_id: int = MAINNET_CHAIN_ID,
+            cache_size: int = DEFAULT_CACHE_SIZE) -> None:
+        """
+        :param bytes seed: the BIP32 seed, like the stretched seed of a BIP39 mnemonic
+        :param int chain_id: the chain of the NewChain addresses of the accounts
+        :param int cache_size: number of extended keys cached, at most
+        """
+        if not Account._use_unaudited_hdwallet_features:
+            raise AttributeError(
+                "The use of the Mnemonic features of Account is disabled by default until "
+                "its API stabilizes. To use these features, please enable them by running "
+                "`Account.enable_unaudited_hdwallet_features()` and try again."
+            )
+        if cache_size < 0:
+            raise ValueError("cache_size must not be negative, got %r" % cache_size)
+        master_node = hmac_sha512(b"Bitcoin seed", seed)
+        self._master = _ExtendedKey(master_node[:32], master_node[32:])
+        self.chain_id = chain_id
+        self._cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, ...], _ExtendedKey]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    @classmethod
+    def from_mnemonic(
+            cls,
+            mnemonic: str,
+            passphrase: str = "",
+            *,
+            chain_id: int = MAINNET_CHAIN_ID,
+            cache_size: int = DEFAULT_CACHE_SIZE) -> "HDWallet":
+        """
+        Create a wallet from a BIP39 mnemonic, stretching it into a seed once.
+
+        :param str mnemonic: space-separated list of BIP39 mnemonic seed words
+        :param str passphrase: Optional passphrase used to encrypt the mnemonic
+        """
+        seed = seed_from_mnemonic(mnemonic, passphrase)
+        return cls(seed, chain_id=chain_id, cache_size=cache_size)
+
+    def _cached(self, path: Tuple[str, ...]) -> Optional[_ExtendedKey]:
+        with self._cache_lock:
+            extended_key = self._cache.get(path)
+            if extended_key is not None:
+                self._cache.move_to_end(path)
+            return extended_key
+
+    def _remember(self, path: Tuple[str, ...], extended_key: _ExtendedKey) -> None:
+        if not self._cache_size:
+            return
+        with self._cache_lock:
+            self._cache[path] = extended_key
+            self._cache.move_to_end(path)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+    def _derive(self, path: str) -> _ExtendedKey:
+        nodes = HDPath(path).nodes
+        encoded_nodes = tuple(node.encode() for node in nodes)
+
+        # start from the deepest cached ancestor, or from the master key
+        depth = max(len(nodes) - 1, 0)
+        parent = None
+        while depth > 0:
+            parent = self._cached(encoded_nodes[:depth])
+            if parent is not None:
+                break
+            depth -= 1
+        if parent is None:
+            parent = self._master
+
+        for level in range(depth, len(nodes)):
+            node = nodes[level]
+            parent_point = None if isinstance(node, HardNode) else parent.point
+            child = _ExtendedKey(*derive_child_key(
+                parent.key,
+                parent.chain_code,
+                node,
+                parent_point,
+            ))
+            if level < len(nodes) - 1:
+                # only cache the inner nodes: the leaves are rarely derived twice
+                self._remember(encoded_nodes[:level + 1], child)
+            parent = child
+        return parent
+
+    def derive_key(self, path: str) -> bytes:
+        """
+        Derive the private key at a BIP32 path.
+
+        :param str path: BIP32-compatible derivation path, like ``m/44'/60'/0'/0/0``
+        :returns: the 32-byte private key
+        """
+        return self._derive(path).key
+
+    def derive_account(self, path: str = ETHEREUM_DEFAULT_PATH) -> LocalAccount:
+        """
+        Derive the account at a BIP32 path.
+
+        :param str path: BIP32-compatible derivation path, like ``m/44'/60'/0'/0/0``
+        :returns: object with methods for signing and encrypting
+        """
+        key = Account._parsePrivateKey(self.derive_key(path))
+        return LocalAccount(key, Account, self.chain_id)
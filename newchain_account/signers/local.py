@@ -117,8 +117,8 @@ class LocalAccount(BaseAccount):
         )
         return self.sign_transaction(transaction_dict)
 
-    def sign_transaction(self, transaction_dict):
-        return self._publicapi.sign_transaction(transaction_dict, self.key)
+    def sign_transaction(self, transaction_dict, *, validate=True):
+        return self._publicapi.sign_transaction(transaction_dict, self.key, validate=validate)
 
     def __bytes__(self):
         return self.key
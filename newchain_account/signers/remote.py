@@ -0,0 +1,672 @@
+from abc import (
+    ABC,
+    abstractmethod,
+)
+import asyncio
+from concurrent.futures import (
+    Future,
+)
+import http.client
+import json
+import queue
+import socket
+import threading
+import time
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+    cast,
+)
+from urllib.parse import (
+    urlsplit,
+)
+import warnings
+
+from eth_utils import (
+    to_checksum_address,
+)
+from hexbytes import (
+    HexBytes,
+)
+
+from newchain_account.daemon import (
+    JSONRPC_VERSION,
+    JSONRPCError,
+)
+from newchain_account.datastructures import (
+    SignedMessage,
+    SignedTransaction,
+)
+from newchain_account.messages import (
+    SignableMessage,
+    _hash_eip191_message,
+)
+from newchain_account.signers.base import (
+    BaseAccount,
+)
+
+# Number of persistent connections a remote signer opens, at most
+DEFAULT_MAX_CONNECTIONS = 4
+
+# Number of calls sent to the signer in one JSON-RPC batch, at most
+DEFAULT_MAX_BATCH_SIZE = 64
+
+# Number of batches sent on one UNIX socket before waiting for the first response
+DEFAULT_MAX_PIPELINED_BATCHES = 16
+
+# Seconds to wait for the signer to answer, before failing the calls in flight
+DEFAULT_TIMEOUT = 60.0
+
+
+class _Call(NamedTuple):
+    method: str
+    params: List[Any]
+    future: "Future[Any]"
+
+
+class RemoteSignerError(Exception):
+    """
+    The signer sent something that is not a JSON-RPC response, did not answer in time, or
+    was asked for something that remote signers do not do.
+    """
+    pass
+
+
+def _parse_responses(payload: bytes) -> List[Any]:
+    responses = json.loads(payload)
+    if isinstance(responses, dict):
+        responses = [responses]
+    if not isinstance(responses, list) or not all(map(_is_response, responses)):
+        raise RemoteSignerError("The signer sent a malformed response: %.100r" % payload)
+    return responses
+
+
+def _is_response(response: Any) -> bool:
+    if not isinstance(response, dict):
+        return False
+    has_valid_id = isinstance(response.get('id'), (int, str, type(None)))
+    return has_valid_id and isinstance(response.get('error', {}), dict)
+
+
+def _resolve(future: "Future[Any]", response: Dict[str, Any]) -> None:
+    if 'error' in response:
+        error = response['error']
+        future.set_exception(JSONRPCError(error.get('code', 0), error.get('message', '')))
+    else:
+        future.set_result(response.get('result'))
+
+
+def _fail(futures: Iterable["Future[Any]"], error: BaseException) -> None:
+    for future in futures:
+        if not future.done():
+            future.set_exception(error)
+
+
+def _encode_batch(calls: Sequence[_Call], first_id: int) -> bytes:
+    requests = [
+        {'jsonrpc': JSONRPC_VERSION, 'id': first_id + index, 'method': call.method,
+         'params': call.params}
+        for index, call in enumerate(calls)
+    ]
+    return json.dumps(requests[0] if len(requests) == 1 else requests).encode('utf-8')
+
+
+class _Connection(threading.Thread, ABC):
+    """
+    Send the queued calls of a :class:`RemoteSigner` over one persistent connection.
+    """
+
+    def __init__(self, signer: "RemoteSigner") -> None:
+        super().__init__(name='remote-signer-connection', daemon=True)
+        self._signer = signer
+        self._next_id = 0
+
+    def _reserve_ids(self, count: int) -> int:
+        first_id = self._next_id
+        self._next_id += count
+        return first_id
+
+    def run(self) -> None:
+        while True:
+            calls = self._signer._next_batch()
+            if calls is None:
+                break
+            if not calls:
+                # every call of the batch was cancelled
+                continue
+            try:
+                self._send(calls)
+            except socket.timeout:
+                timed_out = self._timed_out()
+                self._disconnect(timed_out)
+                _fail((call.future for call in calls), timed_out)
+            except RemoteSignerError as error:
+                self._disconnect(error)
+                _fail((call.future for call in calls), error)
+            except (OSError, ValueError, http.client.HTTPException) as error:
+                lost = ConnectionError(
+                    "Lost the connection to the signer at %s: %s" % (self._signer.endpoint, error)
+                )
+                self._disconnect(lost)
+                _fail((call.future for call in calls), lost)
+        self._drain()
+        self._disconnect(ConnectionError("The remote signer was closed"))
+
+    def _timed_out(self) -> RemoteSignerError:
+        return RemoteSignerError("The signer at %s did not answer within %s seconds" % (
+            self._signer.endpoint,
+            self._signer.timeout,
+        ))
+
+    @abstractmethod
+    def _send(self, calls: List[_Call]) -> None:
+        """
+        Send a batch of calls, and resolve their futures when answered.
+        """
+
+    def _drain(self) -> None:
+        """
+        Wait for the responses to the calls that were already sent.
+        """
+        pass
+
+    @abstractmethod
+    def _disconnect(
+            self,
+            error: BaseException,
+            connection: Optional[socket.socket] = None) -> None:
+        """
+        Close the connection, and fail the calls still waiting on it with ``error``.
+        """
+
+
+class _HTTPConnection(_Connection):
+    """
+    Send one batch per round trip, over a keep-alive HTTP connection.
+    """
+
+    def __init__(self, signer: "RemoteSigner") -> None:
+        super().__init__(signer)
+        url = urlsplit(signer.endpoint)
+        self._host = url.hostname or '127.0.0.1'
+        self._port = url.port
+        self._path = url.path or '/'
+        self._http: Optional[http.client.HTTPConnection] = None
+
+    def _send(self, calls: List[_Call]) -> None:
+        if self._http is None:
+            self._http = http.client.HTTPConnection(
+                self._host, self._port, timeout=self._signer.timeout,
+            )
+        first_id = self._reserve_ids(len(calls))
+        self._http.request(
+            'POST',
+            self._path,
+            _encode_batch(calls, first_id),
+            {'Content-Type': 'application/json'},
+        )
+        responses = _parse_responses(self._http.getresponse().read())
+        futures = {first_id + index: call.future for index, call in enumerate(calls)}
+        for response in responses:
+            future = futures.pop(response.get('id'), None)
+            if future is not None:
+                _resolve(future, response)
+        _fail(futures.values(), ConnectionError("The signer did not answer every call"))
+
+    def _disconnect(
+            self,
+            error: BaseException,
+            connection: Optional[socket.socket] = None) -> None:
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+
+
+class _UnixConnection(_Connection):
+    """
+    Pipeline batches over a UNIX socket: batches are sent without waiting for the
+    responses to the previous ones, which a reader thread matches back by id.
+    """
+
+    def __init__(self, signer: "RemoteSigner") -> None:
+        super().__init__(signer)
+        self._socket: Optional[socket.socket] = None
+        self._pending: Dict[int, "Future[Any]"] = {}
+        self._lock = threading.Lock()
+        # notified when responses arrive, or the connection is reset
+        self._idle = threading.Condition(self._lock)
+        # batches sent on the current socket, and not answered yet
+        self._pipelined_batches = 0
+        # when the signer last answered, or was sent a call while nothing was pending
+        self._last_progress = time.monotonic()
+
+    def _connect(self) -> socket.socket:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(self._signer.timeout)
+        connection.connect(self._signer.endpoint)
+        self._socket = connection
+        threading.Thread(
+            target=self._read,
+            args=(connection,),
+            name='remote-signer-reader',
+            daemon=True,
+        ).start()
+        return connection
+
+    def _send(self, calls: List[_Call]) -> None:
+        connection = self._socket if self._socket is not None else self._connect()
+        first_id = self._reserve_ids(len(calls))
+        with self._idle:
+            self._idle.wait_for(
+                lambda: self._pipelined_batches < self._signer.max_pipelined_batches
+            )
+            if connection is not self._socket:
+                raise ConnectionError("The connection was reset while waiting to send")
+            if not self._pending:
+                self._last_progress = time.monotonic()
+            self._pipelined_batches += 1
+            for index, call in enumerate(calls):
+                self._pending[first_id + index] = call.future
+        connection.sendall(_encode_batch(calls, first_id) + b'\n')
+
+    def _read(self, connection: socket.socket) -> None:
+        error: BaseException = ConnectionError("The signer closed the connection")
+        # a buffered reader cannot be read again after a timeout, so lines are split here
+        buffer = bytearray()
+        try:
+            while True:
+                try:
+                    chunk = connection.recv(65536)
+                except socket.timeout:
+                    if self._is_waiting(connection):
+                        error = self._timed_out()
+                        break
+                    continue
+                if not chunk:
+                    break
+                if b'\n' not in chunk:
+                    buffer += chunk
+                    continue
+                *lines, rest = (bytes(buffer) + chunk).split(b'\n')
+                buffer = bytearray(rest)
+                for line in lines:
+                    if line.strip() and not self._answer(connection, line):
+                        return
+        except RemoteSignerError as read_error:
+            error = read_error
+        except (OSError, ValueError) as read_error:
+            error = ConnectionError("Lost the connection to the signer: %s" % read_error)
+        self._disconnect(error, connection)
+
+    def _answer(self, connection: socket.socket, line: bytes) -> bool:
+        """
+        Resolve the calls answered by one line of responses.
+
+        :returns: False if the connection was replaced, and should not be read anymore
+        """
+        responses = _parse_responses(line)
+        with self._lock:
+            if connection is not self._socket:
+                # replaced by a reconnect, which already failed its calls
+                return False
+            futures = [
+                (self._pending.pop(response.get('id'), None), response)
+                for response in responses
+            ]
+            self._pipelined_batches -= 1
+            self._last_progress = time.monotonic()
+            self._idle.notify_all()
+        for future, response in futures:
+            if future is not None:
+                _resolve(future, response)
+        return True
+
+    def _is_waiting(self, connection: socket.socket) -> bool:
+        """
+        Check if calls have waited on this connection for longer than the timeout.
+        """
+        with self._lock:
+            if connection is not self._socket or not self._pending:
+                # replaced, or idle: neither is the signer's fault
+                return False
+            timeout = cast(float, self._signer.timeout)
+            return time.monotonic() - self._last_progress >= timeout
+
+    def _drain(self) -> None:
+        with self._idle:
+            self._idle.wait_for(lambda: not self._pending)
+
+    def _disconnect(
+            self,
+            error: BaseException,
+            connection: Optional[socket.socket] = None) -> None:
+        with self._lock:
+            if connection is not None and connection is not self._socket:
+                # an older connection, which was already replaced
+                return
+            if self._socket is not None:
+                try:
+                    self._socket.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+                self._socket.close()
+                self._socket = None
+            pending, self._pending = self._pending, {}
+            self._pipelined_batches = 0
+            self._idle.notify_all()
+        _fail(pending.values(), error)
+
+
+class RemoteSigner:
+    """
+    A client of a JSON-RPC signing service, like :class:`~newchain_account.daemon.SigningDaemon`.
+
+    Calls from any number of threads or tasks are queued, and sent over at most
+    ``max_connections`` persistent connections, which are opened on first use. When a
+    connection is ready to send, everything queued (up to ``max_batch_size`` calls) is sent
+    as one JSON-RPC batch, so batches grow with the load, and thousands of outstanding
+    signatures share a handful of sockets. On a UNIX socket, batches are also pipelined:
+    a connection sends the next batch without waiting for the responses to earlier ones.
+
+    Calls which the signer answers with an error raise
+    :class:`~newchain_account.daemon.JSONRPCError`, calls that were in flight on a
+    broken connection raise :class:`ConnectionError`, and calls that were in flight when
+    the signer sent a malformed response, or did not answer within ``timeout``, raise
+    :class:`RemoteSignerError`.
+    """
+
+    def __init__(
+            self,
+            endpoint: str,
+            *,
+            max_connections: int = DEFAULT_MAX_CONNECTIONS,
+            max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+            max_pipelined_batches: int = DEFAULT_MAX_PIPELINED_BATCHES,
+            timeout: Optional[float] = DEFAULT_TIMEOUT) -> None:
+        """
+        :param str endpoint: a UNIX socket path, or an ``http://`` URL
+        :param int max_connections: number of connections to open, at most
+        :param int max_batch_size: number of calls sent in one batch, at most
+        :param int max_pipelined_batches: number of batches in flight on one UNIX socket,
+            at most
+        :param float timeout: seconds to wait for the signer to answer, or None to wait
+            forever
+        """
+        self.endpoint = endpoint
+        self.max_connections = max_connections
+        self.max_batch_size = max_batch_size
+        self.max_pipelined_batches = max_pipelined_batches
+        self.timeout = timeout
+        self._queue: "queue.Queue[Optional[_Call]]" = queue.Queue()
+        self._connections: List[_Connection] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _next_batch(self) -> Optional[List[_Call]]:
+        call = self._queue.get()
+        if call is None:
+            # pass the stop signal on to the next connection
+            self._queue.put(None)
+            return None
+        calls = [call]
+        while len(calls) < self.max_batch_size:
+            try:
+                call = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if call is None:
+                # leave the stop signal for the next round, after this batch is sent
+                self._queue.put(None)
+                break
+            calls.append(call)
+        return [call for call in calls if call.future.set_running_or_notify_cancel()]
+
+    def _ensure_connections(self) -> None:
+        if len(self._connections) >= self.max_connections:
+            return
+        with self._lock:
+            if self._closed:
+                raise ConnectionError("The remote signer was closed")
+            connection_type = (
+                _HTTPConnection if self.endpoint.startswith('http://') else _UnixConnection
+            )
+            while len(self._connections) < self.max_connections:
+                connection = connection_type(self)
+                connection.start()
+                self._connections.append(connection)
+
+    def submit(self, method: str, params: Sequence[Any]) -> "Future[Any]":
+        """
+        Queue one call.
+
+        :param str method: the JSON-RPC method
+        :param list params: its positional params
+        :returns: a future of the result
+        """
+        self._ensure_connections()
+        future: "Future[Any]" = Future()
+        with self._lock:
+            # checked with the lock that close() holds, so no call lands behind the stop signal
+            if self._closed:
+                raise ConnectionError("The remote signer was closed")
+            self._queue.put(_Call(method, list(params), future))
+        return future
+
+    def call(self, method: str, params: Sequence[Any]) -> Any:
+        """
+        Make one call, and wait for its result.
+        """
+        return self.submit(method, params).result()
+
+    async def call_async(self, method: str, params: Sequence[Any]) -> Any:
+        """
+        Make one call, and wait for its result without blocking the event loop.
+        """
+        return await asyncio.wrap_future(self.submit(method, params))
+
+    def close(self) -> None:
+        """
+        Send what is queued, then close the connections.
+
+        Calls still in flight on a connection when it is closed raise
+        :class:`ConnectionError`.
+        """
+        with self._lock:
+            self._closed = True
+            connections, self._connections = self._connections, []
+            self._queue.put(None)
+        for connection in connections:
+            connection.join()
+        # every connection passed the stop signal on, so the last one is still queued
+        self._queue.get_nowait()
+
+    def __enter__(self) -> "RemoteSigner":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray)):
+        return HexBytes(value).hex()
+    if isinstance(value, dict):
+        return {key: _to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(item) for item in value]
+    return value
+
+
+def _defunct_header(body: bytes) -> bytes:
+    return b'thereum Signed Message:\n' + str(len(body)).encode('utf-8')
+
+
+class RemoteAccount(BaseAccount):
+    r"""
+    An account whose private key is held by a remote signing service.
+
+    It signs like :class:`~newchain_account.signers.local.LocalAccount`, by forwarding every
+    request to a :class:`RemoteSigner`, which can be shared by many accounts. Besides the
+    blocking methods, every signing method has a ``*_future`` variant returning a
+    :class:`concurrent.futures.Future`, and an ``*_async`` coroutine variant, so that many
+    signatures can be outstanding at once.
+
+    Raw hashes cannot be signed remotely: signers only sign what they can show to be an
+    EIP-191 message or a transaction, so :meth:`signHash` raises :class:`RemoteSignerError`.
+
+    .. code-block:: python
+
+        >>> signer = RemoteSigner('/run/signer.sock')  # doctest: +SKIP
+        >>> account = RemoteAccount(address, signer)  # doctest: +SKIP
+        >>> account.sign_message(encode_defunct(text="I♥SF"))  # doctest: +SKIP
+        >>> await account.sign_transaction_async(transaction)  # doctest: +SKIP
+    """
+
+    def __init__(self, address: str, signer: Union[str, RemoteSigner]) -> None:
+        """
+        :param str address: the address of the account in the signer
+        :param signer: the signer, or its endpoint to connect a new signer to
+        """
+        self._address = to_checksum_address(address)
+        self.signer = signer if isinstance(signer, RemoteSigner) else RemoteSigner(signer)
+
+    @property
+    def address(self) -> str:
+        return self._address
+
+    def _signed_message(
+            self,
+            signable_message: SignableMessage,
+            signature: "Future[Any]") -> "Future[SignedMessage]":
+        message_hash = HexBytes(_hash_eip191_message(signable_message))
+        signed: "Future[SignedMessage]" = Future()
+
+        def finish(future: "Future[Any]") -> None:
+            try:
+                signature_bytes = HexBytes(future.result())
+                if len(signature_bytes) != 65:
+                    raise ValueError("The signer returned a malformed signature")
+                signed.set_result(SignedMessage(
+                    messageHash=message_hash,
+                    r=int.from_bytes(signature_bytes[:32], 'big'),
+                    s=int.from_bytes(signature_bytes[32:64], 'big'),
+                    v=signature_bytes[64],
+                    signature=signature_bytes,
+                ))
+            except Exception as error:
+                signed.set_exception(error)
+
+        signature.add_done_callback(finish)
+        return signed
+
+    def sign_message_future(self, signable_message: SignableMessage) -> "Future[SignedMessage]":
+        """
+        Start signing the EIP-191 message, see :meth:`sign_message`.
+        """
+        is_defunct = signable_message.version == b'E'
+        if is_defunct and signable_message.header == _defunct_header(signable_message.body):
+            # what every signer understands
+            signature = self.signer.submit(
+                'eth_sign', [self.address, HexBytes(signable_message.body).hex()]
+            )
+        else:
+            signature = self.signer.submit('newchain_signMessage', [self.address, {
+                'version': HexBytes(signable_message.version).hex(),
+                'header': HexBytes(signable_message.header).hex(),
+                'body': HexBytes(signable_message.body).hex(),
+            }])
+        return self._signed_message(signable_message, signature)
+
+    def sign_message(self, signable_message: SignableMessage) -> SignedMessage:
+        """
+        Sign the EIP-191 message remotely.
+
+        This uses the same structure as in
+        :meth:`~newchain_account.account.Account.sign_message`, but without a private key
+        argument. The message hash is computed locally.
+        """
+        return self.sign_message_future(signable_message).result()
+
+    async def sign_message_async(self, signable_message: SignableMessage) -> SignedMessage:
+        """
+        Sign the EIP-191 message remotely, without blocking the event loop.
+        """
+        return await asyncio.wrap_future(self.sign_message_future(signable_message))
+
+    def sign_messages(self, signable_messages: Iterable[SignableMessage]) -> List[SignedMessage]:
+        """
+        Sign many messages, which are all sent before waiting for any signature.
+        """
+        futures = [self.sign_message_future(message) for message in signable_messages]
+        return [future.result() for future in futures]
+
+    def sign_transaction_future(
+            self,
+            transaction_dict: Dict[str, Any]) -> "Future[SignedTransaction]":
+        """
+        Start signing the transaction, see :meth:`sign_transaction`.
+        """
+        if 'from' in transaction_dict and transaction_dict['from'] != self.address:
+            raise TypeError("from field must match key's %s, but it was %s" % (
+                self.address,
+                transaction_dict['from'],
+            ))
+        transaction = _to_json(dict(transaction_dict, **{'from': self.address}))
+        response = self.signer.submit('eth_signTransaction', [transaction])
+        signed: "Future[SignedTransaction]" = Future()
+
+        def finish(future: "Future[Any]") -> None:
+            try:
+                result = future.result()
+                signed.set_result(SignedTransaction(
+                    rawTransaction=HexBytes(result['raw']),
+                    hash=HexBytes(result['tx']['hash']),
+                    r=int(result['tx']['r'], 16),
+                    s=int(result['tx']['s'], 16),
+                    v=int(result['tx']['v'], 16),
+                ))
+            except Exception as error:
+                signed.set_exception(error)
+
+        response.add_done_callback(finish)
+        return signed
+
+    def sign_transaction(self, transaction_dict: Dict[str, Any]) -> SignedTransaction:
+        """
+        Sign the transaction remotely.
+
+        This uses the same structure as in
+        :meth:`~newchain_account.account.Account.sign_transaction`, but without a private key
+        argument. The ``from`` field is set to this account.
+        """
+        return self.sign_transaction_future(transaction_dict).result()
+
+    async def sign_transaction_async(self, transaction_dict: Dict[str, Any]) -> SignedTransaction:
+        """
+        Sign the transaction remotely, without blocking the event loop.
+        """
+        return await asyncio.wrap_future(self.sign_transaction_future(transaction_dict))
+
+    def signHash(self, message_hash):
+        """
+        Refuse to sign a raw hash, which remote signers do not support.
+
+        :raises RemoteSignerError: always
+        """
+        raise RemoteSignerError(
+            "Hash signing is not supported remotely: remote signers only sign EIP-191 "
+            "messages and transactions"
+        )
+
+    def signTransaction(self, transaction_dict):
+        warnings.warn(
+            "signTransaction is deprecated in favor of sign_transaction",
+            category=DeprecationWarning,
+        )
+        return self.sign_transaction(transaction_dict)
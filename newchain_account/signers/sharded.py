@@ -0,0 +1,262 @@
+import asyncio
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+)
+import gc
+import multiprocessing
+import os
+import threading
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from eth_typing import (
+    ChecksumAddress,
+)
+from eth_utils import (
+    to_checksum_address,
+)
+
+from newchain_account.datastructures import (
+    SignedMessage,
+    SignedTransaction,
+)
+from newchain_account.messages import (
+    SignableMessage,
+)
+from newchain_account.signers.local import (
+    LocalAccount,
+)
+
+# The shards of the signers being started, read by the forked workers
+_preloaded_shards: Dict[Tuple[int, int], Dict[ChecksumAddress, LocalAccount]] = {}
+_preload_lock = threading.Lock()
+
+# The accounts held by a worker process, loaded once by _load_shard
+_shard_accounts: Dict[ChecksumAddress, LocalAccount] = {}
+
+
+def _load_shard(
+        shard_id: Tuple[int, int],
+        accounts: Optional[Dict[ChecksumAddress, LocalAccount]]) -> None:
+    if accounts is None:
+        # forked: the shard is already in memory, shared with the parent process
+        accounts = _preloaded_shards[shard_id]
+    _preloaded_shards.clear()
+    _shard_accounts.update(accounts)
+
+
+def _shard_addresses() -> List[ChecksumAddress]:
+    return sorted(_shard_accounts)
+
+
+def _sign_message_in_shard(
+        address: ChecksumAddress,
+        signable_message: SignableMessage) -> SignedMessage:
+    account = _shard_accounts[address]
+    signed: SignedMessage = account._publicapi.sign_message(signable_message, account._key_obj)
+    return signed
+
+
+def _sign_messages_in_shard(
+        address: ChecksumAddress,
+        signable_messages: Sequence[SignableMessage]) -> List[SignedMessage]:
+    account = _shard_accounts[address]
+    signed: List[SignedMessage] = account._publicapi.sign_messages(
+        signable_messages,
+        account._key_obj,
+    )
+    return signed
+
+
+def _sign_transaction_in_shard(
+        address: ChecksumAddress,
+        transaction_dict: Dict[str, Any]) -> SignedTransaction:
+    account = _shard_accounts[address]
+    signed: SignedTransaction = account._publicapi.sign_transaction(
+        transaction_dict,
+        account._key_obj,
+    )
+    return signed
+
+
+class ShardedSigner:
+    """
+    Sign with local accounts held in a pool of long-lived worker processes, where each
+    account lives in exactly one worker.
+
+    Requests are routed to the worker holding the account, by address, so private keys
+    never cross a process boundary after startup. Each worker keeps its accounts with
+    the private key already parsed and the address already derived.
+
+    Where the ``fork`` start method is available, the shards are prepared before the
+    workers are forked, which inherit them copy-on-write instead of unpickling them.
+
+    .. code-block:: python
+
+        >>> with ShardedSigner(accounts, shards=4) as signer:  # doctest: +SKIP
+        ...     signed = signer.sign_message(address, signable_message)  # doctest: +SKIP
+    """
+
+    def __init__(self, accounts: Iterable[LocalAccount], *, shards: Optional[int] = None) -> None:
+        """
+        :param accounts: the accounts to sign with
+        :param int shards: number of worker processes, by default the number of CPUs, and
+            never more than the number of accounts
+        """
+        unique_accounts = {account.address: account for account in accounts}
+        if not unique_accounts:
+            raise ValueError("A sharded signer needs at least one account")
+        if shards is None:
+            shards = os.cpu_count() or 1
+        if shards < 1:
+            raise ValueError("shards must be a positive integer, got %r" % shards)
+        shards = min(shards, len(unique_accounts))
+
+        shard_accounts: List[Dict[ChecksumAddress, LocalAccount]] = [{} for _ in range(shards)]
+        self._routes: Dict[ChecksumAddress, int] = {}
+        for index, (address, account) in enumerate(unique_accounts.items()):
+            shard_accounts[index % shards][address] = account
+            self._routes[address] = index % shards
+
+        self._executors: List[ProcessPoolExecutor] = []
+        if 'fork' in multiprocessing.get_all_start_methods():
+            self._start_forked_workers(shard_accounts)
+        else:
+            for index, accounts_of_shard in enumerate(shard_accounts):
+                self._start_worker((id(self), index), accounts_of_shard, None)
+
+    def _start_worker(
+            self,
+            shard_id: Tuple[int, int],
+            accounts: Optional[Dict[ChecksumAddress, LocalAccount]],
+            context: Any) -> None:
+        executor = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=context,
+            initializer=_load_shard,
+            initargs=(shard_id, accounts),
+        )
+        self._executors.append(executor)
+        # start the worker right away, and check that it holds its shard
+        executor.submit(_shard_addresses).result()
+
+    def _start_forked_workers(
+            self,
+            shard_accounts: List[Dict[ChecksumAddress, LocalAccount]]) -> None:
+        context = multiprocessing.get_context('fork')
+        with _preload_lock:
+            for index, accounts in enumerate(shard_accounts):
+                _preloaded_shards[(id(self), index)] = accounts
+            # keep the garbage collector of the workers from writing to the shared pages
+            gc.freeze()
+            try:
+                for index in range(len(shard_accounts)):
+                    self._start_worker((id(self), index), None, context)
+            finally:
+                gc.unfreeze()
+                for index in range(len(shard_accounts)):
+                    del _preloaded_shards[(id(self), index)]
+
+    @property
+    def addresses(self) -> List[ChecksumAddress]:
+        """
+        Get the addresses of the accounts that this signer holds.
+        """
+        return list(self._routes)
+
+    def _executor_for(self, address: str) -> Tuple[ChecksumAddress, ProcessPoolExecutor]:
+        checksum_address = to_checksum_address(address)
+        try:
+            return checksum_address, self._executors[self._routes[checksum_address]]
+        except KeyError:
+            raise ValueError("No worker holds the account %s" % checksum_address) from None
+
+    def submit_message(
+            self,
+            address: str,
+            signable_message: SignableMessage) -> "Future[SignedMessage]":
+        """
+        Sign a message with one of the accounts, in the worker holding it.
+
+        :param str address: the address of the account to sign with
+        :param signable_message: the encoded message for signing
+        :returns: a future of the signed message
+        :raises ValueError: if no worker holds the account
+        """
+        checksum_address, executor = self._executor_for(address)
+        return executor.submit(_sign_message_in_shard, checksum_address, signable_message)
+
+    def submit_messages(
+            self,
+            address: str,
+            signable_messages: Sequence[SignableMessage]) -> "Future[List[SignedMessage]]":
+        """
+        Sign many messages with one of the accounts, in one task of the worker holding it.
+
+        :param str address: the address of the account to sign with
+        :param signable_messages: the encoded messages for signing
+        :returns: a future of the signed messages, in the same order
+        :raises ValueError: if no worker holds the account
+        """
+        checksum_address, executor = self._executor_for(address)
+        return executor.submit(_sign_messages_in_shard, checksum_address, list(signable_messages))
+
+    def submit_transaction(
+            self,
+            address: str,
+            transaction_dict: Dict[str, Any]) -> "Future[SignedTransaction]":
+        """
+        Sign a transaction with one of the accounts, in the worker holding it.
+
+        :param str address: the address of the account to sign with
+        :param dict transaction_dict: the transaction, with all fields specified
+        :returns: a future of the signed transaction
+        :raises ValueError: if no worker holds the account
+        """
+        checksum_address, executor = self._executor_for(address)
+        return executor.submit(_sign_transaction_in_shard, checksum_address, transaction_dict)
+
+    def sign_message(self, address: str, signable_message: SignableMessage) -> SignedMessage:
+        return self.submit_message(address, signable_message).result()
+
+    def sign_messages(
+            self,
+            address: str,
+            signable_messages: Sequence[SignableMessage]) -> List[SignedMessage]:
+        return self.submit_messages(address, signable_messages).result()
+
+    def sign_transaction(self, address: str, transaction_dict: Dict[str, Any]) -> SignedTransaction:
+        return self.submit_transaction(address, transaction_dict).result()
+
+    async def sign_message_async(
+            self,
+            address: str,
+            signable_message: SignableMessage) -> SignedMessage:
+        return await asyncio.wrap_future(self.submit_message(address, signable_message))
+
+    async def sign_transaction_async(
+            self,
+            address: str,
+            transaction_dict: Dict[str, Any]) -> SignedTransaction:
+        return await asyncio.wrap_future(self.submit_transaction(address, transaction_dict))
+
+    def close(self) -> None:
+        """
+        Finish the pending requests, then stop the workers.
+        """
+        for executor in self._executors:
+            executor.shutdown()
+
+    def __enter__(self) -> "ShardedSigner":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,437 @@
+"""
+A micro-batching front-end for signing with local private keys.
+
+Services where many threads or coroutines each need one signature at a time pay a
+fixed cost per signature for handing work to a pool of processes. A
+:class:`SigningQueue` coalesces the requests that arrive close together into batches,
+closed when they reach ``max_batch_size`` or when the oldest request has waited
+``max_delay`` seconds, and signs each batch in one task. Every caller still gets its own
+:class:`~concurrent.futures.Future`, and failures are reported per request.
+
+The queue is bounded: when ``max_queue_size`` requests are waiting, callers block (or
+time out) until the signers catch up, instead of piling up work without limit.
+
+.. code-block:: python
+
+    >>> with SigningQueue(max_workers=4, max_delay=0.002) as signing_queue:  # doctest: +SKIP
+    ...     future = signing_queue.submit_message(signable_message, key)  # doctest: +SKIP
+    ...     signed = future.result()  # doctest: +SKIP
+    ...     print(signing_queue.stats())  # doctest: +SKIP
+"""
+import asyncio
+from collections import (
+    deque,
+)
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+)
+import queue
+import threading
+import time
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from eth_typing import (
+    HexStr,
+)
+from newchain_keys import (
+    keys,
+)
+
+from newchain_account.account import (
+    Account,
+)
+from newchain_account.datastructures import (
+    SignedMessage,
+    SignedTransaction,
+)
+from newchain_account.messages import (
+    SignableMessage,
+)
+from newchain_account.signers.local import (
+    LocalAccount,
+)
+
+# Number of requests signed in one batch, at most
+DEFAULT_MAX_BATCH_SIZE = 64
+
+# Seconds that the oldest request of a batch waits for more requests to join it
+DEFAULT_MAX_DELAY = 0.002
+
+# Number of requests waiting to be batched, at most
+DEFAULT_MAX_QUEUE_SIZE = 4096
+
+# Number of request latencies kept to compute the latency percentiles
+LATENCY_WINDOW = 4096
+
+MESSAGE = 'message'
+TRANSACTION = 'transaction'
+
+PrivateKey = Union[bytes, HexStr, int, keys.PrivateKey, LocalAccount]
+
+
+class _Request(NamedTuple):
+    kind: str
+    payload: Any
+    private_key: bytes
+    future: "Future[Any]"
+    enqueued: float
+
+
+def sign_batch(requests: List[Tuple[str, Any, bytes]]) -> List[Tuple[bool, Any]]:
+    """
+    Sign a batch of messages and transactions, parsing each distinct key once.
+
+    :param requests: ``(kind, payload, private_key)`` tuples, where ``kind`` is
+        :data:`MESSAGE` or :data:`TRANSACTION`, ``payload`` is the signable message or
+        the transaction dict, and ``private_key`` is the 32-byte raw key
+    :returns: a ``(True, signed)`` or ``(False, exception)`` tuple per request, in order
+    """
+    parsed_keys: Dict[bytes, keys.PrivateKey] = {}
+    results: List[Tuple[bool, Any]] = []
+    for kind, payload, private_key in requests:
+        try:
+            key = parsed_keys.get(private_key)
+            if key is None:
+                key = parsed_keys[private_key] = Account._parsePrivateKey(private_key)
+            if kind == MESSAGE:
+                results.append((True, Account.sign_message(payload, key)))
+            else:
+                results.append((True, Account.sign_transaction(payload, key)))
+        except Exception as error:
+            results.append((False, error))
+    return results
+
+
+class SigningQueueStats(NamedTuple):
+    """
+    Counters of a :class:`SigningQueue`, since it was created.
+
+    Latencies are in seconds, from submitting a request to its result, over the last
+    :data:`LATENCY_WINDOW` requests.
+    """
+    requests: int
+    errors: int
+    batches: int
+    mean_batch_size: float
+    queue_depth: int
+    p50_latency: float
+    p99_latency: float
+
+
+class SigningQueue:
+    """
+    Coalesce concurrent signing requests into batches, and sign them in a worker pool.
+    """
+
+    def __init__(
+            self,
+            *,
+            max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+            max_delay: float = DEFAULT_MAX_DELAY,
+            max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+            max_workers: Optional[int] = None) -> None:
+        """
+        :param int max_batch_size: number of requests signed in one batch, at most.
+            Larger batches amortize the cost of reaching a worker, smaller ones start
+            signing sooner.
+        :param float max_delay: seconds that the oldest request of a batch waits for
+            more requests to join it. This bounds the latency added at low load.
+        :param int max_queue_size: number of requests waiting to be batched, at most.
+            Callers block when it is reached.
+        :param int max_workers: sign in a process pool of this size, instead of in a
+            thread of the current process
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be a positive integer, got %r" % max_batch_size)
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue(max_queue_size)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # batches handed to the pool and not finished yet, at most
+        in_flight = 1
+        if max_workers is not None and max_workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=max_workers)
+            in_flight = 2 * max_workers
+        self._batch_slots = threading.BoundedSemaphore(in_flight)
+
+        self._stats_lock = threading.Lock()
+        self._requests = 0
+        self._errors = 0
+        self._batches = 0
+        self._batched_requests = 0
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+        self._closed = False
+        self._close_lock = threading.Lock()
+        # set once the dispatcher took the stop signal, and takes no more requests
+        self._stopped = False
+        self._dispatcher = threading.Thread(
+            target=self._run,
+            name='signing-queue-dispatcher',
+            daemon=True,
+        )
+        self._dispatcher.start()
+
+    def _submit(
+            self,
+            kind: str,
+            payload: Any,
+            private_key: PrivateKey,
+            block: bool = True,
+            timeout: Optional[float] = None) -> "Future[Any]":
+        if self._closed:
+            raise RuntimeError("Cannot submit to a closed SigningQueue")
+        future: "Future[Any]" = Future()
+        request = _Request(
+            kind,
+            payload,
+            Account._private_key_bytes(private_key),
+            future,
+            time.monotonic(),
+        )
+        self._queue.put(request, block, timeout)
+        if self._stopped:
+            # raced with close(): the dispatcher may have drained the queue already
+            self._fail_abandoned()
+        return future
+
+    def submit_message(
+            self,
+            signable_message: SignableMessage,
+            private_key: PrivateKey,
+            *,
+            timeout: Optional[float] = None) -> "Future[SignedMessage]":
+        """
+        Queue a message to sign, like :meth:`~newchain_account.account.Account.sign_message`.
+
+        :param signable_message: the encoded message for signing
+        :param private_key: the key to sign the message with
+        :type private_key: hex str, bytes, int, :class:`newchain_keys.datatypes.PrivateKey`
+            or :class:`~newchain_account.signers.local.LocalAccount`
+        :param float timeout: seconds to wait for room in the queue, or None to wait as
+            long as needed
+        :returns: a future of the signed message
+        :raises queue.Full: if there was no room in the queue before ``timeout``
+        """
+        return self._submit(MESSAGE, signable_message, private_key, timeout=timeout)
+
+    def submit_transaction(
+            self,
+            transaction_dict: Dict[str, Any],
+            private_key: PrivateKey,
+            *,
+            timeout: Optional[float] = None) -> "Future[SignedTransaction]":
+        """
+        Queue a transaction to sign, like
+        :meth:`~newchain_account.account.Account.sign_transaction`.
+
+        :param dict transaction_dict: the transaction, with all fields specified
+        :param private_key: the key to sign the transaction with
+        :type private_key: hex str, bytes, int, :class:`newchain_keys.datatypes.PrivateKey`
+            or :class:`~newchain_account.signers.local.LocalAccount`
+        :param float timeout: seconds to wait for room in the queue, or None to wait as
+            long as needed
+        :returns: a future of the signed transaction
+        :raises queue.Full: if there was no room in the queue before ``timeout``
+        """
+        return self._submit(TRANSACTION, transaction_dict, private_key, timeout=timeout)
+
+    def sign_message(
+            self,
+            signable_message: SignableMessage,
+            private_key: PrivateKey) -> SignedMessage:
+        """
+        Sign a message through the queue, and wait for the signature.
+        """
+        return self.submit_message(signable_message, private_key).result()
+
+    def sign_transaction(
+            self,
+            transaction_dict: Dict[str, Any],
+            private_key: PrivateKey) -> SignedTransaction:
+        """
+        Sign a transaction through the queue, and wait for the signature.
+        """
+        return self.submit_transaction(transaction_dict, private_key).result()
+
+    async def _submit_async(self, kind: str, payload: Any, private_key: PrivateKey) -> Any:
+        try:
+            future = self._submit(kind, payload, private_key, block=False)
+        except queue.Full:
+            # wait for room in the queue without blocking the event loop
+            future = await asyncio.get_running_loop().run_in_executor(
+                None, self._submit, kind, payload, private_key,
+            )
+        return await asyncio.wrap_future(future)
+
+    async def sign_message_async(
+            self,
+            signable_message: SignableMessage,
+            private_key: PrivateKey) -> SignedMessage:
+        """
+        Sign a message through the queue, without blocking the event loop.
+        """
+        signed: SignedMessage = await self._submit_async(MESSAGE, signable_message, private_key)
+        return signed
+
+    async def sign_transaction_async(
+            self,
+            transaction_dict: Dict[str, Any],
+            private_key: PrivateKey) -> SignedTransaction:
+        """
+        Sign a transaction through the queue, without blocking the event loop.
+        """
+        signed: SignedTransaction = await self._submit_async(
+            TRANSACTION, transaction_dict, private_key,
+        )
+        return signed
+
+    def _next_batch(self) -> Tuple[List[_Request], bool]:
+        """
+        Wait for a batch of requests.
+
+        :returns: the batch, and whether the queue was closed
+        """
+        request = self._queue.get()
+        if request is None:
+            return [], True
+        batch = [request]
+        deadline = request.enqueued + self.max_delay
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    request = self._queue.get(timeout=remaining)
+                else:
+                    # the window is over, but requests already waiting still join
+                    request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                return batch, True
+            batch.append(request)
+        return batch, False
+
+    def _run(self) -> None:
+        closed = False
+        while not closed:
+            batch, closed = self._next_batch()
+            batch = [request for request in batch if request.future.set_running_or_notify_cancel()]
+            if batch:
+                self._dispatch(batch)
+        self._stopped = True
+        self._fail_abandoned()
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def _fail_abandoned(self) -> None:
+        """
+        Fail the requests queued behind the stop signal, which no dispatcher will take.
+        """
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if request is not None and request.future.set_running_or_notify_cancel():
+                request.future.set_exception(RuntimeError("The SigningQueue was closed"))
+
+    def _dispatch(self, batch: List[_Request]) -> None:
+        work = [(request.kind, request.payload, request.private_key) for request in batch]
+        with self._stats_lock:
+            self._batches += 1
+            self._batched_requests += len(batch)
+
+        if self._executor is None:
+            try:
+                results = sign_batch(work)
+            except Exception as error:
+                results = [(False, error)] * len(batch)
+            self._resolve(batch, results)
+            return
+
+        self._batch_slots.acquire()
+
+        def finish(future: "Future[List[Tuple[bool, Any]]]") -> None:
+            self._batch_slots.release()
+            try:
+                results = future.result()
+            except Exception as error:
+                results = [(False, error)] * len(batch)
+            self._resolve(batch, results)
+
+        try:
+            batch_future = self._executor.submit(sign_batch, work)
+        except Exception as error:
+            # e.g. a broken worker pool: fail this batch, and keep dispatching
+            self._batch_slots.release()
+            self._resolve(batch, [(False, error)] * len(batch))
+            return
+        batch_future.add_done_callback(finish)
+
+    def _resolve(self, batch: List[_Request], results: List[Tuple[bool, Any]]) -> None:
+        resolved = time.monotonic()
+        errors = 0
+        for request, (succeeded, result) in zip(batch, results):
+            if succeeded:
+                request.future.set_result(result)
+            else:
+                errors += 1
+                request.future.set_exception(result)
+        with self._stats_lock:
+            self._requests += len(batch)
+            self._errors += errors
+            self._latencies.extend(resolved - request.enqueued for request in batch)
+
+    def stats(self) -> SigningQueueStats:
+        """
+        Get the counters of the queue, to tune ``max_batch_size`` and ``max_delay``.
+        """
+        with self._stats_lock:
+            latencies = sorted(self._latencies)
+            batches = self._batches
+            mean_batch_size = self._batched_requests / batches if batches else 0.0
+            requests = self._requests
+            errors = self._errors
+
+        def percentile(fraction: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+        return SigningQueueStats(
+            requests=requests,
+            errors=errors,
+            batches=batches,
+            mean_batch_size=mean_batch_size,
+            queue_depth=self._queue.qsize(),
+            p50_latency=percentile(0.50),
+            p99_latency=percentile(0.99),
+        )
+
+    def close(self) -> None:
+        """
+        Sign the requests already queued, then stop the dispatcher and the workers.
+        """
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(None)
+        self._dispatcher.join()
+
+    def __enter__(self) -> "SigningQueue":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
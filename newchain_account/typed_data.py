@@ -0,0 +1,223 @@
+"""
+Streaming EIP-712 hashing and signing of newline-delimited JSON documents.
+
+Every line of the input is one complete structured data document, as accepted by
+:func:`~newchain_account.messages.encode_structured_data`. Lines are read lazily and
+processed in chunks, so memory use is bounded by the chunk size whatever the input
+size. Documents that share the same ``types`` reuse one compiled schema, and documents
+that share the same domain reuse its separator.
+"""
+from functools import (
+    lru_cache,
+)
+import json
+import os
+from typing import (
+    IO,
+    Any,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
+
+from eth_typing import (
+    HexStr,
+)
+from eth_utils import (
+    keccak,
+)
+from hexbytes import (
+    HexBytes,
+)
+from newchain_keys import (
+    keys,
+)
+
+from newchain_account._utils.parallel import (
+    DEFAULT_CHUNK_SIZE,
+    map_chunks,
+)
+from newchain_account._utils.signing import (
+    STRUCTURED_DATA_SIGN_VERSION,
+    sign_message_hash,
+)
+from newchain_account._utils.structured_data.hashing import (
+    CompiledTypedDataSchema,
+    hash_domain,
+    load_and_validate_structured_message,
+)
+from newchain_account.account import (
+    Account,
+)
+from newchain_account.datastructures import (
+    SignedMessage,
+)
+
+# Number of distinct ``types`` whose compiled schemas are kept by each process
+SCHEMA_CACHE_SIZE = 64
+
+PrivateKey = Union[bytes, HexStr, int, keys.PrivateKey]
+
+
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def _compiled_schema(types_json: str) -> CompiledTypedDataSchema:
+    return CompiledTypedDataSchema(json.loads(types_json))
+
+
+def _hash_and_sign_lines(
+        lines: List[str],
+        key: Optional[keys.PrivateKey]) -> List[Tuple[bytes, Optional[Tuple[Any, ...]]]]:
+    results: List[Tuple[bytes, Optional[Tuple[Any, ...]]]] = []
+    for line in lines:
+        structured_data = load_and_validate_structured_message(line)
+        schema = _compiled_schema(json.dumps(structured_data["types"], sort_keys=True))
+        message_hash = keccak(b''.join((
+            b'\x19',
+            STRUCTURED_DATA_SIGN_VERSION,
+            hash_domain(structured_data),
+            schema.hash_message(structured_data["primaryType"], structured_data["message"]),
+        )))
+        if key is None:
+            results.append((message_hash, None))
+        else:
+            results.append((message_hash, sign_message_hash(key, message_hash)))
+    return results
+
+
+def _non_empty(lines: Iterable[str]) -> Iterator[str]:
+    return (line for line in lines if line.strip())
+
+
+def hash_typed_data_lines(
+        lines: Iterable[str],
+        *,
+        max_workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[HexBytes]:
+    """
+    Hash JSON encoded structured data documents, one per line.
+
+    Blank lines are skipped.
+
+    :param lines: the JSON documents, for example an open file
+    :param int max_workers: hash in a process pool of this size, instead of in the
+        current process
+    :param int chunk_size: number of lines sent to a worker at a time
+    :returns: the EIP-712 digest of each document, ready for signing, in order
+    """
+    for message_hash, _ in map_chunks(
+            _hash_and_sign_lines,
+            _non_empty(lines),
+            None,
+            max_workers=max_workers,
+            chunk_size=chunk_size):
+        yield HexBytes(message_hash)
+
+
+def sign_typed_data_lines(
+        lines: Iterable[str],
+        private_key: PrivateKey,
+        *,
+        max_workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[SignedMessage]:
+    """
+    Sign JSON encoded structured data documents, one per line.
+
+    The result for each document is the same as
+    ``Account.sign_message(encode_structured_data(text=line), private_key)``.
+    Blank lines are skipped.
+
+    :param lines: the JSON documents, for example an open file
+    :param private_key: the key to sign the documents with
+    :type private_key: hex str, bytes, int or :class:`newchain_keys.datatypes.PrivateKey`
+    :param int max_workers: sign in a process pool of this size, instead of in the
+        current process
+    :param int chunk_size: number of lines sent to a worker at a time
+    :returns: the signature of each document, in order
+    """
+    key = Account._parsePrivateKey(private_key)
+    for message_hash, signature in map_chunks(
+            _hash_and_sign_lines,
+            _non_empty(lines),
+            key,
+            max_workers=max_workers,
+            chunk_size=chunk_size):
+        (v, r, s, eth_signature_bytes) = cast(Tuple[Any, ...], signature)
+        yield SignedMessage(
+            messageHash=HexBytes(message_hash),
+            r=r,
+            s=s,
+            v=v,
+            signature=HexBytes(eth_signature_bytes),
+        )
+
+
+def process_typed_data_jsonl(
+        source: Union[str, os.PathLike, IO[str]],
+        destination: Union[str, os.PathLike, IO[str]],
+        private_key: Optional[PrivateKey] = None,
+        *,
+        max_workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    r"""
+    Hash, and optionally sign, a JSONL file of structured data documents.
+
+    For every input document, one JSON record is written to ``destination``, in order:
+    ``{"digest": "0x..."}``, plus ``"signature": "0x..."`` if a ``private_key`` is given.
+
+    .. code-block:: python
+
+        >>> import sys
+        >>> process_typed_data_jsonl(sys.stdin, sys.stdout, key)  # doctest: +SKIP
+
+    :param source: a path, or a text file object such as :data:`sys.stdin`
+    :param destination: a path, or a text file object such as :data:`sys.stdout`
+    :param private_key: the key to sign the documents with, or None to only hash them
+    :param int max_workers: work in a process pool of this size, instead of in the
+        current process
+    :param int chunk_size: number of lines sent to a worker at a time
+    :returns: the number of records written
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'r') as source_file:
+            return process_typed_data_jsonl(
+                source_file,
+                destination,
+                private_key,
+                max_workers=max_workers,
+                chunk_size=chunk_size,
+            )
+    if isinstance(destination, (str, os.PathLike)):
+        with open(destination, 'w') as destination_file:
+            return process_typed_data_jsonl(
+                source,
+                destination_file,
+                private_key,
+                max_workers=max_workers,
+                chunk_size=chunk_size,
+            )
+
+    records: Iterator[dict]
+    if private_key is None:
+        records = (
+            {"digest": message_hash.hex()}
+            for message_hash in hash_typed_data_lines(
+                source, max_workers=max_workers, chunk_size=chunk_size
+            )
+        )
+    else:
+        records = (
+            {"digest": signed.messageHash.hex(), "signature": signed.signature.hex()}
+            for signed in sign_typed_data_lines(
+                source, private_key, max_workers=max_workers, chunk_size=chunk_size
+            )
+        )
+
+    count = 0
+    for record in records:
+        destination.write(json.dumps(record) + '\n')
+        count += 1
+    return count
@@ -4,6 +4,7 @@ from hypothesis import (
     given,
     strategies as st,
 )
+import io
 import os
 import pytest
 
@@ -25,10 +26,19 @@ from eth_utils import (
 from hexbytes import (
     HexBytes,
 )
+import rlp
 
 from newchain_account import (
     Account,
 )
+from newchain_account._utils.legacy_transactions import (
+    Transaction,
+    vrs_from,
+)
+from newchain_account._utils.signing import (
+    hash_and_vrs_of_signed_legacy_transaction,
+    hash_of_signed_transaction,
+)
 from newchain_account.messages import (
     defunct_hash_message,
     encode_defunct,
@@ -419,6 +429,71 @@ def test_sign_message_against_sign_hash_as_hex(keyed_acct, message_bytes):
     assert signed_via_hash_hex == signed_via_message_hex
 
 
+@given(st.binary())
+def test_sign_defunct_stream_against_sign_message(acct, message_bytes):
+    signed_via_message = acct.sign_message(encode_defunct(message_bytes), PRIVATE_KEY_AS_BYTES)
+    signed_via_stream = acct.sign_defunct_stream(
+        io.BytesIO(message_bytes),
+        PRIVATE_KEY_AS_BYTES,
+        chunk_size=3,
+    )
+    assert signed_via_stream == signed_via_message
+
+
+@pytest.mark.parametrize('max_workers', (None, 2))
+def test_sign_messages(acct, max_workers):
+    messages = [
+        encode_defunct(text='Some data'),
+        encode_defunct(hexstr='0x00ff'),
+        encode_intended_validator(
+            '0x5ce9454909639D2D17A3F753ce7d93fa0b9aB12E',
+            text='Some data',
+        ),
+    ]
+    expected = [acct.sign_message(message, PRIVATE_KEY_AS_BYTES) for message in messages]
+
+    signed = acct.sign_messages(
+        messages,
+        PRIVATE_KEY_AS_HEXSTR,
+        max_workers=max_workers,
+        chunk_size=2,
+    )
+    assert signed == expected
+
+    streamed = acct.sign_messages(iter(messages), PRIVATE_KEY_AS_BYTES, stream=True)
+    assert not isinstance(streamed, list)
+    assert list(streamed) == expected
+
+
+@pytest.mark.parametrize('max_workers', (None, 2))
+def test_sign_message_with_keys(acct, max_workers):
+    message = encode_defunct(text='Some data')
+    private_keys = [
+        PRIVATE_KEY_AS_BYTES,
+        PRIVATE_KEY_AS_HEXSTR_ALT,
+        PRIVATE_KEY_AS_OBJ,
+        acct.from_key(b'\x01' * 32),
+    ]
+
+    signed = acct.sign_message_with_keys(
+        message,
+        private_keys,
+        max_workers=max_workers,
+        chunk_size=1,
+    )
+
+    expected_keys = [PRIVATE_KEY_AS_BYTES, PRIVATE_KEY_AS_BYTES_ALT, b'\x01' * 32]
+    assert signed == {
+        acct.from_key(key).address: acct.sign_message(message, key) for key in expected_keys
+    }
+    assert list(signed) == [acct.from_key(key).address for key in expected_keys]
+
+
+def test_sign_message_with_keys_rejects_short_key(acct):
+    with pytest.raises(ValueError, match="exactly 32 bytes long, instead of 31 bytes"):
+        acct.sign_message_with_keys(encode_defunct(text='Some data'), [b'\x01' * 31])
+
+
 @pytest.mark.parametrize(
     'message, key, expected_bytes, expected_hash, v, r, s, signature',
     (
@@ -635,6 +710,39 @@ def test_newchain_account_recover_transaction_from_eth_test(acct, transaction):
     assert acct.recover_transaction(raw_txn) == expected_sender
 
 
+@pytest.mark.parametrize(
+    'transaction',
+    [txn for txn in ETH_TEST_TRANSACTIONS if 'type' not in txn and 'chainId' in txn],
+)
+@pytest.mark.parametrize('chain_id', (None, 0, 1007))
+def test_hash_and_vrs_of_signed_legacy_transaction(transaction, chain_id):
+    txn = Transaction.from_bytes(HexBytes(transaction['signed']))
+    if chain_id is not None:
+        # re-sign with an EIP-155 v, to cover the chain-aware signing hash
+        txn = txn.copy(v=35 + 2 * chain_id + txn.v - 27)
+    raw_txn = rlp.encode(txn)
+
+    assert hash_and_vrs_of_signed_legacy_transaction(raw_txn) == (
+        hash_of_signed_transaction(txn),
+        tuple(vrs_from(txn)),
+    )
+
+
+@pytest.mark.parametrize(
+    'raw_txn',
+    (
+        b'',
+        b'\x80',
+        rlp.encode([b'\x01'] * 8),
+        rlp.encode([b'\x00\x01'] + [b'\x01'] * 8),
+        rlp.encode([b'\x01'] * 3 + [b'\x01' * 19] + [b'\x01'] * 5),
+        rlp.encode([b'\x01'] * 9) + b'\x00',
+    ),
+)
+def test_hash_and_vrs_of_signed_legacy_transaction_rejects_invalid(raw_txn):
+    assert hash_and_vrs_of_signed_legacy_transaction(raw_txn) is None
+
+
 def get_encrypt_test_params():
     """
     Params for testing Account#encrypt. Due to not being able to provide fixtures to
@@ -792,3 +900,85 @@ def test_newchain_account_prepared_encrypt(
 
     assert isinstance(decrypted_key, HexBytes)
     assert decrypted_key == expected_decrypted_key
+
+
+@pytest.mark.parametrize('max_workers', (None, 2))
+def test_newchain_account_recover_message_signers(acct, max_workers):
+    message = encode_defunct(text="I♥SF")
+    private_keys = (PRIVATE_KEY_AS_BYTES, PRIVATE_KEY_AS_BYTES_ALT, b'\x01' * 32)
+    signatures = [acct.sign_message(message, key).signature for key in private_keys]
+    expected = [acct.recover_message(message, signature=sig) for sig in signatures]
+
+    signers = acct.recover_message_signers(
+        message,
+        [signatures[0].hex(), signatures[1], bytes(signatures[2])],
+        max_workers=max_workers,
+        chunk_size=2,
+    )
+    assert signers == expected
+
+    signers_to_signatures = acct.recover_message_signers(message, signatures, as_mapping=True)
+    assert signers_to_signatures == dict(zip(expected, signatures))
+    assert acct.recover_message_signers(message, []) == []
+
+
+@pytest.mark.parametrize(
+    'transaction',
+    (
+        {
+            'to': (
+                b'\xf0\x10\x9f\xc8\xdf\x28\x30\x27\xb6\x28'
+                b'\x5c\xc8\x89\xf5\xaa\x62\x4e\xac\x1f\x55'
+            ),
+            'value': 1000000000,
+            'gas': 2000000,
+            'gasPrice': 234567897654321,
+            'nonce': 0,
+            'chainId': 1007,
+            'data': b'',
+        },
+        {
+            'to': b'',
+            'value': 0,
+            'gas': 2000000,
+            'gasPrice': 234567897654321,
+            'nonce': 1,
+            'chainId': None,
+            'data': b'\x60\x60',
+        },
+        {
+            'type': 2,
+            'to': (
+                b'\x09\x61\x6c\x3d\x61\xb3\x33\x1f\xc4\x10'
+                b'\x9a\x9e\x41\xa8\xbd\xb7\xd9\x77\x66\x09'
+            ),
+            'value': 100000000000000,
+            'gas': 100000,
+            'maxFeePerGas': 2000000000,
+            'maxPriorityFeePerGas': 2000000000,
+            'nonce': 34,
+            'chainId': 1007,
+            'data': b'abcdef',
+            'accessList': ({'address': b'\x00' * 19 + b'\x01', 'storageKeys': (1, 2)},),
+        },
+        {
+            'type': '0x1',
+            'to': (
+                b'\x09\x61\x6c\x3d\x61\xb3\x33\x1f\xc4\x10'
+                b'\x9a\x9e\x41\xa8\xbd\xb7\xd9\x77\x66\x09'
+            ),
+            'value': 100000000000000,
+            'gas': 100000,
+            'gasPrice': 1000000000,
+            'nonce': 34,
+            'chainId': 1007,
+            'data': b'abcdef',
+            'accessList': (),
+        },
+    ),
+)
+def test_newchain_account_sign_transaction_without_validation(acct, transaction):
+    signed = acct.sign_transaction(transaction, PRIVATE_KEY_AS_BYTES)
+    assert acct.sign_transaction(transaction, PRIVATE_KEY_AS_BYTES, validate=False) == signed
+    keyed_account = acct.from_key(PRIVATE_KEY_AS_BYTES)
+    assert keyed_account.sign_transaction(transaction, validate=False) == signed
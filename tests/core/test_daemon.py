@@ -0,0 +1,310 @@
+import http.client
+import json
+import os
+import pytest
+import socket
+import stat
+from urllib.parse import (
+    urlsplit,
+)
+
+from hexbytes import (
+    HexBytes,
+)
+
+from newchain_account import (
+    Account,
+)
+import newchain_account.daemon as daemon_module
+from newchain_account.daemon import (
+    INVALID_PARAMS,
+    INVALID_REQUEST,
+    METHOD_NOT_FOUND,
+    PARSE_ERROR,
+    SERVER_SHUTTING_DOWN,
+    UNKNOWN_ACCOUNT,
+    SigningDaemon,
+    _Connection,
+    benchmark,
+    main,
+)
+from newchain_account.messages import (
+    encode_defunct,
+    encode_structured_data,
+)
+
+TRANSACTION = {
+    'to': '0xF0109fC8DF283027b6285cc889F5aA624EaC1F55',
+    'value': '0x3b9aca00',
+    'gas': '0x7530',
+    'gasPrice': '0x3b9aca00',
+    'nonce': '0x0',
+    'chainId': '0x3f4',
+}
+
+
+@pytest.fixture(scope='module')
+def accounts():
+    return [Account.from_key(bytes([index]) * 32) for index in (1, 2)]
+
+
+@pytest.fixture(scope='module', params=(None, 2), ids=('in-process', 'worker-pool'))
+def daemon(request, accounts):
+    with SigningDaemon(accounts, max_workers=request.param) as daemon:
+        yield daemon
+
+
+@pytest.fixture(params=('unix', 'http'))
+def endpoint(request, daemon, tmp_path):
+    if request.param == 'unix':
+        return daemon.listen_unix(tmp_path / 'signer.sock')
+    return daemon.listen_http()
+
+
+def rpc(connection, method, *params, request_id=1):
+    return json.loads(connection.call(json.dumps({
+        'jsonrpc': '2.0',
+        'id': request_id,
+        'method': method,
+        'params': list(params),
+    }).encode('utf-8')))
+
+
+@pytest.fixture
+def connection(endpoint):
+    connection = _Connection(endpoint, timeout=30)
+    yield connection
+    connection.close()
+
+
+def test_signing_methods(connection, accounts):
+    account = accounts[1]
+    assert rpc(connection, 'eth_accounts')['result'] == [acct.address for acct in accounts]
+
+    signature = account.sign_message(encode_defunct(text='I♥SF')).signature.hex()
+    hex_data = HexBytes('I♥SF'.encode('utf-8')).hex()
+    assert rpc(connection, 'eth_sign', account.address, hex_data)['result'] == signature
+    assert rpc(connection, 'personal_sign', hex_data, account.address)['result'] == signature
+    assert rpc(connection, 'personal_sign', 'I♥SF', account.address, '')['result'] == signature
+
+    structured_data = json.loads(open('tests/fixtures/valid_eip712_example.json').read())
+    signature = account.sign_message(encode_structured_data(structured_data)).signature.hex()
+    for typed_data in (structured_data, json.dumps(structured_data)):
+        response = rpc(connection, 'eth_signTypedData', account.address, typed_data)
+        assert response['result'] == signature
+
+    signed = account.sign_transaction(TRANSACTION)
+    response = rpc(connection, 'eth_signTransaction', dict(TRANSACTION, **{
+        'from': account.address.lower(),
+    }))
+    assert response == {
+        'jsonrpc': '2.0',
+        'id': 1,
+        'result': {
+            'raw': signed.rawTransaction.hex(),
+            'tx': {
+                'hash': signed.hash.hex(),
+                'r': hex(signed.r),
+                's': hex(signed.s),
+                'v': hex(signed.v),
+            },
+        },
+    }
+
+
+def test_batch_and_notifications(connection, accounts):
+    hex_data = HexBytes(b'batch').hex()
+    batch = [
+        {'jsonrpc': '2.0', 'id': index, 'method': 'eth_sign', 'params': [acct.address, hex_data]}
+        for index, acct in enumerate(accounts * 3)
+    ]
+    batch.append({'jsonrpc': '2.0', 'method': 'eth_sign', 'params': [accounts[0].address]})
+    batch.append({'jsonrpc': '2.0', 'id': 'bad', 'method': 'eth_sendTransaction'})
+    batch.append(42)
+
+    responses = json.loads(connection.call(json.dumps(batch).encode('utf-8')))
+
+    assert len(responses) == 8
+    for index, acct in enumerate(accounts * 3):
+        assert responses[index] == {
+            'jsonrpc': '2.0',
+            'id': index,
+            'result': acct.sign_message(encode_defunct(b'batch')).signature.hex(),
+        }
+    assert responses[6]['id'] == 'bad'
+    assert responses[6]['error']['code'] == METHOD_NOT_FOUND
+    assert responses[7] == {
+        'jsonrpc': '2.0',
+        'id': None,
+        'error': {'code': INVALID_REQUEST, 'message': 'Invalid request'},
+    }
+    assert rpc(connection, 'eth_accounts', request_id='after')['id'] == 'after'
+
+
+@pytest.mark.parametrize(
+    'payload, code',
+    (
+        (b'{"jsonrpc": "2.0", "id": 1, "method"', PARSE_ERROR),
+        (b'[]', INVALID_REQUEST),
+        (b'{"id": 1, "method": "eth_accounts"}', INVALID_REQUEST),
+        (b'{"jsonrpc": "2.0", "id": 1, "method": "eth_sign", "params": {}}', INVALID_PARAMS),
+        (b'{"jsonrpc": "2.0", "id": 1, "method": "eth_sign", "params": ["0x12"]}', INVALID_PARAMS),
+        (
+            b'{"jsonrpc": "2.0", "id": 1, "method": "eth_sign",'
+            b' "params": ["0xF0109fC8DF283027b6285cc889F5aA624EaC1F55", "0x00"]}',
+            UNKNOWN_ACCOUNT,
+        ),
+        (b'{"jsonrpc": "2.0", "id": 1, "method": "eth_signTransaction", "params": [{}]}', INVALID_PARAMS),  # noqa: E501
+        (
+            b'{"jsonrpc": "2.0", "id": 1, "method": "newchain_signMessage",'
+            b' "params": ["0x1a642f0E3c3aF545E7AcBD38b07251B3990914F1", {"body": "0x00"}]}',
+            INVALID_PARAMS,
+        ),
+    ),
+)
+def test_errors(daemon, payload, code):
+    assert json.loads(daemon.handle_request(payload))['error']['code'] == code
+
+
+def test_unix_socket_is_private_from_the_start(daemon, tmp_path, monkeypatch):
+    # without the chmod after bind, the socket must already be private when it is created
+    monkeypatch.setattr(daemon_module.os, 'chmod', lambda path, mode: None)
+    old_umask = os.umask(0o022)
+    try:
+        path = daemon.listen_unix(tmp_path / 'private.sock')
+        assert os.umask(0o022) == 0o022
+    finally:
+        os.umask(old_umask)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+
+def test_unix_socket_pipelining(daemon, accounts, tmp_path):
+    path = daemon.listen_unix(tmp_path / 'signer.sock')
+    hex_data = HexBytes(b'pipelined').hex()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(path)
+        client.sendall(b''.join(
+            json.dumps({
+                'jsonrpc': '2.0',
+                'id': index,
+                'method': 'eth_sign',
+                'params': [accounts[index % 2].address, hex_data],
+            }).encode('utf-8') + b'\n'
+            for index in range(10)
+        ))
+        client.shutdown(socket.SHUT_WR)
+        with client.makefile('rb') as responses:
+            results = {
+                response['id']: response['result']
+                for response in map(json.loads, responses)
+            }
+
+    assert results == {
+        index: accounts[index % 2].sign_message(encode_defunct(b'pipelined')).signature.hex()
+        for index in range(10)
+    }
+
+
+def test_close_ends_open_connections(accounts, tmp_path):
+    daemon = SigningDaemon(accounts, max_concurrent_requests=2)
+    connection = _Connection(daemon.listen_unix(tmp_path / 'signer.sock'), timeout=30)
+    try:
+        assert rpc(connection, 'eth_accounts')['result'] == [acct.address for acct in accounts]
+        daemon.close()
+        # the connection was ended, rather than left to a thread which outlives the daemon
+        assert connection._reader.readline() == b''
+    finally:
+        connection.close()
+        daemon.close()
+
+    # a request read while closing is refused, and does not keep a request slot
+    responses = []
+    for closing in (True, False):
+        daemon._closing = closing
+        daemon._dispatch(
+            b'[{"jsonrpc": "2.0", "id": 3, "method": "eth_accounts"},'
+            b' {"jsonrpc": "2.0", "method": "eth_accounts"}]',
+            responses.append,
+        ).result(timeout=1)
+    expected = [{
+        'jsonrpc': '2.0',
+        'id': 3,
+        'error': {'code': SERVER_SHUTTING_DOWN, 'message': 'Server shutting down'},
+    }]
+    assert [json.loads(response) for response in responses] == [expected, expected]
+    assert daemon._request_slots._value == 2
+
+
+def test_http_only_listens_on_loopback(daemon):
+    with pytest.raises(ValueError, match="loopback"):
+        daemon.listen_http('0.0.0.0')
+
+
+def http_status(endpoint, headers, body=b''):
+    url = urlsplit(endpoint)
+    client = http.client.HTTPConnection(url.hostname, url.port, timeout=30)
+    try:
+        client.putrequest('POST', '/', skip_host=True, skip_accept_encoding=True)
+        for name, value in headers.items():
+            client.putheader(name, value)
+        client.endheaders(body)
+        return client.getresponse().status
+    finally:
+        client.close()
+
+
+def test_http_rejects_requests_a_web_page_could_forge(daemon):
+    endpoint = daemon.listen_http()
+    port = urlsplit(endpoint).port
+    body = b'{"jsonrpc": "2.0", "id": 1, "method": "eth_accounts"}'
+    headers = {
+        'Host': '127.0.0.1:%d' % port,
+        'Content-Type': 'application/json',
+        'Content-Length': str(len(body)),
+    }
+    assert http_status(endpoint, headers, body) == 200
+    for host in ('localhost:%d' % port, '[::1]:%d' % port, 'LOCALHOST:%d' % port):
+        assert http_status(endpoint, dict(headers, Host=host), body) == 200
+    assert http_status(
+        endpoint, dict(headers, **{'Content-Type': 'application/json; charset=utf-8'}), body,
+    ) == 200
+
+    # DNS rebinding: the page's own name, or another port
+    for host in ('attacker.example:%d' % port, '127.0.0.1', '127.0.0.1:0'):
+        assert http_status(endpoint, dict(headers, Host=host), body) == 403
+    without_host = {name: value for name, value in headers.items() if name != 'Host'}
+    assert http_status(endpoint, without_host, body) == 403
+
+    # cross-origin simple requests cannot be application/json
+    for content_type in ('text/plain', 'application/x-www-form-urlencoded'):
+        assert http_status(
+            endpoint, dict(headers, **{'Content-Type': content_type}), body,
+        ) == 415
+    without_type = {name: value for name, value in headers.items() if name != 'Content-Type'}
+    assert http_status(endpoint, without_type, body) == 415
+
+    without_length = {name: value for name, value in headers.items() if name != 'Content-Length'}
+    assert http_status(endpoint, without_length) == 411
+    for length in ('', 'ten', '-1', '+5', '1_0'):
+        assert http_status(endpoint, dict(headers, **{'Content-Length': length})) == 400
+
+
+@pytest.mark.parametrize('batch_size', (1, 4))
+def test_benchmark(endpoint, accounts, batch_size):
+    result = benchmark(
+        endpoint,
+        'personal_sign',
+        [HexBytes(b'benchmark').hex(), accounts[0].address],
+        requests=10,
+        concurrency=3,
+        batch_size=batch_size,
+    )
+    assert result.requests == (12 if batch_size == 4 else 10)
+    assert result.errors == 0
+    assert result.requests_per_second > 0
+    assert 0 < result.p50_latency <= result.p99_latency
+
+
+def test_benchmark_command(endpoint, capsys):
+    main(['bench', endpoint, '--requests', '4', '--concurrency', '2'])
+    assert "4 requests in" in capsys.readouterr().out
@@ -0,0 +1,80 @@
+import pytest
+
+from newchain_account import (
+    Account,
+)
+from newchain_account.hdaccount import (
+    key_from_seed,
+    seed_from_mnemonic,
+)
+from newchain_account.signers.hd import (
+    HDWallet,
+)
+
+Account.enable_unaudited_hdwallet_features()
+
+MNEMONIC = "finish oppose decorate face calm tragic certain desk hour urge dinosaur mango"
+
+
+@pytest.mark.parametrize("path", (
+    "m",
+    "m/0H",
+    "m/0H/1/2H/2/1000000000",
+    "m/44'/60'/0'/0/0",
+    "m/44'/60'/0'/1/7",
+))
+def test_derive_key_matches_path_derivation(path):
+    seed = bytes.fromhex("000102030405060708090a0b0c0d0e0f")
+    wallet = HDWallet(seed)
+    assert wallet.derive_key(path) == key_from_seed(seed, path)
+    # and again, from the cached ancestors
+    assert wallet.derive_key(path) == key_from_seed(seed, path)
+
+
+def test_derive_account_matches_from_mnemonic():
+    wallet = HDWallet.from_mnemonic(MNEMONIC, chain_id=1007)
+    for index in range(3):
+        path = f"m/44'/60'/0'/0/{index}"
+        account = wallet.derive_account(path)
+        expected = Account.from_mnemonic(MNEMONIC, account_path=path, chain_id=1007)
+        assert account.address == expected.address
+        assert account.key == expected.key
+        assert account.new_address == expected.new_address
+
+
+def test_siblings_reuse_the_cached_parent():
+    wallet = HDWallet(seed_from_mnemonic(MNEMONIC, ""), cache_size=3)
+    wallet.derive_key("m/44'/60'/0'/0/0")
+    assert list(wallet._cache) == [
+        ('44H', '60H'),
+        ('44H', '60H', '0H'),
+        ('44H', '60H', '0H', '0'),
+    ]
+    parent = wallet._cache[('44H', '60H', '0H', '0')]
+    assert parent._point is not None
+
+    wallet.derive_key("m/44'/60'/0'/0/1")
+    assert wallet._cache[('44H', '60H', '0H', '0')] is parent
+
+    wallet.derive_key("m/44'/60'/1'/0/0")
+    assert list(wallet._cache) == [
+        ('44H', '60H'),
+        ('44H', '60H', '1H'),
+        ('44H', '60H', '1H', '0'),
+    ]
+
+
+def test_disabled_cache():
+    wallet = HDWallet(b'\x01' * 16, cache_size=0)
+    assert wallet.derive_key("m/1/2/3") == key_from_seed(b'\x01' * 16, "m/1/2/3")
+    assert not wallet._cache
+    with pytest.raises(ValueError, match="negative"):
+        HDWallet(b'\x01' * 16, cache_size=-1)
+
+
+def test_refused_until_unaudited_features_are_enabled(monkeypatch):
+    monkeypatch.setattr(Account, '_use_unaudited_hdwallet_features', False)
+    with pytest.raises(AttributeError, match="enable_unaudited_hdwallet_features"):
+        HDWallet.from_mnemonic(MNEMONIC)
+    with pytest.raises(AttributeError, match="enable_unaudited_hdwallet_features"):
+        HDWallet(b'\x01' * 16)
@@ -92,3 +92,45 @@ def test_bad_account_path2():
 def test_unknown_language():
     with pytest.raises(ValidationError, match="Invalid language choice.*"):
         Account.create_with_mnemonic(language="pig latin")
+
+
+@pytest.mark.parametrize("max_workers, chunk_size", ((None, 256), (2, 2)))
+def test_from_mnemonic_range(max_workers, chunk_size):
+    mnemonic = "finish oppose decorate face calm tragic certain desk hour urge dinosaur mango"
+    expected = [
+        Account.from_mnemonic(mnemonic, account_path=f"m/44'/60'/0'/0/{index}", chain_id=1007)
+        for index in range(5, 10)
+    ]
+    accounts = list(Account.from_mnemonic_range(
+        mnemonic,
+        "m/44'/60'/0'/0",
+        5,
+        5,
+        chain_id=1007,
+        max_workers=max_workers,
+        chunk_size=chunk_size,
+    ))
+    assert [(acct.key, acct.new_address) for acct in accounts] == [
+        (acct.key, acct.new_address) for acct in expected
+    ]
+    addresses = Account.from_mnemonic_range(
+        mnemonic,
+        "m/44'/60'/0'/0",
+        5,
+        5,
+        addresses_only=True,
+        max_workers=max_workers,
+        chunk_size=chunk_size,
+    )
+    assert list(addresses) == [acct.address for acct in expected]
+
+
+@pytest.mark.parametrize("start, count", ((-1, 2), (2 ** 31 - 1, 2)))
+def test_from_mnemonic_range_rejects_hardened_indices(start, count):
+    with pytest.raises(ValidationError, match="soft indices"):
+        Account.from_mnemonic_range(
+            "finish oppose decorate face calm tragic certain desk hour urge dinosaur mango",
+            "m/44'/60'/0'/0",
+            start,
+            count,
+        )
@@ -1,3 +1,5 @@
+import io
+import mmap
 import pytest
 
 from eth_utils import (
@@ -5,8 +7,12 @@ from eth_utils import (
 )
 
 from newchain_account.messages import (
+    MessageHasher,
     SignableMessage,
+    _hash_eip191_message,
+    encode_defunct,
     encode_intended_validator,
+    hash_defunct_stream,
 )
 
 
@@ -51,3 +57,88 @@ def test_encode_intended_validator(primitive, hexstr, text, validator_address, e
 def test_encode_intended_validator_invalid_address(invalid_address):
     with pytest.raises(ValidationError):
         encode_intended_validator(invalid_address, b'')
+
+
+@pytest.mark.parametrize('message', (b'', b'\x19', b'I\xe2\x99\xa5SF', bytes(range(256)) * 40))
+def test_hash_defunct_stream(tmp_path, message):
+    expected = _hash_eip191_message(encode_defunct(message))
+    path = tmp_path / 'message.bin'
+    path.write_bytes(message)
+
+    assert hash_defunct_stream(path, chunk_size=7) == expected
+    assert hash_defunct_stream(str(path)) == expected
+    assert hash_defunct_stream(message, chunk_size=1000) == expected
+    with open(path, 'rb') as message_file:
+        assert hash_defunct_stream(message_file, chunk_size=1000) == expected
+    if message:
+        with open(path, 'rb') as message_file, mmap.mmap(
+                message_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            assert hash_defunct_stream(mapped, chunk_size=1000) == expected
+
+
+def test_hash_defunct_stream_of_buffer_prefix():
+    message = b'abcdefghij'
+    expected = _hash_eip191_message(encode_defunct(message[:5]))
+    assert hash_defunct_stream(io.BytesIO(message), length=5, chunk_size=4) == expected
+    for buffer in (message, bytearray(message), memoryview(message)):
+        assert hash_defunct_stream(buffer, length=5, chunk_size=4) == expected
+    with pytest.raises(ValueError, match="Message has 10 bytes, fewer than its length of 11"):
+        hash_defunct_stream(message, length=11)
+
+
+def test_hash_defunct_stream_of_file_objects():
+    message = b'prefix, then the message'
+    expected = _hash_eip191_message(encode_defunct(message[8:]))
+
+    stream = io.BytesIO(message)
+    stream.seek(8)
+    assert hash_defunct_stream(stream) == expected
+
+    class Pipe(io.RawIOBase):
+        def __init__(self, data):
+            self.data = io.BytesIO(data)
+
+        def readable(self):
+            return True
+
+        def readinto(self, buffer):
+            return self.data.readinto(buffer)
+
+    with pytest.raises(ValueError, match="unknown length"):
+        hash_defunct_stream(Pipe(message[8:]))
+    assert hash_defunct_stream(Pipe(message[8:]), length=len(message) - 8) == expected
+    with pytest.raises(ValueError, match="Message ended after 16 of its 17 bytes"):
+        hash_defunct_stream(Pipe(message[8:]), length=len(message) - 7)
+
+
+@pytest.mark.parametrize('body', (b'', b'vote: yes', bytes(range(256)) * 3))
+def test_message_hasher(body):
+    validator = '0xFFfFfFffFFfffFFfFFfFFFFFffFFFffffFfFFFfF'
+    hasher = MessageHasher.for_intended_validator(validator)
+    signable_message = encode_intended_validator(validator, body)
+    expected = _hash_eip191_message(signable_message)
+    assert hasher.hash(body) == expected
+    assert hasher.hash_message(signable_message) == expected
+
+    defunct_hasher = MessageHasher.for_defunct(len(body))
+    assert defunct_hasher.hash(body) == _hash_eip191_message(encode_defunct(body))
+    with pytest.raises(ValueError, match="got %d bytes" % (len(body) + 1)):
+        defunct_hasher.hash(body + b'!')
+    with pytest.raises(ValueError, match="do not match"):
+        defunct_hasher.hash_message(signable_message)
+
+
+def test_message_hasher_with_long_prefix():
+    # a header longer than one keccak block is absorbed once, and reused from a copy
+    hasher = MessageHasher(b'\x7f', b'\x01' * 200)
+    assert hasher._prefix_state is not None
+    for body in (b'', b'first', b'second'):
+        expected = _hash_eip191_message(SignableMessage(b'\x7f', b'\x01' * 200, body))
+        assert hasher.hash(body) == expected
+
+
+def test_message_hasher_invalid_arguments():
+    with pytest.raises(ValidationError, match="one-byte versions"):
+        MessageHasher(b'EE')
+    with pytest.raises(ValidationError):
+        MessageHasher.for_intended_validator('0xffffffffffffffffffffffffffffffffffffffff')
@@ -0,0 +1,274 @@
+import asyncio
+from concurrent.futures import (
+    Future,
+)
+import pytest
+import socket
+import threading
+import time
+
+from newchain_account import (
+    Account,
+)
+from newchain_account.daemon import (
+    UNKNOWN_ACCOUNT,
+    JSONRPCError,
+    SigningDaemon,
+)
+from newchain_account.messages import (
+    SignableMessage,
+    encode_defunct,
+    encode_intended_validator,
+)
+from newchain_account.signers.remote import (
+    RemoteAccount,
+    RemoteSigner,
+    RemoteSignerError,
+    _Call,
+    _UnixConnection,
+)
+
+TRANSACTION = {
+    'to': '0xF0109fC8DF283027b6285cc889F5aA624EaC1F55',
+    'value': 10 ** 9,
+    'gas': 30000,
+    'gasPrice': 10 ** 9,
+    'nonce': 0,
+    'chainId': 1012,
+    'data': b'\x01\x02',
+}
+
+
+@pytest.fixture(scope='module')
+def local_account():
+    return Account.from_key(b'\x01' * 32)
+
+
+@pytest.fixture(scope='module')
+def daemon(local_account):
+    with SigningDaemon([local_account]) as daemon:
+        yield daemon
+
+
+@pytest.fixture(params=('unix', 'http'))
+def endpoint(request, daemon, tmp_path):
+    if request.param == 'unix':
+        return daemon.listen_unix(tmp_path / 'signer.sock')
+    return daemon.listen_http()
+
+
+@pytest.fixture
+def signer(endpoint):
+    with RemoteSigner(endpoint, max_connections=2, max_batch_size=8) as signer:
+        yield signer
+
+
+@pytest.fixture
+def remote_account(signer, local_account):
+    return RemoteAccount(local_account.address.lower(), signer)
+
+
+@pytest.mark.parametrize(
+    'signable_message',
+    (
+        encode_defunct(text='I♥SF'),
+        encode_intended_validator('0xF0109fC8DF283027b6285cc889F5aA624EaC1F55', b'vote'),
+        SignableMessage(b'E', b'not the length header', b'body'),
+    ),
+)
+def test_remote_sign_message(remote_account, local_account, signable_message):
+    assert remote_account.address == local_account.address
+    assert remote_account.sign_message(signable_message) == (
+        local_account.sign_message(signable_message)
+    )
+
+
+def test_remote_sign_transaction(remote_account, local_account):
+    assert remote_account.sign_transaction(TRANSACTION) == (
+        local_account.sign_transaction(TRANSACTION)
+    )
+
+
+def test_remote_sign_transaction_checks_from(remote_account, local_account):
+    transaction = dict(TRANSACTION, **{'from': local_account.address})
+    assert remote_account.sign_transaction(transaction) == (
+        local_account.sign_transaction(transaction)
+    )
+    with pytest.raises(TypeError, match="from field must match"):
+        remote_account.sign_transaction(dict(TRANSACTION, **{
+            'from': '0xF0109fC8DF283027b6285cc889F5aA624EaC1F55',
+        }))
+
+
+def test_many_outstanding_signatures_share_connections(signer, remote_account, local_account):
+    messages = [encode_defunct(text='message %d' % index) for index in range(60)]
+    futures = [remote_account.sign_message_future(message) for message in messages]
+    assert [future.result() for future in futures] == [
+        local_account.sign_message(message) for message in messages
+    ]
+    assert len(signer._connections) == 2
+    assert remote_account.sign_messages(messages[:3]) == [future.result() for future in futures[:3]]
+
+
+def test_remote_signing_async(remote_account, local_account):
+    messages = [encode_defunct(text='async %d' % index) for index in range(10)]
+
+    async def sign_all():
+        return await asyncio.gather(
+            remote_account.sign_transaction_async(TRANSACTION),
+            *(remote_account.sign_message_async(message) for message in messages),
+        )
+
+    signed_transaction, *signed_messages = asyncio.run(sign_all())
+    assert signed_transaction == local_account.sign_transaction(TRANSACTION)
+    assert signed_messages == [local_account.sign_message(message) for message in messages]
+
+
+def test_remote_errors(signer):
+    unknown = RemoteAccount('0xF0109fC8DF283027b6285cc889F5aA624EaC1F55', signer)
+    with pytest.raises(JSONRPCError) as excinfo:
+        unknown.sign_message(encode_defunct(text='I♥SF'))
+    assert excinfo.value.code == UNKNOWN_ACCOUNT
+
+
+def test_remote_sign_hash_is_refused(remote_account):
+    with pytest.raises(RemoteSignerError, match="Hash signing is not supported remotely"):
+        remote_account.signHash(b'\x00' * 32)
+
+
+def test_closed_signer_refuses_calls(endpoint, local_account):
+    signer = RemoteSigner(endpoint)
+    remote_account = RemoteAccount(local_account.address, signer)
+    assert remote_account.sign_message(encode_defunct(text='first'))
+    signer.close()
+    with pytest.raises(ConnectionError):
+        remote_account.sign_message(encode_defunct(text='second'))
+
+
+def test_call_racing_close_is_refused(endpoint, local_account, monkeypatch):
+    signer = RemoteSigner(endpoint, max_connections=1)
+    assert signer.call('eth_accounts', []) == [local_account.address]
+    # a call which saw every connection open, just before close() ran
+    monkeypatch.setattr(signer, '_ensure_connections', lambda: None)
+    signer.close()
+    with pytest.raises(ConnectionError, match="closed"):
+        signer.submit('eth_accounts', [])
+    assert signer._queue.empty()
+
+
+def test_lost_connection(tmp_path, local_account):
+    path = str(tmp_path / 'flaky.sock')
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen()
+
+    def hang_up():
+        connection, _ = listener.accept()
+        connection.recv(1024)
+        connection.close()
+
+    server = threading.Thread(target=hang_up)
+    server.start()
+    with RemoteSigner(path, max_connections=1) as signer:
+        remote_account = RemoteAccount(local_account.address, signer)
+        with pytest.raises(ConnectionError):
+            remote_account.sign_message(encode_defunct(text='lost'))
+    server.join()
+    listener.close()
+
+
+@pytest.mark.parametrize('transport', ('unix', 'http'))
+def test_unanswered_calls_time_out(tmp_path, local_account, transport):
+    if transport == 'unix':
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(str(tmp_path / 'silent.sock'))
+        endpoint = listener.getsockname()
+    else:
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(('127.0.0.1', 0))
+        endpoint = 'http://127.0.0.1:%d' % listener.getsockname()[1]
+    listener.listen()
+    answered = threading.Event()
+
+    def never_answer():
+        connection, _ = listener.accept()
+        connection.recv(1024)
+        answered.wait()
+        connection.close()
+
+    server = threading.Thread(target=never_answer)
+    server.start()
+    try:
+        with RemoteSigner(endpoint, max_connections=1, timeout=0.2) as signer:
+            remote_account = RemoteAccount(local_account.address, signer)
+            with pytest.raises(RemoteSignerError, match="did not answer within 0.2 seconds"):
+                remote_account.sign_message(encode_defunct(text='silence'))
+    finally:
+        answered.set()
+        server.join()
+        listener.close()
+
+
+def test_idle_connection_outlives_the_timeout(tmp_path, daemon, local_account):
+    endpoint = daemon.listen_unix(tmp_path / 'idle.sock')
+    with RemoteSigner(endpoint, max_connections=1, timeout=0.1) as signer:
+        assert signer.call('eth_accounts', []) == [local_account.address]
+        time.sleep(0.3)
+        assert signer.call('eth_accounts', []) == [local_account.address]
+
+
+def test_batch_of_cancelled_calls(endpoint, local_account):
+    with RemoteSigner(endpoint, max_connections=1, max_batch_size=1) as signer:
+        cancelled = Future()
+        cancelled.cancel()
+        # queued before the connection starts, so that it makes a batch on its own
+        signer._queue.put(_Call('eth_accounts', [], cancelled))
+        assert signer.call('eth_accounts', []) == [local_account.address]
+
+
+def test_reconnect_resets_the_pipeline():
+    connection = _UnixConnection(RemoteSigner('unused.sock', max_pipelined_batches=2))
+    stale, stale_peer = socket.socketpair()
+    current, current_peer = socket.socketpair()
+    connection._socket = current
+    future = Future()
+    connection._pending[5] = future
+    connection._pipelined_batches = 1
+
+    # a response read from the replaced connection leaves the new one alone
+    stale_peer.sendall(b'{"jsonrpc": "2.0", "id": 0, "result": "0x"}\n')
+    stale_peer.close()
+    connection._read(stale)
+    assert connection._pipelined_batches == 1
+    assert connection._pending == {5: future}
+
+    connection._disconnect(ConnectionError("reset"))
+    assert connection._pipelined_batches == 0
+    with pytest.raises(ConnectionError, match="reset"):
+        future.result(timeout=1)
+    for sock in (stale, current_peer):
+        sock.close()
+
+
+@pytest.mark.parametrize('reply', (b'[1]\n', b'"oops"\n', b'{"id": [1], "result": "0x"}\n'))
+def test_malformed_response(tmp_path, local_account, reply):
+    path = str(tmp_path / 'malformed.sock')
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen()
+
+    def reply_badly():
+        connection, _ = listener.accept()
+        connection.recv(1024)
+        connection.sendall(reply)
+        connection.recv(1024)
+        connection.close()
+
+    server = threading.Thread(target=reply_badly)
+    server.start()
+    with RemoteSigner(path, max_connections=1) as signer:
+        remote_account = RemoteAccount(local_account.address, signer)
+        with pytest.raises(RemoteSignerError, match="malformed response"):
+            remote_account.sign_message(encode_defunct(text='malformed'))
+    server.join()
+    listener.close()
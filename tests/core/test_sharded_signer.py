@@ -0,0 +1,84 @@
+import asyncio
+import pytest
+
+from newchain_account import (
+    Account,
+)
+from newchain_account.messages import (
+    encode_defunct,
+)
+from newchain_account.signers.sharded import (
+    ShardedSigner,
+    _shard_addresses,
+)
+
+TRANSACTION = {
+    'to': '0xF0109fC8DF283027b6285cc889F5aA624EaC1F55',
+    'value': 10 ** 9,
+    'gas': 30000,
+    'gasPrice': 10 ** 9,
+    'nonce': 0,
+    'chainId': 1012,
+}
+
+
+@pytest.fixture(scope='module')
+def accounts():
+    return [Account.from_key(bytes([index]) * 32) for index in range(1, 6)]
+
+
+@pytest.fixture(scope='module')
+def signer(accounts):
+    with ShardedSigner(accounts + accounts[:1], shards=2) as signer:
+        yield signer
+
+
+def test_each_account_lives_in_one_worker(signer, accounts):
+    assert signer.addresses == [account.address for account in accounts]
+    shards = [executor.submit(_shard_addresses).result() for executor in signer._executors]
+    assert shards == [
+        sorted(account.address for account in accounts[0::2]),
+        sorted(account.address for account in accounts[1::2]),
+    ]
+
+
+def test_requests_are_routed_by_address(signer, accounts):
+    message = encode_defunct(text='I♥SF')
+    futures = [signer.submit_message(account.address.lower(), message) for account in accounts]
+    assert [future.result() for future in futures] == [
+        account.sign_message(message) for account in accounts
+    ]
+    assert signer.sign_transaction(accounts[3].address, TRANSACTION) == (
+        accounts[3].sign_transaction(TRANSACTION)
+    )
+    messages = [encode_defunct(text='batch %d' % index) for index in range(3)]
+    assert signer.sign_messages(accounts[4].address, messages) == [
+        accounts[4].sign_message(message) for message in messages
+    ]
+
+
+def test_sign_async(signer, accounts):
+    async def sign_both():
+        return await asyncio.gather(
+            signer.sign_message_async(accounts[0].address, encode_defunct(text='async')),
+            signer.sign_transaction_async(accounts[1].address, TRANSACTION),
+        )
+
+    signed_message, signed_transaction = asyncio.run(sign_both())
+    assert signed_message == accounts[0].sign_message(encode_defunct(text='async'))
+    assert signed_transaction == accounts[1].sign_transaction(TRANSACTION)
+
+
+def test_unknown_account(signer):
+    with pytest.raises(ValueError, match="No worker holds"):
+        signer.sign_message(
+            '0xF0109fC8DF283027b6285cc889F5aA624EaC1F55',
+            encode_defunct(text='I♥SF'),
+        )
+
+
+def test_invalid_arguments(accounts):
+    with pytest.raises(ValueError, match="at least one account"):
+        ShardedSigner([])
+    with pytest.raises(ValueError, match="positive integer"):
+        ShardedSigner(accounts, shards=0)
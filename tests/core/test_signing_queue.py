@@ -0,0 +1,155 @@
+import asyncio
+import pytest
+import queue
+import threading
+
+from eth_utils import (
+    ValidationError,
+)
+
+from newchain_account import (
+    Account,
+)
+from newchain_account.messages import (
+    SignableMessage,
+    encode_defunct,
+)
+import newchain_account.signing_queue as signing_queue_module
+from newchain_account.signing_queue import (
+    SigningQueue,
+    sign_batch,
+)
+
+TRANSACTION = {
+    'to': '0xF0109fC8DF283027b6285cc889F5aA624EaC1F55',
+    'value': 10 ** 9,
+    'gas': 30000,
+    'gasPrice': 10 ** 9,
+    'nonce': 0,
+    'chainId': 1012,
+}
+
+KEYS = (b'\x01' * 32, b'\x02' * 32)
+
+
+@pytest.fixture(params=(None, 2), ids=('in-process', 'worker-pool'))
+def signing_queue(request):
+    with SigningQueue(max_workers=request.param, max_batch_size=8, max_delay=0.05) as signing_queue:
+        yield signing_queue
+
+
+def test_concurrent_requests_are_batched(signing_queue):
+    messages = [encode_defunct(text='message %d' % index) for index in range(20)]
+    futures = [
+        signing_queue.submit_message(message, KEYS[index % 2])
+        for index, message in enumerate(messages)
+    ]
+    transaction_future = signing_queue.submit_transaction(TRANSACTION, Account.from_key(KEYS[0]))
+
+    assert [future.result() for future in futures] == [
+        Account.sign_message(message, KEYS[index % 2]) for index, message in enumerate(messages)
+    ]
+    assert transaction_future.result() == Account.sign_transaction(TRANSACTION, KEYS[0])
+
+    stats = signing_queue.stats()
+    assert stats.requests == 21
+    assert stats.errors == 0
+    assert stats.batches < 21
+    assert stats.mean_batch_size == 21 / stats.batches
+    assert 0 < stats.p50_latency <= stats.p99_latency
+
+
+def test_errors_fail_only_their_request(signing_queue):
+    good = signing_queue.submit_message(encode_defunct(text='good'), KEYS[0])
+    bad_transaction = signing_queue.submit_transaction({'to': TRANSACTION['to']}, KEYS[0])
+    bad_message = signing_queue.submit_message(SignableMessage(b'EE', b'', b'bad'), KEYS[0])
+
+    assert good.result() == Account.sign_message(encode_defunct(text='good'), KEYS[0])
+    with pytest.raises(TypeError):
+        bad_transaction.result()
+    with pytest.raises(ValidationError):
+        bad_message.result()
+    assert signing_queue.stats().errors == 2
+
+    with pytest.raises(ValueError, match="32 bytes"):
+        signing_queue.submit_message(encode_defunct(text='short'), b'\x01')
+
+
+def test_sign_async(signing_queue):
+    messages = [encode_defunct(text='async %d' % index) for index in range(5)]
+
+    async def sign_all():
+        return await asyncio.gather(
+            signing_queue.sign_transaction_async(TRANSACTION, KEYS[1]),
+            *(signing_queue.sign_message_async(message, KEYS[1]) for message in messages),
+        )
+
+    signed_transaction, *signed_messages = asyncio.run(sign_all())
+    assert signed_transaction == Account.sign_transaction(TRANSACTION, KEYS[1])
+    assert signed_messages == [Account.sign_message(message, KEYS[1]) for message in messages]
+
+
+def test_full_queue_pushes_back(monkeypatch):
+    release = threading.Event()
+    started = threading.Event()
+
+    def held_sign_batch(requests):
+        # hold the dispatcher, so that nothing more leaves the queue
+        started.set()
+        release.wait()
+        return sign_batch(requests)
+
+    monkeypatch.setattr(signing_queue_module, 'sign_batch', held_sign_batch)
+    signing_queue = SigningQueue(max_queue_size=2, max_batch_size=1, max_delay=0)
+    message = encode_defunct(text='backpressure')
+    first = signing_queue.submit_message(message, KEYS[0])
+    started.wait()
+
+    queued = [signing_queue.submit_message(message, KEYS[0]) for _ in range(2)]
+    with pytest.raises(queue.Full):
+        signing_queue.submit_message(message, KEYS[0], timeout=0.01)
+
+    release.set()
+    signing_queue.close()
+    expected = Account.sign_message(message, KEYS[0])
+    assert [future.result() for future in [first] + queued] == [expected] * 3
+    with pytest.raises(RuntimeError, match="closed"):
+        signing_queue.submit_message(message, KEYS[0])
+
+
+def test_requests_behind_close_are_failed():
+    signing_queue = SigningQueue(max_batch_size=1, max_delay=0)
+    message = encode_defunct(text='late')
+    # close() stops the dispatcher between a submit's closed check and its put
+    signing_queue._queue.put(None)
+    late = signing_queue._submit('message', message, KEYS[0])
+    signing_queue._dispatcher.join()
+    with pytest.raises(RuntimeError, match="closed"):
+        late.result(timeout=1)
+
+    # and a put that lands after the dispatcher drained the queue
+    after = signing_queue._submit('message', message, KEYS[0])
+    with pytest.raises(RuntimeError, match="closed"):
+        after.result(timeout=1)
+
+
+def test_failed_submit_to_the_pool_fails_its_batch(monkeypatch):
+    signing_queue = SigningQueue(max_workers=2, max_batch_size=1, max_delay=0)
+    submit = signing_queue._executor.submit
+    calls = []
+
+    def broken_submit(*args):
+        # fail more batches than there are slots, so that leaked slots would stall the queue
+        calls.append(args)
+        if len(calls) <= 5:
+            raise RuntimeError("pool is broken")
+        return submit(*args)
+
+    monkeypatch.setattr(signing_queue._executor, 'submit', broken_submit)
+    message = encode_defunct(text='retry')
+    expected = Account.sign_message(message, KEYS[0])
+    with signing_queue:
+        for _ in range(5):
+            with pytest.raises(RuntimeError, match="pool is broken"):
+                signing_queue.submit_message(message, KEYS[0]).result(timeout=5)
+        assert signing_queue.submit_message(message, KEYS[0]).result(timeout=5) == expected
@@ -1,8 +1,15 @@
+from concurrent.futures import (
+    ThreadPoolExecutor,
+)
 import json
+import pickle
 import pytest
 import re
 import time
 
+from eth_abi import (
+    encode_abi,
+)
 from eth_utils import (
     ValidationError,
     keccak,
@@ -10,23 +17,39 @@ from eth_utils import (
 from hexbytes import (
     HexBytes,
 )
+from newchain_keys.exceptions import (
+    BadSignature,
+)
 
 from newchain_account import (
     Account,
 )
 from newchain_account._utils.structured_data.hashing import (
+    SCHEMA_CACHE_FORMAT,
+    SCHEMA_CACHE_VERSION,
+    CompiledTypedDataSchema,
+    _hash_domain_fields,
     encode_data,
+    encode_field,
+    encode_field_word,
     encode_struct,
     encode_type,
+    get_abi_encoder,
     get_array_dimensions,
     get_dependencies,
+    get_static_array_packer,
     hash_domain,
     hash_message,
     hash_struct_type,
     load_and_validate_structured_message,
+    load_compiled_schemas,
+    save_compiled_schemas,
 )
 from newchain_account._utils.structured_data.validation import (
     TYPE_REGEX,
+    _validate_types_fingerprint,
+    validate_structured_data,
+    validate_types,
 )
 from newchain_account.messages import (
     _hash_eip191_message,
@@ -533,6 +556,39 @@ def test_hash_struct_domain_eip712_with_multi_array(eip712_example_with_multi_ar
     assert hash_domain(structured_data).hex() == expected_hex
 
 
+def test_hash_domain_is_cached_by_content(eip712_example_json_string):
+    structured_data = json.loads(eip712_example_json_string)
+    expected = keccak(
+        encode_data("EIP712Domain", structured_data["types"], structured_data["domain"])
+    )
+    _hash_domain_fields.cache_clear()
+
+    assert hash_domain(structured_data) == expected
+    assert hash_domain(json.loads(eip712_example_json_string)) == expected
+    assert _hash_domain_fields.cache_info().hits == 1
+
+    structured_data["domain"]["chainId"] = 2
+    assert hash_domain(structured_data) != expected
+    assert _hash_domain_fields.cache_info().misses == 2
+
+
+@pytest.mark.parametrize(
+    'domain_type, domain, error_type',
+    (
+        # missing value
+        ({"name": "chainId", "type": "uint256"}, {}, KeyError),
+        # equal to 1, but not encodable as uint256
+        ({"name": "chainId", "type": "uint256"}, {"chainId": True}, TypeError),
+        # unhashable value, not cached
+        ({"name": "name", "type": "string"}, {"name": ["Ether Mail"]}, TypeError),
+    )
+)
+def test_hash_domain_errors_bypass_cache(domain_type, domain, error_type):
+    hash_domain({"types": {"EIP712Domain": [domain_type]}, "domain": {"chainId": 1, "name": "a"}})
+    with pytest.raises(error_type):
+        hash_domain({"types": {"EIP712Domain": [domain_type]}, "domain": domain})
+
+
 def test_hashed_structured_data_eip712(eip712_message_encodings):
     structured_msg = encode_structured_data(**eip712_message_encodings)
     hashed_structured_msg = _hash_eip191_message(structured_msg)
@@ -724,6 +780,41 @@ def test_structured_data_invalid_type_filtered_by_regex():
     assert str(e.value) == "Invalid Type `Hello Person` in `Mail`"
 
 
+def test_validated_types_are_cached_by_fingerprint(eip712_example_json_string):
+    _validate_types_fingerprint.cache_clear()
+    load_and_validate_structured_message(eip712_example_json_string)
+    load_and_validate_structured_message(eip712_example_json_string)
+    assert _validate_types_fingerprint.cache_info().hits == 1
+
+    # the same types, edited after validation, are validated again
+    structured_data = json.loads(eip712_example_json_string)
+    validate_structured_data(structured_data)
+    structured_data["types"]["Mail"][0]["type"] = "Hello Person"
+    with pytest.raises(ValidationError, match="Invalid Type `Hello Person` in `Mail`"):
+        validate_structured_data(structured_data)
+
+
+@pytest.mark.parametrize(
+    'domain_fields, error_message',
+    (
+        (
+            [{"name": "name", "type": "string"}, {"name": "name", "type": "string"}],
+            "Attribute `name` not declared or declared more than once in EIP712Domain",
+        ),
+        (
+            [{"name": "salt", "type": "bytes32"}],
+            "One of ['name', 'version', 'chainId', 'verifyingContract'] must be defined in "
+            "{'types': {'EIP712Domain': [{'name': 'salt', 'type': 'bytes32'}]}}",
+        ),
+    )
+)
+def test_structured_data_invalid_domain_schema(domain_fields, error_message):
+    for _ in range(2):
+        with pytest.raises(ValidationError) as e:
+            validate_types({"types": {"EIP712Domain": domain_fields}})
+        assert str(e.value) == error_message
+
+
 def test_invalid_structured_data_value_type_mismatch_in_type():
     # Given type is valid (string), but the value (int) is not of the mentioned type
     invalid_structured_data_string = open(
@@ -819,3 +910,387 @@ def test_unequal_array_dimension_between_schema_and_data():
             "dimensions `(1,)` whereas the schema has dimensions `(2, 'dynamic', 4)`"
         )
     )
+
+
+@pytest.mark.parametrize(
+    'fixture',
+    (
+        "tests/fixtures/valid_eip712_example.json",
+        "tests/fixtures/valid_eip712_example_with_array.json",
+        "tests/fixtures/valid_eip712_example_with_multi_array.json",
+        "tests/fixtures/valid_message_nested_structs.json",
+    )
+)
+def test_compiled_schema_matches_uncompiled_hashing(fixture):
+    structured_data = json.loads(open(fixture, "r").read())
+    schema = CompiledTypedDataSchema(structured_data["types"])
+
+    for struct_name in structured_data["types"]:
+        assert schema.encoded_types[struct_name] == encode_type(
+            struct_name, structured_data["types"]
+        )
+    assert schema.encode_data(
+        structured_data["primaryType"], structured_data["message"]
+    ) == encode_data(
+        structured_data["primaryType"], structured_data["types"], structured_data["message"]
+    )
+    assert schema.hash_domain(structured_data["domain"]) == hash_domain(structured_data)
+    assert schema.hash_message(
+        structured_data["primaryType"], structured_data["message"]
+    ) == hash_message(structured_data)
+    assert encode_structured_data(structured_data, schema=schema) == encode_structured_data(
+        structured_data
+    )
+    assert encode_structured_data(
+        text=json.dumps(structured_data), schema=schema
+    ) == encode_structured_data(structured_data)
+
+
+@pytest.mark.parametrize(
+    'fixture',
+    (
+        "tests/fixtures/invalid_message_value_type_mismatch_type.json",
+        "tests/fixtures/invalid_message_invalid_abi_type.json",
+        "tests/fixtures/invalid_message_valid_abi_type_invalid_value.json",
+        "tests/fixtures/invalid_message_unequal_1d_array_lengths.json",
+    )
+)
+def test_compiled_schema_error_messages(fixture):
+    structured_data = json.loads(open(fixture, "r").read())
+    schema = CompiledTypedDataSchema(structured_data["types"])
+
+    with pytest.raises(TypeError) as expected:
+        hash_message(structured_data)
+    with pytest.raises(TypeError) as compiled:
+        schema.hash_message(structured_data["primaryType"], structured_data["message"])
+    assert str(compiled.value) == str(expected.value)
+
+
+def test_compiled_schema_rejects_other_types(eip712_example_json_string):
+    structured_data = json.loads(eip712_example_json_string)
+    schema = CompiledTypedDataSchema(structured_data["types"])
+    structured_data["types"]["Mail"][2]["type"] = "bytes32"
+
+    with pytest.raises(ValidationError, match="do not match the compiled schema"):
+        encode_structured_data(structured_data, schema=schema)
+
+
+@pytest.mark.parametrize('max_workers', (None, 2))
+def test_sign_typed_data_batch(eip712_example_json_string, max_workers):
+    structured_data = json.loads(eip712_example_json_string)
+    account = Account.create()
+    messages = []
+    for index in range(3):
+        message = json.loads(eip712_example_json_string)["message"]
+        message["contents"] = f"Hello, Bob #{index}"
+        messages.append(message)
+    expected = [
+        Account.sign_message(
+            encode_structured_data(dict(structured_data, message=message)), account.key
+        )
+        for message in messages
+    ]
+
+    signed = Account.sign_typed_data_batch(
+        structured_data["types"],
+        structured_data["domain"],
+        structured_data["primaryType"],
+        messages,
+        account.key,
+        max_workers=max_workers,
+        chunk_size=2,
+    )
+    assert signed == expected
+
+    streamed = Account.sign_typed_data_batch(
+        structured_data["types"],
+        structured_data["domain"],
+        structured_data["primaryType"],
+        iter(messages),
+        account.key,
+        stream=True,
+    )
+    assert not isinstance(streamed, list)
+    assert list(streamed) == expected
+
+
+def test_sign_typed_data_batch_validates_once(eip712_example_json_string):
+    structured_data = json.loads(eip712_example_json_string)
+    with pytest.raises(ValidationError, match="Primary Type `Letter` is not present"):
+        Account.sign_typed_data_batch(
+            structured_data["types"],
+            structured_data["domain"],
+            "Letter",
+            [structured_data["message"]],
+            b'\x01' * 32,
+        )
+
+
+@pytest.mark.parametrize(
+    'field_type, value',
+    (
+        ("uint256[]", [0, 1, 2 ** 256 - 1]),
+        ("uint8[3]", [0, 17, 255]),
+        ("int64[]", [-2 ** 63, -1, 0, 2 ** 63 - 1]),
+        ("bytes32[]", [b'\x01' * 32, b'', HexBytes(b'\x02' * 32)]),
+        ("bytes4[2]", (b'\xde\xad', b'\xbe\xef\x00\x01')),
+        ("bool[]", [True, False, True]),
+        (
+            "address[]",
+            [
+                "0xCD2a3d9F938E13CD947Ec05AbC7FE734Df8DD826",
+                "0xcd2a3d9f938e13cd947ec05abc7fe734df8dd826",
+                b'\x11' * 20,
+            ],
+        ),
+        ("uint256[]", []),
+    )
+)
+def test_static_array_fast_path(field_type, value):
+    item_type = field_type[:field_type.rindex("[")]
+    expected = keccak(encode_abi([item_type] * len(value), value))
+
+    assert get_static_array_packer(field_type)(value) is not None
+    assert encode_field({}, "field", field_type, value) == ('bytes32', expected)
+
+
+@pytest.mark.parametrize(
+    'field_type, value, error_message',
+    (
+        (
+            "uint8[]",
+            [1, 256],
+            "Value of `field` (256) is not encodable as type `uint8`. If the base type is "
+            "correct, verify that the value does not exceed the specified size for the type.",
+        ),
+        (
+            "uint256[]",
+            [1, True],
+            "Value of `field` (True) is not encodable as type `uint256`. If the base type is "
+            "correct, verify that the value does not exceed the specified size for the type.",
+        ),
+        (
+            "address[]",
+            ["0xCD2a3d9F938E13CD947Ec05AbC7FE734Df8DD827"],
+            "Value of `field` (0xCD2a3d9F938E13CD947Ec05AbC7FE734Df8DD827) is not encodable "
+            "as type `address`. If the base type is correct, verify that the value does not "
+            "exceed the specified size for the type.",
+        ),
+        (
+            "bool[2]",
+            [True],
+            "Array data `[True]` has dimensions `(1,)` whereas the schema has "
+            "dimensions `(2,)`",
+        ),
+    )
+)
+def test_static_array_fast_path_falls_back_for_errors(field_type, value, error_message):
+    assert get_static_array_packer(field_type)(value) is None
+    with pytest.raises(TypeError) as e:
+        encode_field({}, "field", field_type, value)
+    assert str(e.value) == error_message
+
+
+@pytest.mark.parametrize('field_type', ("uint7[]", "string[]", "bytes[]", "Person[]", "uint256"))
+def test_static_array_fast_path_unsupported_types(field_type):
+    assert get_static_array_packer(field_type) is None
+
+
+def test_compiled_schema_memoises_nested_struct_hashes():
+    structured_data = json.loads(open("tests/fixtures/valid_message_nested_structs.json").read())
+    schema = CompiledTypedDataSchema(structured_data["types"], struct_hash_cache_size=64)
+    message = structured_data["message"]
+
+    assert schema.hash_message("Owners", message) == hash_message(structured_data)
+    memoised = len(schema._struct_hashes)
+    assert memoised > 0
+
+    # an edit deep in one sub-tree only adds the structs on its path
+    message["owners"][0]["contract"]["childContracts"][0]["address"] = "0x" + "de" * 20
+    assert schema.hash_message("Owners", message) == hash_message(structured_data)
+    assert len(schema._struct_hashes) == memoised + 3
+
+    # unchanged values in a new dict hit the memo
+    message["owners"][1] = json.loads(json.dumps(message["owners"][1]))
+    assert schema.hash_message("Owners", message) == hash_message(structured_data)
+    assert len(schema._struct_hashes) == memoised + 3
+
+
+def test_compiled_schema_struct_hash_memo_is_bounded_and_keyed_by_value_type():
+    types = {
+        "EIP712Domain": [{"name": "name", "type": "string"}],
+        "Order": [{"name": "asset", "type": "Asset"}],
+        "Asset": [{"name": "id", "type": "uint256"}, {"name": "tag", "type": "bytes4"}],
+    }
+    schema = CompiledTypedDataSchema(types, struct_hash_cache_size=2)
+    structured_data = {"types": types, "primaryType": "Order", "domain": {"name": "Exchange"}}
+
+    for asset_id in range(4):
+        structured_data["message"] = {"asset": {"id": asset_id, "tag": b'spam'}}
+        assert schema.hash_message("Order", structured_data["message"]) == hash_message(
+            structured_data
+        )
+    assert len(schema._struct_hashes) == 2
+
+    # True == 1, but only the int is encodable as uint256
+    schema.hash_message("Order", {"asset": {"id": 1, "tag": b''}})
+    with pytest.raises(TypeError, match="not encodable as type `uint256`"):
+        schema.hash_message("Order", {"asset": {"id": True, "tag": b''}})
+
+    # unhashable values are hashed without the memo
+    structured_data["message"] = {"asset": {"id": 1, "tag": bytearray(b'spam')}}
+    assert schema.hash_message("Order", structured_data["message"]) == hash_message(
+        structured_data
+    )
+
+
+def test_compiled_schema_struct_hash_memo_is_shared_between_threads():
+    types = {
+        "EIP712Domain": [{"name": "name", "type": "string"}],
+        "Order": [{"name": "asset", "type": "Asset"}],
+        "Asset": [{"name": "id", "type": "uint256"}],
+    }
+    # a memo smaller than the working set, so threads keep evicting each other's entries
+    schema = CompiledTypedDataSchema(types, struct_hash_cache_size=3)
+    messages = [{"asset": {"id": asset_id % 7}} for asset_id in range(2000)]
+    expected = [
+        CompiledTypedDataSchema(types, struct_hash_cache_size=0).hash_message("Order", message)
+        for message in messages[:7]
+    ]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        hashes = list(executor.map(lambda message: schema.hash_message("Order", message), messages))
+    assert hashes == [expected[index % 7] for index in range(2000)]
+    assert len(schema._struct_hashes) == 3
+
+    restored = pickle.loads(pickle.dumps(schema))
+    assert not restored._struct_hashes
+    assert restored.hash_message("Order", messages[1]) == expected[1]
+
+
+@pytest.mark.parametrize('max_workers', (None, 2))
+def test_recover_and_verify_typed_data_signers(eip712_example_json_string, max_workers):
+    structured_data = json.loads(eip712_example_json_string)
+    accounts = [Account.create() for _ in range(3)]
+    signed_messages = []
+    for index, account in enumerate(accounts):
+        message = dict(structured_data["message"], contents=f"Hello, Bob #{index}")
+        signed = Account.sign_message(
+            encode_structured_data(dict(structured_data, message=message)), account.key
+        )
+        signed_messages.append((message, signed.signature.hex()))
+    batch_args = (
+        structured_data["types"],
+        structured_data["domain"],
+        structured_data["primaryType"],
+    )
+
+    signers = Account.recover_typed_data_signers(
+        *batch_args, signed_messages, max_workers=max_workers, chunk_size=2
+    )
+    assert signers == [account.address for account in accounts]
+
+    claimed = [accounts[0].address.lower(), accounts[0].address, accounts[2].address]
+    signed_messages[2] = (signed_messages[2][0], b'\x00' * 65)
+    assert Account.verify_typed_data_signers(
+        *batch_args, signed_messages, claimed, max_workers=max_workers, chunk_size=2
+    ) == [True, False, False]
+
+    with pytest.raises(ValueError, match="different number of signed messages"):
+        Account.verify_typed_data_signers(*batch_args, signed_messages, claimed[:2])
+    with pytest.raises(BadSignature):
+        Account.recover_typed_data_signers(*batch_args, signed_messages)
+
+
+@pytest.mark.parametrize('v', (2, 29, 30, 33, 34))
+def test_verify_typed_data_signers_with_out_of_range_v(eip712_example_json_string, v):
+    structured_data = json.loads(eip712_example_json_string)
+    account = Account.create()
+    signed = Account.sign_message(encode_structured_data(structured_data), account.key)
+    batch_args = (
+        structured_data["types"],
+        structured_data["domain"],
+        structured_data["primaryType"],
+    )
+    message = structured_data["message"]
+    signed_messages = [
+        (message, signed.signature[:64] + bytes([v])),
+        (message, signed.signature),
+    ]
+
+    assert Account.verify_typed_data_signers(
+        *batch_args, signed_messages, [account.address, account.address]
+    ) == [False, True]
+    with pytest.raises(ValidationError, match=f"Signature v {v} is invalid"):
+        Account.recover_typed_data_signers(*batch_args, signed_messages)
+
+
+@pytest.mark.parametrize(
+    'field_type, value',
+    (
+        ("uint256", 2 ** 256 - 1),
+        ("int8", -128),
+        ("bool", True),
+        ("address", "0xCD2a3d9F938E13CD947Ec05AbC7FE734Df8DD826"),
+        ("bytes3", b'abc'),
+    )
+)
+def test_encode_field_word_of_atomic_types(field_type, value):
+    assert get_abi_encoder(field_type) is get_abi_encoder(field_type)
+    assert encode_field({}, "field", field_type, value) == (field_type, value)
+    assert encode_field_word({}, "field", field_type, value) == encode_abi([field_type], [value])
+
+
+def test_get_abi_encoder_of_invalid_type():
+    assert get_abi_encoder("uint25689") is None
+
+
+def test_compiled_schemas_roundtrip_through_cache_file(tmp_path, eip712_example_json_string):
+    structured_data = json.loads(eip712_example_json_string)
+    nested_structured_data = json.loads(
+        open("tests/fixtures/valid_message_nested_structs.json", "r").read()
+    )
+    salted_types = {
+        "EIP712Domain": [
+            {"name": "name", "type": "string"},
+            {"name": "salt", "type": "bytes32"},
+            {"name": "testnet", "type": "bool"},
+        ],
+    }
+    schemas = [
+        CompiledTypedDataSchema(structured_data["types"]),
+        CompiledTypedDataSchema(nested_structured_data["types"], struct_hash_cache_size=8),
+        CompiledTypedDataSchema(salted_types),
+    ]
+    schemas[0].hash_domain(structured_data["domain"])
+    schemas[0].hash_domain(dict(structured_data["domain"], chainId=2))
+    schemas[2].hash_domain({"name": "Salted", "salt": b'\x01' * 32, "testnet": True})
+    path = tmp_path / "schemas.json"
+
+    save_compiled_schemas(path, schemas)
+    loaded = load_compiled_schemas(path)
+
+    assert loaded == schemas
+    for original, restored in zip(schemas, loaded):
+        assert restored.dependencies == original.dependencies
+        assert restored.encoded_types == original.encoded_types
+        assert restored.type_hashes == original.type_hashes
+        assert restored.domain_separators == original.domain_separators
+        assert restored.struct_hash_cache_size == original.struct_hash_cache_size
+    assert len(loaded[0].domain_separators) == 2
+    assert loaded[0].hash_domain(structured_data["domain"]) == hash_domain(structured_data)
+    assert loaded[0].hash_message("Mail", structured_data["message"]) == hash_message(
+        structured_data
+    )
+    assert loaded[1].hash_message("Owners", nested_structured_data["message"]) == hash_message(
+        nested_structured_data
+    )
+
+
+def test_load_compiled_schemas_ignores_other_versions(tmp_path):
+    path = tmp_path / "schemas.json"
+    path.write_text(json.dumps({
+        "format": SCHEMA_CACHE_FORMAT,
+        "version": SCHEMA_CACHE_VERSION + 1,
+        "schemas": [{}],
+    }))
+    assert load_compiled_schemas(path) == []
@@ -0,0 +1,155 @@
+import os
+import pickle
+import pytest
+
+from newchain_account import (
+    Account,
+)
+from newchain_account._utils.legacy_transactions import (
+    Transaction,
+)
+from newchain_account._utils.typed_transactions import (
+    TypedTransaction,
+)
+from newchain_account.archive import (
+    TransactionArchive,
+    transaction_length,
+)
+
+PRIVATE_KEY = '0x4c0883a69102937d6231471b5dbb6204fe5129617082792ae468d01a3f362318'
+
+
+def _transactions():
+    for nonce in range(5):
+        yield {
+            'to': '0xF0109fC8DF283027b6285cc889F5aA624EaC1F55',
+            'value': nonce,
+            'gas': 21000,
+            'gasPrice': 1000000000,
+            'nonce': nonce,
+            'chainId': 1007,
+        }
+        yield {
+            'to': '0xF0109fC8DF283027b6285cc889F5aA624EaC1F55',
+            'value': nonce,
+            'gas': 21000,
+            'maxFeePerGas': 2000000000,
+            'maxPriorityFeePerGas': 1000000000,
+            'nonce': nonce,
+            'chainId': 1007,
+            'data': b'\x01' * 100,
+        }
+
+
+@pytest.fixture
+def signed_transactions():
+    return [Account.sign_transaction(txn, PRIVATE_KEY) for txn in _transactions()]
+
+
+@pytest.fixture
+def archive_path(tmp_path, signed_transactions):
+    path = tmp_path / 'transactions.bin'
+    path.write_bytes(b''.join(signed.rawTransaction for signed in signed_transactions))
+    return path
+
+
+def test_transaction_length(signed_transactions):
+    for signed in signed_transactions:
+        assert transaction_length(signed.rawTransaction + b'\xc0') == len(signed.rawTransaction)
+
+
+@pytest.mark.parametrize('invalid', (b'\x80', b'\x01', b'\xc5\x01', b'\xf8'))
+def test_transaction_length_invalid(invalid):
+    with pytest.raises(ValueError):
+        transaction_length(invalid)
+
+
+def test_archive_random_access(archive_path, signed_transactions):
+    sender = Account.from_key(PRIVATE_KEY).address
+    with TransactionArchive(archive_path) as archive:
+        assert len(archive) == len(signed_transactions)
+        for position, signed in enumerate(signed_transactions):
+            assert bytes(archive.raw(position)) == signed.rawTransaction
+            assert archive.find(signed.hash) == position
+            assert Account.recover_transaction(bytes(archive.raw(position))) == sender
+        assert isinstance(archive[0], Transaction)
+        assert isinstance(archive[-1], TypedTransaction)
+        assert archive[2].nonce == 1
+        with pytest.raises(IndexError):
+            archive.raw(len(signed_transactions))
+        with pytest.raises(KeyError):
+            archive.find(b'\x00' * 32)
+
+
+@pytest.mark.parametrize('include_hashes', (True, False))
+def test_archive_index_roundtrip(archive_path, signed_transactions, include_hashes):
+    with TransactionArchive(archive_path) as archive:
+        archive.save_index(include_hashes=include_hashes)
+        expected_offsets = list(archive._offsets)
+
+    with TransactionArchive(archive_path) as archive:
+        assert list(archive._offsets) == expected_offsets
+        assert (archive._hashes is not None) is include_hashes
+        assert archive.find(signed_transactions[3].hash.hex()) == 3
+
+
+def test_archive_ignores_stale_index(archive_path, signed_transactions):
+    with TransactionArchive(archive_path) as archive:
+        archive.save_index()
+
+    with open(archive_path, 'ab') as archive_file:
+        archive_file.write(signed_transactions[0].rawTransaction)
+
+    with TransactionArchive(archive_path) as archive:
+        assert len(archive) == len(signed_transactions) + 1
+
+
+def test_archive_ignores_index_of_rewritten_archive(archive_path, signed_transactions):
+    with TransactionArchive(archive_path) as archive:
+        archive.save_index()
+    archive_stat = os.stat(archive_path)
+
+    # same size, different framing: the first two transactions swap places
+    first, second = (signed.rawTransaction for signed in signed_transactions[:2])
+    data = archive_path.read_bytes()
+    archive_path.write_bytes(second + first + data[len(first) + len(second):])
+    os.utime(archive_path, ns=(archive_stat.st_atime_ns, archive_stat.st_mtime_ns + 1))
+    assert os.stat(archive_path).st_size == archive_stat.st_size
+
+    with TransactionArchive(archive_path) as archive:
+        assert bytes(archive.raw(0)) == second
+        assert bytes(archive.raw(1)) == first
+
+
+def test_archive_pickles(archive_path, signed_transactions):
+    with TransactionArchive(archive_path) as archive:
+        restored = pickle.loads(pickle.dumps(archive))
+    with restored:
+        assert bytes(restored.raw(1)) == signed_transactions[1].rawTransaction
+
+
+def test_archive_unpickles_only_if_unchanged(archive_path, signed_transactions):
+    with TransactionArchive(archive_path) as archive:
+        pickled = pickle.dumps(archive)
+    archive_stat = os.stat(archive_path)
+
+    # rewritten in place, at the same size: the pickled offsets no longer frame it
+    first, second = (signed.rawTransaction for signed in signed_transactions[:2])
+    data = archive_path.read_bytes()
+    archive_path.write_bytes(second + first + data[len(first) + len(second):])
+    os.utime(archive_path, ns=(archive_stat.st_atime_ns, archive_stat.st_mtime_ns + 1))
+    with pytest.raises(ValueError, match="was modified since it was indexed"):
+        pickle.loads(pickled)
+
+    with open(archive_path, 'ab') as archive_file:
+        archive_file.write(first)
+    with pytest.raises(ValueError, match="changed size since it was indexed"):
+        pickle.loads(pickled)
+
+
+def test_empty_archive(tmp_path):
+    path = tmp_path / 'empty.bin'
+    path.write_bytes(b'')
+    with TransactionArchive(path) as archive:
+        assert len(archive) == 0
+        assert list(archive) == []
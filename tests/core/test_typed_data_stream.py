@@ -0,0 +1,77 @@
+import io
+import json
+import pytest
+
+from hexbytes import (
+    HexBytes,
+)
+
+from newchain_account import (
+    Account,
+)
+from newchain_account.messages import (
+    _hash_eip191_message,
+    encode_structured_data,
+)
+from newchain_account.typed_data import (
+    hash_typed_data_lines,
+    process_typed_data_jsonl,
+    sign_typed_data_lines,
+)
+
+PRIVATE_KEY = '0x4c0883a69102937d6231471b5dbb6204fe5129617082792ae468d01a3f362318'
+
+FIXTURES = (
+    "tests/fixtures/valid_eip712_example.json",
+    "tests/fixtures/valid_eip712_example_with_array.json",
+    "tests/fixtures/valid_message_nested_structs.json",
+)
+
+
+@pytest.fixture
+def lines():
+    documents = []
+    for fixture in FIXTURES:
+        structured_data = json.loads(open(fixture, "r").read())
+        documents.append(json.dumps(structured_data) + "\n")
+        structured_data["domain"]["name"] = "Other " + structured_data["domain"]["name"]
+        documents.append(json.dumps(structured_data) + "\n")
+    return documents
+
+
+@pytest.mark.parametrize('max_workers', (None, 2))
+def test_sign_typed_data_lines(lines, max_workers):
+    expected = [
+        Account.sign_message(encode_structured_data(text=line), PRIVATE_KEY) for line in lines
+    ]
+    signed = sign_typed_data_lines(
+        iter(lines + ["\n"]),
+        PRIVATE_KEY,
+        max_workers=max_workers,
+        chunk_size=4,
+    )
+    assert list(signed) == expected
+
+
+def test_hash_typed_data_lines(lines):
+    expected = [_hash_eip191_message(encode_structured_data(text=line)) for line in lines]
+    assert list(hash_typed_data_lines(lines, chunk_size=1)) == expected
+
+
+@pytest.mark.parametrize('private_key', (None, PRIVATE_KEY))
+def test_process_typed_data_jsonl(tmp_path, lines, private_key):
+    source = tmp_path / "messages.jsonl"
+    source.write_text("".join(lines))
+    destination = io.StringIO()
+
+    assert process_typed_data_jsonl(source, destination, private_key) == len(lines)
+
+    records = [json.loads(record) for record in destination.getvalue().splitlines()]
+    for line, record in zip(lines, records):
+        signable_message = encode_structured_data(text=line)
+        assert record["digest"] == HexBytes(_hash_eip191_message(signable_message)).hex()
+        if private_key is None:
+            assert "signature" not in record
+        else:
+            signed = Account.sign_message(signable_message, private_key)
+            assert record["signature"] == signed.signature.hex()
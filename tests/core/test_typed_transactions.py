@@ -276,3 +276,27 @@ def test_decode_encode(test_case):
     # Re-encode.
     encoded = actual.encode()
     assert HexBytes(encoded) == HexBytes(raw_transaction)
+
+
+@pytest.mark.parametrize(
+    'test_case',
+    TEST_CASES,
+    # al = access list, df = dynamic fee
+    ids=[
+        'al-non-empty-list',
+        'al-empty-list',
+        'al-many-lists',
+        'al-no-explicit-type',
+        'df-1',
+        'df-2-int-values-and-access-list',
+        'df-no-explicit-type',
+    ],
+)
+def test_from_dict_without_validation(test_case):
+    validated = TypedTransaction.from_dict(test_case["transaction"])
+    # already formatted fields, as a trusted transaction builder would provide them
+    formatted_dict = validated.as_dict()
+    trusted = TypedTransaction.from_dict(formatted_dict, validate=False)
+    assert trusted.as_dict() == formatted_dict
+    assert trusted.hash() == validated.hash()
+    assert trusted.encode() == validated.encode()
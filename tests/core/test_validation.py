@@ -7,10 +7,20 @@ from cytoolz import (
 from eth_abi.exceptions import (
     ABITypeError,
 )
+from eth_utils import (
+    is_address,
+    is_binary_address,
+    is_checksum_address,
+)
 
 from newchain_account import (
     Account,
 )
+from newchain_account._utils.validation import (
+    hex_address_to_bytes,
+    is_any_address,
+    is_valid_address,
+)
 
 GOOD_TXN = {
     'gasPrice': 2,
@@ -69,3 +79,41 @@ def test_invalid_transaction_fields(txn_dict, bad_fields):
             Account.sign_transaction(txn_dict, TEST_PRIVATE_KEY)
         for field in bad_fields:
             assert field in str(excinfo.value)
+
+
+@pytest.mark.parametrize(
+    'address',
+    (
+        '0xF0109fC8DF283027b6285cc889F5aA624EaC1F55',
+        '0xf0109fc8df283027b6285cc889f5aa624eac1f55',
+        'f0109fc8df283027b6285cc889f5aa624eac1f55',
+        '0xf0109Fc8df283027B6285CC889f5Aa624eAc1f55',
+        '0x' + '00' * 19,
+        b'\xf0' * 20,
+        b'\xf0' * 19,
+        '',
+        None,
+    ),
+)
+def test_cached_address_validation_matches_eth_utils(address):
+    # run twice, to hit the cache on the second pass
+    for _ in range(2):
+        assert is_any_address(address) is is_address(address)
+        assert is_valid_address(address) is (
+            is_binary_address(address) or is_checksum_address(address)
+        )
+
+
+@pytest.mark.parametrize(
+    'value, expected',
+    (
+        ('0xF0109fC8DF283027b6285cc889F5aA624EaC1F55', bytes.fromhex('f0109fc8df283027b6285cc889f5aa624eac1f55')),  # noqa: E501
+        ('0x0102', b'\x01\x02'),
+        ('', b''),
+        (b'\x01' * 20, b'\x01' * 20),
+        (bytearray(b'\x01' * 20), b'\x01' * 20),
+    ),
+)
+def test_hex_address_to_bytes(value, expected):
+    assert hex_address_to_bytes(value) == expected
+    assert hex_address_to_bytes(value) == expected